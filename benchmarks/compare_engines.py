@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+
+# Checks the solvers in main.ENGINES against reference radii worked out independently of them, the known
+# inscribed circles of simple shapes and otherwise a separate branch and bound search to a much finer tolerance
+# Run from the repository folder:
+#   python benchmarks/compare_engines.py [files...]
+
+from heapq import heappush, heappop
+from math import pi, cos, sqrt, inf
+from os import path
+from time import perf_counter
+import argparse
+import sys
+
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+sys.path.insert(0, path.dirname(path.abspath(__file__)))
+
+import main
+import shapes
+
+# Most points tried for each reference radius, polygons where the largest circle can slide along two
+# parallel sides need a point every tolerance along them, so stop there and use the bounds reached
+REFERENCE_PROBES = 200000
+# Radii found by the solvers may be this much over the reference upper bound, for rounding
+ROUNDING = 1e-12
+
+
+def syntheticPolygons():
+    # (name, polygon, exact radius or None)
+    polygons = []
+    for sides in (3, 4, 5, 7, 13, 64):
+        polygons.append((f"regular {sides}", shapes.regular(sides, 10, 60000, 11000), 10 * cos(pi / sides)))
+    polygons.append(("rectangle", shapes.rectangle(10, 3), 1.5))
+    polygons.append(("L shape", shapes.lShape(10, 2), shapes.lShapeRadius(2)))
+    for seed in range(20):
+        polygons.append((f"star {seed}", shapes.star(50 + seed * 20, seed, lobes=2 + seed % 7), None))
+    polygons.append(("convex 200", shapes.convex(200, 1), None))
+    polygons.append(("comb 100", shapes.comb(100), None))
+    polygons.append(("sliver 50", shapes.sliver(50), None))
+    polygons.append(("spiral 100", shapes.spiral(100), None))
+    return polygons
+
+
+def referenceDistance(x, y, edges):
+    # Distance from the point to the nearest edge, negative outside the polygon. Written separately from
+    # the solvers' own, with the closest point found as a fraction along each edge
+    inside = False
+    nearestSq = inf
+    for ax, ay, bx, by in edges:
+        if (ay > y) != (by > y) and x < ax + (y - ay) * (bx - ax) / (by - ay):
+            inside = not inside
+        ex = bx - ax
+        ey = by - ay
+        lengthSq = ex * ex + ey * ey
+        t = 0.0 if lengthSq == 0 else min(max(((x - ax) * ex + (y - ay) * ey) / lengthSq, 0.0), 1.0)
+        dx = x - (ax + t * ex)
+        dy = y - (ay + t * ey)
+        nearestSq = min(nearestSq, dx * dx + dy * dy)
+    return sqrt(nearestSq) if inside else -sqrt(nearestSq)
+
+
+def referenceRadius(polygon, tolerance):
+    # Bounds (lower, upper) of the largest inscribed radius, found by splitting a square covering the polygon
+    # into quarters, always the one that could hold the largest circle next. No point in a square is
+    # further from the edges than its centre plus half its diagonal, so the square taken next bounds the
+    # radius from above and the best centre so far from below
+    points = [(float(point[0]), float(point[1])) for point in polygon]
+    edges = [a + b for a, b in zip(points, points[-1:] + points[:-1])]
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    half = max(max(xs) - min(xs), max(ys) - min(ys)) / 2
+    x = (min(xs) + max(xs)) / 2
+    y = (min(ys) + max(ys)) / 2
+
+    d = referenceDistance(x, y, edges)
+    lower = d
+    squares = [(-(d + half * sqrt(2)), x, y, half)]
+    probes = 1
+    while probes < REFERENCE_PROBES:
+        negMax, x, y, half = heappop(squares)
+        if -negMax - lower <= tolerance:
+            heappush(squares, (negMax, x, y, half))
+            break
+        half /= 2
+        for cx, cy in ((x - half, y - half), (x + half, y - half), (x - half, y + half), (x + half, y + half)):
+            d = referenceDistance(cx, cy, edges)
+            lower = max(lower, d)
+            heappush(squares, (-(d + half * sqrt(2)), cx, cy, half))
+        probes += 4
+    return lower, max(lower, -squares[0][0])
+
+
+def compare():
+    parser = argparse.ArgumentParser(description="Compares the results of the solvers with reference radii")
+    parser.add_argument("files", nargs="*", default=[path.join(path.dirname(path.dirname(path.abspath(__file__))), "SimpleFormat-example.csv")],
+                        help="data files to also compare (default: SimpleFormat-example.csv)")
+    parser.add_argument("--precision", type=float, default=0.001, help="(default: %(default)s)")
+    parser.add_argument("--tolerance", type=float, default=1e-9,
+                        help="tolerance the reference radii are found to (default: %(default)s)")
+    args = parser.parse_args()
+
+    main.headless = True
+    polygons = syntheticPolygons()
+    for fileName in args.files:
+        batch = main.parseData(fileName, "auto")
+        for i in range(len(batch)):
+            polygons.append((f"{path.basename(fileName)} {i}", batch.points(i), None))
+
+    names = list(main.ENGINES)
+    times = dict.fromkeys(names, 0.0)
+    # Largest amount each solver's radius was under the reference, and how many were within the tolerance
+    shortfalls = dict.fromkeys(names, 0.0)
+    matched = dict.fromkeys(names, 0)
+    failures = 0
+    uncertain = 0
+    for name, polygon, exact in polygons:
+        if exact is not None:
+            lower = upper = exact
+        else:
+            lower, upper = referenceRadius(polygon, args.tolerance)
+            if upper - lower > args.tolerance:
+                uncertain += 1
+                print(f"{name}: reference only found to within {upper - lower:.3g}")
+
+        problems = []
+        for engine in names:
+            start = perf_counter()
+            radius = main.ENGINES[engine](polygon, precision=args.precision, with_distance=True)[1]
+            times[engine] += perf_counter() - start
+
+            # Every solver should be within precision of the largest radius and can never be larger
+            shortfall = upper - radius
+            shortfalls[engine] = max(shortfalls[engine], shortfall)
+            matched[engine] += shortfall <= args.tolerance
+            if radius < lower - args.precision or radius > upper + ROUNDING * max(upper, 1):
+                problems.append(f"{engine} {radius:.12f} not in [{lower - args.precision:.12f}, {upper:.12f}]")
+        if problems:
+            failures += 1
+            print(f"FAIL {name}: " + ", ".join(problems))
+
+    print(f"{len(polygons) - failures}/{len(polygons)} polygons within {args.precision} of the reference, "
+          f"{len(polygons) - uncertain} references found to within {args.tolerance:g}")
+    for engine in names:
+        print(f"{engine}: {times[engine]:.3f}s, at most {shortfalls[engine]:.3g} under the reference, "
+              f"{matched[engine]}/{len(polygons)} within {args.tolerance:g} of it")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(compare())
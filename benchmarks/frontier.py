@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+# Micro-benchmark of polylabel's search loop, reports probes per second
+# Run from the repository folder:
+#   python benchmarks/frontier.py [--baseline old_polylabel.py]
+# e.g. to compare against the last commit:
+#   git show HEAD~1:polylabel.py > /tmp/polylabel_old.py
+#   python benchmarks/frontier.py --baseline /tmp/polylabel_old.py
+
+from contextlib import redirect_stdout
+from importlib.util import spec_from_file_location, module_from_spec
+from io import StringIO
+from os import path
+from time import perf_counter
+import argparse
+import sys
+
+sys.path.insert(0, path.dirname(path.abspath(__file__)))
+
+import shapes
+
+
+def loadModule(fileName):
+    spec = spec_from_file_location("polylabel_" + path.basename(fileName).replace(".", "_"), fileName)
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def probesPerSecond(module, polygons, precision, repeat):
+    # Uses the debug output as it is the only probe count available in every version
+    best = 0
+    for _ in range(repeat):
+        probes = 0
+        output = StringIO()
+        start = perf_counter()
+        with redirect_stdout(output):
+            for polygon in polygons:
+                module.polylabel(polygon, precision=precision, debug=True)
+        elapsed = perf_counter() - start
+        for line in output.getvalue().splitlines():
+            if line.startswith("num probes:"):
+                probes += int(line.split(":")[1])
+        best = max(best, probes / elapsed)
+    return probes, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures polylabel probes per second")
+    parser.add_argument("--baseline", help="another polylabel.py to compare against")
+    parser.add_argument("--vertices", type=int, default=12, help="vertices per polygon (default: %(default)s)")
+    parser.add_argument("--polygons", type=int, default=200, help="number of polygons (default: %(default)s)")
+    parser.add_argument("--precision", type=float, default=0.001, help="(default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="best of this many runs (default: %(default)s)")
+    args = parser.parse_args()
+
+    # Small polygons so the time is spent in the search loop rather than the distance calculations
+    polygons = [shapes.star(args.vertices, seed) for seed in range(args.polygons)]
+
+    modules = [("current", loadModule(path.join(path.dirname(path.dirname(path.abspath(__file__))), "polylabel.py")))]
+    if args.baseline:
+        modules.insert(0, ("baseline", loadModule(args.baseline)))
+
+    for name, module in modules:
+        probes, rate = probesPerSecond(module, polygons, args.precision, args.repeat)
+        print(f"{name}: {probes} probes, {rate:,.0f} probes/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+# Reproducible synthetic polygons for the benchmarks, each as a list of [x, y] points
+
+from math import pi, sin, cos, sqrt
+import random
+
+
+def regular(sides, radius=10.0, x=0.0, y=0.0):
+    # Inscribed circle radius is radius * cos(pi / sides)
+    return [[x + radius * cos(2 * pi * i / sides), y + radius * sin(2 * pi * i / sides)] for i in range(sides)]
+
+
+def rectangle(width, height, x=0.0, y=0.0):
+    # Inscribed circle radius is min(width, height) / 2
+    return [[x, y], [x + width, y], [x + width, y + height], [x, y + height]]
+
+
+def lShape(length, thickness):
+    # Inscribed circle touches both inner sides and the inner corner,
+    # its radius is thickness * (2 - sqrt(2)) when length is long enough
+    return [[0, 0], [length, 0], [length, thickness], [thickness, thickness], [thickness, length], [0, length]]
+
+
+def lShapeRadius(thickness):
+    return thickness * (2 - sqrt(2))
+
+
+def star(vertices, seed, lobes=7, radius=50.0, x=1000.0, y=2000.0):
+    # Wavy outline with some random noise in each point
+    rand = random.Random(seed)
+    polygon = []
+    for i in range(vertices):
+        angle = 2 * pi * i / vertices
+        r = radius + 0.4 * radius * sin(lobes * angle) + rand.random()
+        polygon.append([x + r * cos(angle), y + r * sin(angle)])
+    return polygon
+
+
+def convex(vertices, seed, width=100.0, height=60.0, x=1000.0, y=2000.0):
+    # Ellipse with its points at random angles, so unevenly spaced but always convex
+    rand = random.Random(seed)
+    angles = sorted(rand.uniform(0, 2 * pi) for _ in range(vertices))
+    return [[x + width * cos(angle), y + height * sin(angle)] for angle in angles]
+
+
+def comb(vertices, maxTeeth=64, toothLength=20.0, x=1000.0, y=2000.0):
+    # Back with up to maxTeeth teeth of width 1 and gaps of 1 between them, padded to vertices points along
+    # the bottom of the back. Many more teeth makes polylabel probe, and keep, cells all along every tooth
+    teeth = max(1, min(maxTeeth, (vertices - 4) // 4))
+    back = 3.0
+    polygon = [[x, y], [x, y + back]]
+    for i in range(teeth):
+        left = x + 2 * i
+        polygon += [[left, y + back + toothLength], [left + 1, y + back + toothLength],
+                    [left + 1, y + back], [left + 2, y + back]]
+    right = x + 2 * teeth
+    polygon.append([right, y])
+    # Extra points along the bottom edge to make up the number of vertices
+    extra = vertices - len(polygon)
+    for i in range(extra):
+        polygon.append([right - (right - x) * (i + 1) / (extra + 1), y])
+    return polygon
+
+
+def sliver(vertices, length=100.0, width=2.0, x=1000.0, y=2000.0):
+    # Long thin shape gently bending up and down, half of the points along each side
+    half = max(2, vertices // 2)
+    top = []
+    bottom = []
+    for i in range(half):
+        along = length * i / (half - 1)
+        bend = 5 * sin(2 * pi * i / (half - 1))
+        top.append([x + along, y + bend + width / 2])
+        bottom.append([x + along, y + bend - width / 2])
+    return bottom + top[::-1]
+
+
+def spiral(vertices, turns=2.0, width=10.0, x=1000.0, y=2000.0):
+    # Arm winding outwards, widening from half of width at the centre to width at the outside end, half of
+    # the points along each side. An arm the same width all the way along gives polylabel hundreds of
+    # thousands of cells that are almost as good as each other
+    half = max(2, vertices // 2)
+    # Arms are 4 widths apart
+    growth = 4 * width / (2 * pi)
+    outer = []
+    inner = []
+    for i in range(half):
+        angle = 2 * pi * turns * i / (half - 1)
+        r = 2 * width + growth * angle
+        armWidth = width * (0.5 + 0.5 * i / (half - 1))
+        outer.append([x + (r + armWidth / 2) * cos(angle), y + (r + armWidth / 2) * sin(angle)])
+        inner.append([x + (r - armWidth / 2) * cos(angle), y + (r - armWidth / 2) * sin(angle)])
+    return outer + inner[::-1]
+
+
+def joinedRings(vertices, seed, rings=3, x=60000.0, y=11000.0):
+    # Bad data as it can come from some programs: several separate rings made into one polygon with
+    # 0,0 points between them, so the polygon is mostly long thin spikes out to the origin
+    rand = random.Random(seed)
+    perRing = max(3, (vertices - rings) // rings)
+    polygon = []
+    for ring in range(rings):
+        polygon += regular(perRing, 5 + rand.random() * 10, x + 50 * ring, y + rand.random() * 50)
+        polygon.append([0.0, 0.0])
+    return polygon
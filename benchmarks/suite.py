@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+
+# Times polylabel, the parsers and the output writers on reproducible synthetic data, saving the times as JSON
+# and flagging regressions against the times saved from an earlier run
+# Run from the repository folder:
+#   python benchmarks/suite.py --json baseline.json
+#   ... make changes ...
+#   python benchmarks/suite.py --json current.json --compare baseline.json
+# Exits with 1 if any time is more than --threshold slower than in the baseline
+
+from contextlib import redirect_stdout
+from io import StringIO
+from os import path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import argparse
+import json
+import platform
+import sys
+
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+sys.path.insert(0, path.dirname(path.abspath(__file__)))
+
+import main
+import shapes
+from polygonbatch import PolygonBatch
+
+# Name and generator of each polygon shape, generators take the number of vertices
+SHAPES = {"convex": lambda vertices: shapes.convex(vertices, 1),
+          "star": lambda vertices: shapes.star(vertices, 1),
+          "comb": shapes.comb,
+          "sliver": shapes.sliver,
+          "spiral": shapes.spiral,
+          "joined rings": lambda vertices: shapes.joinedRings(vertices, 1)}
+# Times less than this much slower than the baseline are never regressions, as timer noise is larger
+MIN_DIFFERENCE = 0.002
+
+
+def best(function, repeat):
+    # Shortest time of repeat calls of function
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        times.append(perf_counter() - start)
+    return min(times)
+
+
+def filePolygons(megabytes):
+    # Stars of 200 vertices, about enough for a file of the given size
+    count = max(1, int(megabytes * 1e6 / (200 * 25)))
+    return [shapes.star(200, seed, x=60000 + 500 * (seed % 100), y=11000 + 500 * (seed // 100))
+            for seed in range(count)]
+
+
+def writeFiles(folder, polygons):
+    # Writes polygons in the formats each parser reads, returning {parser name: (fileName, parse function)}
+    simpleName = path.join(folder, "simple.csv")
+    with open(simpleName, "w") as f:
+        for polygon in polygons:
+            f.writelines(f"{x:.3f},{y:.3f},{100.0:.3f}\n" for x, y in polygon)
+            f.write("\n")
+
+    idName = path.join(folder, "id.csv")
+    with open(idName, "w") as f:
+        for i, polygon in enumerate(polygons):
+            f.writelines(f"P{i},{x:.3f},{y:.3f},{100.0:.3f}\n" for x, y in polygon)
+
+    unknownName = path.join(folder, "unknown.txt")
+    with open(unknownName, "w") as f:
+        f.write("Exported polygons\n")
+        for i, polygon in enumerate(polygons):
+            f.write(f"Polygon {i}\n")
+            f.writelines(f"{x:.3f} {y:.3f} {100.0:.3f}\n" for x, y in polygon)
+
+    return {"parseWithoutID": (simpleName, lambda fileName: main.parseWithoutID(fileName, [0, 1, 2, -1], ",")),
+            "parseWithID": (idName, lambda fileName: main.parseWithID(fileName, [1, 2, 3, 0], ",")),
+            "parseUnknown": (unknownName, main.parseUnknown)}
+
+
+def solvedBatch(count, vertices):
+    # Batch of count stars with made up circles, so the writers can be timed without solving them
+    batch = PolygonBatch()
+    for i in range(count):
+        x = 60000 + 500 * (i % 100)
+        y = 11000 + 500 * (i // 100)
+        for px, py in shapes.star(vertices, i, x=x, y=y):
+            batch.addPoint(px, py, 100.0)
+        batch.endPolygon()
+        batch.setCircle(i, [[x + 0.123, y - 0.456, 100.0], 20.0 + i % 17])
+    return batch
+
+
+def run(args):
+    # Returns {benchmark name: seconds}
+    results = {}
+    for name, generate in SHAPES.items():
+        for vertices in args.sizes:
+            polygon = generate(vertices)
+            statuses = []
+            seconds = best(lambda: statuses.append(main.polylabel(polygon, precision=args.precision,
+                                                                  max_time=args.time_limit, with_status=True)[-1]),
+                           args.repeat)
+            results[f"polylabel {name} {vertices}"] = seconds
+            # Times cut short by the time limit won't show the search getting slower
+            stopped = " (stopped at the time limit)" if statuses[-1].stopped_early else ""
+            print(f"polylabel {name} {vertices}: {seconds:.4f}s{stopped}")
+
+    with TemporaryDirectory() as folder:
+        files = writeFiles(folder, filePolygons(args.megabytes))
+        for name, (fileName, parse) in files.items():
+            megabytes = path.getsize(fileName) / 1e6
+
+            def parseAll():
+                # Every polygon is read, as the parsers only read as far as their batches are taken
+                count = sum(len(polygons) for polygons in parse(fileName))
+                if not count:
+                    raise RuntimeError(f"{name} found no polygons in {fileName}")
+
+            # parseUnknown shows how it decided to read the file
+            with redirect_stdout(StringIO()):
+                seconds = best(parseAll, args.repeat)
+            results[f"{name} {args.megabytes}MB"] = seconds
+            print(f"{name} {megabytes:.1f}MB: {seconds:.4f}s")
+
+        polygons = solvedBatch(args.circles, 50)
+        outputs = {"dxf": {"dxfItems": main.DXF_ITEMS},
+                   "circles": {"circles": True},
+                   "points": {"points": True},
+                   "binary": {"binary": True, "binaryPoints": True}}
+        for name, options in outputs.items():
+            seconds = best(lambda: main.saveOutputs(folder, polygons, pointsNum=args.points, **options), args.repeat)
+            results[f"save {name} {args.circles}"] = seconds
+            print(f"save {name} {args.circles} circles: {seconds:.4f}s")
+    return results
+
+
+def compare(results, baselineName, threshold):
+    # Prints how results changed from the baseline, returns the number of regressions
+    with open(baselineName, "r") as f:
+        saved = json.load(f)
+    baseline = saved["results"]
+    if saved["numpy"] != (main.fastparse.np is not None):
+        print("Warning: NumPy is only installed for one of the runs, most times aren't comparable")
+    regressions = 0
+    for name, seconds in results.items():
+        if name not in baseline:
+            print(f"{name}: {seconds:.4f}s, not in baseline")
+            continue
+        before = baseline[name]
+        change = seconds / before - 1 if before else 0.0
+        regressed = change > threshold and seconds - before > MIN_DIFFERENCE
+        regressions += regressed
+        print(f"{'REGRESSION ' if regressed else ''}{name}: {before:.4f}s -> {seconds:.4f}s ({change:+.1%})")
+    print(f"{regressions} regressions of more than {threshold:.0%}")
+    return regressions
+
+
+def suite():
+    parser = argparse.ArgumentParser(description="Times polylabel, the parsers and the output writers")
+    parser.add_argument("--sizes", type=lambda text: [int(size) for size in text.split(",")],
+                        default=[10, 100, 1000, 10000, 100000],
+                        help="vertices of the polygons timed with polylabel (default: 10,100,1000,10000,100000)")
+    parser.add_argument("--precision", type=float, default=main.PRECISION, help="(default: %(default)s)")
+    parser.add_argument("--time-limit", type=float, default=10.0,
+                        help="polylabel time limit per polygon in seconds (default: %(default)s)")
+    parser.add_argument("--megabytes", type=float, default=8.0,
+                        help="size of each file parsed (default: %(default)s)")
+    parser.add_argument("--circles", type=int, default=2000, help="circles saved to each output (default: %(default)s)")
+    parser.add_argument("--points", type=int, default=64,
+                        help="points around each circle in the outputs (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="best of this many runs (default: %(default)s)")
+    parser.add_argument("--json", help="file to save the times to")
+    parser.add_argument("--compare", metavar="BASELINE", help="times saved with --json to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="slowdown counted as a regression, as a fraction (default: %(default)s)")
+    args = parser.parse_args()
+
+    main.headless = True
+    results = run(args)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"python": platform.python_version(),
+                       "platform": platform.platform(),
+                       "numpy": main.fastparse.np is not None,
+                       "arguments": {name: value for name, value in vars(args).items()
+                                     if name not in ("json", "compare", "threshold")},
+                       "results": results}, f, indent=2)
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(suite())
@@ -0,0 +1,128 @@
+# Binary output of the circles, stored in columns so it can be memory-mapped and read without parsing.
+#
+# Everything is little-endian. The file starts with a 48 byte header:
+#   offset  type     contents
+#   0       8 bytes  MAGIC, b"MICIRCLE"
+#   8       uint32   VERSION of the format
+#   12      uint32   pointsNum, the number of points on each circle in the points block, 0 if there isn't one
+#   16      uint64   count, the number of circles
+#   24      uint64   columnsOffset, where the circle columns start
+#   32      uint64   pointsOffset, where the points block starts, 0 if there isn't one
+#   40      uint64   0, reserved
+#
+# The points block holds the x,y of every point on every circle as count*pointsNum pairs of float64,
+# circle i's points are pairs pointOffsets[i] up to pointOffsets[i+1].
+#
+# From columnsOffset there is a column of count values for each of COLUMNS in turn: the centre's x, y, z
+# and the diameter as float64, the number of the polygon the circle is for (the polygons in the input
+# numbered from 0) and, for circles of simplified polygons, the number of vertices removed as int64 (-1 if
+# not simplified) and the diameter error bound as float64 (nan if not simplified). When there is a points
+# block these are followed by pointOffsets, count+1 int64.
+#
+# Every column and block starts at a multiple of 8 bytes, so numpy.frombuffer or numpy.memmap can use
+# them straight from the file, as readBinary does.
+
+import struct
+from array import array
+from sys import byteorder
+
+from circlepoints import circleChunks
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAGIC = b"MICIRCLE"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQQQQ")
+# Name and array type code of each circle column, in the order they are stored
+COLUMNS = [("x", "d"), ("y", "d"), ("z", "d"), ("diameter", "d"), ("polygon", "q"), ("removed", "q"),
+           ("errorBound", "d")]
+
+
+class BinaryWriter:
+    # Writes circles to the binary file f, opened for writing bytes, a batch at a time
+    # The points are written as they come and the columns are kept until close writes them after the
+    # points and fills in the header, so f must be seekable
+    def __init__(self, f, pointsNum=0):
+        # pointsNum is the number of points on each circle in the points block, 0 for no points block
+        self.f = f
+        self.pointsNum = pointsNum
+        self.columns = {name: array(typeCode) for name, typeCode in COLUMNS}
+        self.f.write(HEADER.pack(MAGIC, VERSION, pointsNum, 0, 0, 0, 0))
+
+    def write(self, polygons, indices, firstPolygon=0):
+        # Writes the circles of the polygons at indices of the PolygonBatch polygons, which are numbered
+        # from firstPolygon
+        for i in indices:
+            x, y, z = polygons.centres[3*i:3*i+3]
+            self.columns["x"].append(x)
+            self.columns["y"].append(y)
+            self.columns["z"].append(z)
+            self.columns["diameter"].append(polygons.radii[i] * 2.0)
+            self.columns["polygon"].append(firstPolygon + i)
+            self.columns["removed"].append(polygons.removed[i])
+            self.columns["errorBound"].append(polygons.errorBounds[i])
+
+        if not self.pointsNum:
+            return
+        for _, xs, ys in circleChunks(polygons, indices, self.pointsNum):
+            if np is not None:
+                points = np.empty((len(xs), self.pointsNum, 2), dtype="<f8")
+                points[:, :, 0] = xs
+                points[:, :, 1] = ys
+                self.f.write(points.tobytes())
+                continue
+            for circleXs, circleYs in zip(xs, ys):
+                points = array("d", [0.0]) * (2*self.pointsNum)
+                points[0::2] = array("d", circleXs)
+                points[1::2] = array("d", circleYs)
+                self.f.write(_littleEndian(points))
+
+    def close(self):
+        # Writes the columns and the header, doesn't close f
+        count = len(self.columns["diameter"])
+        pointsOffset = HEADER.size if self.pointsNum else 0
+        columnsOffset = HEADER.size + 16 * count * self.pointsNum
+        self.f.seek(columnsOffset)
+        for name, _ in COLUMNS:
+            self.f.write(_littleEndian(self.columns[name]))
+        if self.pointsNum:
+            self.f.write(_littleEndian(array("q", range(0, (count+1) * self.pointsNum, self.pointsNum))))
+        self.f.seek(0)
+        self.f.write(HEADER.pack(MAGIC, VERSION, self.pointsNum, count, columnsOffset, pointsOffset, 0))
+        self.f.seek(0, 2)
+
+
+def _littleEndian(values):
+    # The bytes of the array values in little-endian order
+    if byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def readBinary(fileName):
+    # Memory-maps the binary file fileName, returning a dict of a NumPy array for each of COLUMNS, and
+    # "points" (count*pointsNum by 2) and "pointOffsets" if it has a points block. Requires NumPy
+    # Raises ValueError if it isn't a binary output file of this version
+    with open(fileName, "rb") as f:
+        header = f.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError(f"Not a binary circles file: {fileName}")
+    magic, version, pointsNum, count, columnsOffset, pointsOffset, _ = HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not a version {VERSION} binary circles file: {fileName}")
+
+    data = np.memmap(fileName, dtype=np.uint8, mode="r")
+    result = {}
+    offset = columnsOffset
+    for name, typeCode in COLUMNS:
+        dtype = "<f8" if typeCode == "d" else "<i8"
+        result[name] = data[offset:offset + 8*count].view(dtype)
+        offset += 8*count
+    if pointsNum:
+        result["pointOffsets"] = data[offset:offset + 8*(count+1)].view("<i8")
+        result["points"] = data[pointsOffset:pointsOffset + 16*count*pointsNum].view("<f8").reshape(-1, 2)
+    return result
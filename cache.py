@@ -0,0 +1,106 @@
+# Disk cache of calculated circles, so polygons loaded again don't have to be solved again.
+#
+# Circles are stored in an SQLite database keyed by a hash of the polygon's co-ordinates and the
+# settings that change the result (solver, solver version, precision, ...). Every lookup marks
+# the circles it finds as used, and once there are more than maxEntries circles the ones least
+# recently used are removed.
+
+import sqlite3
+import hashlib
+import json
+from os import environ, makedirs, path
+
+DEFAULT_MAX_ENTRIES = 200000
+# Keys per query, below SQLite's default limit of 999 parameters
+_CHUNK = 500
+
+
+def defaultCachePath():
+    base = environ.get("LOCALAPPDATA") or environ.get("XDG_CACHE_HOME") or path.join(path.expanduser("~"), ".cache")
+    return path.join(base, "Maximum-Inscribed-Circle", "circles.sqlite")
+
+
+class ResultCache:
+    # hits and misses count the polygons found and not found by the last lookup,
+    # totalHits and totalMisses by every lookup
+    def __init__(self, fileName=None, maxEntries=DEFAULT_MAX_ENTRIES):
+        # Raises sqlite3.Error or OSError if the database can't be opened
+        if fileName is None:
+            fileName = defaultCachePath()
+        self.fileName = fileName
+        self.maxEntries = maxEntries
+        self.hits = 0
+        self.misses = 0
+        self.totalHits = 0
+        self.totalMisses = 0
+
+        folder = path.dirname(fileName)
+        if folder:
+            makedirs(folder, exist_ok=True)
+        # The GUI looks circles up on its solve thread, only ever from one thread at a time
+        self.connection = sqlite3.connect(fileName, check_same_thread=False)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS circles "
+                                "(key BLOB PRIMARY KEY, circle TEXT NOT NULL, used INTEGER NOT NULL)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS circlesUsed ON circles (used)")
+        self.connection.commit()
+        # Each lookup is a new generation, circles with the lowest generation were used least recently
+        self.generation = self.connection.execute("SELECT COALESCE(MAX(used), 0) FROM circles").fetchone()[0]
+
+    @staticmethod
+    def key(coords, elevations, settings):
+        # coords and elevations are the array("d") of a polygon's x,y and z as given by PolygonBatch.arrays,
+        # settings is a tuple of anything else that changes the circle calculated
+        digest = hashlib.sha256(repr(settings).encode())
+        digest.update(coords.tobytes())
+        digest.update(elevations.tobytes())
+        return digest.digest()
+
+    def lookup(self, keys):
+        # Returns a dict of key: circle for the keys found
+        self.generation += 1
+        found = {}
+        uniqueKeys = list(set(keys))
+        try:
+            for i in range(0, len(uniqueKeys), _CHUNK):
+                chunk = uniqueKeys[i:i + _CHUNK]
+                marks = ",".join("?" * len(chunk))
+                rows = self.connection.execute(f"SELECT key, circle FROM circles WHERE key IN ({marks})", chunk)
+                for key, circle in rows:
+                    found[key] = json.loads(circle)
+                self.connection.execute(f"UPDATE circles SET used = ? WHERE key IN ({marks})", [self.generation] + chunk)
+            self.connection.commit()
+        except sqlite3.Error:
+            # The cache only saves time, so carry on as if nothing was found
+            found = {}
+
+        self.hits = sum(1 for key in keys if key in found)
+        self.misses = len(keys) - self.hits
+        self.totalHits += self.hits
+        self.totalMisses += self.misses
+        return found
+
+    def store(self, circles):
+        # circles is a dict of key: circle, returns True if they were all stored
+        try:
+            self.connection.executemany("INSERT OR REPLACE INTO circles (key, circle, used) VALUES (?, ?, ?)",
+                                        ((key, json.dumps(circle), self.generation) for key, circle in circles.items()))
+            excess = self.connection.execute("SELECT COUNT(*) FROM circles").fetchone()[0] - self.maxEntries
+            if excess > 0:
+                self.connection.execute("DELETE FROM circles WHERE key IN "
+                                        "(SELECT key FROM circles ORDER BY used LIMIT ?)", (excess,))
+            self.connection.commit()
+        except sqlite3.Error:
+            self.connection.rollback()
+            return False
+        return True
+
+    def clear(self):
+        self.connection.execute("DELETE FROM circles")
+        self.connection.commit()
+        self.connection.execute("VACUUM")
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM circles").fetchone()[0]
+
+    def close(self):
+        self.connection.close()
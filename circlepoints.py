@@ -0,0 +1,153 @@
+# Points evenly spaced around circles, for the outputs that approximate each circle with points.
+#
+# The cos and sin of the angle of each point are only calculated once for each number of points,
+# then scaled by the radius and moved to the centre of many circles at once. With NumPy the text of
+# the Points CSV is also formatted for many points at once, giving exactly the same text as formatting
+# each number with f"{number:.2f}".
+
+from functools import lru_cache
+from math import pi, sin, cos
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Most points calculated together, so memory use stays small with many points on each circle
+CHUNK_POINTS = 1 << 16
+
+
+@lru_cache(maxsize=16)
+def unitCircle(pointsNum):
+    # The cos and sin of the angle of each of pointsNum points evenly spaced around a circle, starting at
+    # angle 0, as NumPy arrays if NumPy is installed, otherwise tuples
+    arc = 2 * pi / pointsNum
+    cosines = tuple(cos(arc*j) for j in range(pointsNum))
+    sines = tuple(sin(arc*j) for j in range(pointsNum))
+    if np is not None:
+        return np.array(cosines), np.array(sines)
+    return cosines, sines
+
+
+def circleChunks(polygons, indices, pointsNum):
+    # Yields (chunk, xs, ys) for the circles of the polygons at indices of the PolygonBatch polygons a few
+    # at a time, where chunk is a list of the indices and xs and ys hold the x and y of the pointsNum points
+    # around each of their circles, as len(chunk) by pointsNum NumPy arrays or lists of lists without NumPy
+    cosines, sines = unitCircle(pointsNum)
+    indices = list(indices)
+    step = max(1, CHUNK_POINTS // pointsNum)
+    for start in range(0, len(indices), step):
+        chunk = indices[start:start + step]
+        if np is None:
+            xs = []
+            ys = []
+            for i in chunk:
+                x, y = polygons.centres[3*i:3*i+2]
+                radius = polygons.radii[i]
+                xs.append([x + radius*c for c in cosines])
+                ys.append([y + radius*s for s in sines])
+            yield chunk, xs, ys
+            continue
+
+        # Indexing copies, so no view of the batch's arrays is kept while yielding
+        centres = np.frombuffer(polygons.centres).reshape(-1, 3)[chunk]
+        radii = np.frombuffer(polygons.radii)[chunk, np.newaxis]
+        yield chunk, centres[:, 0:1] + radii*cosines, centres[:, 1:2] + radii*sines
+
+
+def circlePoints(polygons, indices, pointsNum):
+    # Yields (i, xs, ys) for each polygon i in indices of the PolygonBatch polygons, where xs and ys are
+    # lists of the x and y of pointsNum points around its circle
+    for chunk, xs, ys in circleChunks(polygons, indices, pointsNum):
+        if np is not None:
+            xs = xs.tolist()
+            ys = ys.tolist()
+        yield from zip(chunk, xs, ys)
+
+
+def pointsText(polygons, indices, pointsNum):
+    # Yields the text of the Points CSV for the circles of the polygons at indices of the PolygonBatch
+    # polygons, a chunk of circles at a time
+    for chunk, xs, ys in circleChunks(polygons, indices, pointsNum):
+        zs = [polygons.centres[3*i+2] for i in chunk]
+        if np is not None:
+            text = _formatPoints(xs, ys, np.array(zs))
+            if text is not None:
+                yield text
+                continue
+            xs = xs.tolist()
+            ys = ys.tolist()
+
+        lines = []
+        values = [0.0] * (2*pointsNum)
+        for circleXs, circleYs, z in zip(xs, ys, zs):
+            values[0::2] = circleXs
+            values[1::2] = circleYs
+            # Output to 2 decimal places
+            lines.append((f"%.2f,%.2f,{z:.2f}\n" * pointsNum + "\n") % tuple(values))
+        yield "".join(lines)
+
+
+def _fixed2(values):
+    # The text of f"{value:.2f}" for each of the NumPy array values, as an array with a row of bytes for each
+    # value, right aligned with spaces, or None if any value can't be formatted exactly this way
+    cents = values * 100
+    # cents is the exact value rounded to the nearest float, so the rounding to a whole number of
+    # cents is only certain away from halves
+    distance = np.abs(np.abs(cents - np.floor(cents)) - 0.5)
+    if not (np.all(np.abs(cents) < 1e16) and np.all(distance > np.abs(cents) * 2.0**-50)):
+        return None
+    cents = np.abs(np.rint(cents)).astype(np.int64)
+    whole = cents // 100
+
+    digits = len(str(whole.max())) if len(whole) else 1
+    # A column for the sign, then the whole number, the decimal point and the cents. Each column is
+    # filled in one after another, so they're stored one after another and transposed at the end
+    columns = np.empty((digits + 4, len(values)), dtype=np.uint8)
+    columns[0] = ord(" ")
+    columns[-1] = ord("0") + cents % 10
+    columns[-2] = ord("0") + cents // 10 % 10
+    columns[-3] = ord(".")
+    # Column of the sign, just before the first digit
+    signColumn = np.full(len(values), digits)
+    remaining = whole
+    for column in range(digits, 0, -1):
+        columns[column] = ord("0") + remaining % 10
+        if column < digits:
+            # Leading zeros aren't shown
+            shown = remaining > 0
+            columns[column][~shown] = ord(" ")
+            signColumn -= shown
+        remaining = remaining // 10
+    # f"{-0.001:.2f}" is "-0.00", so the sign is shown even if the number rounds to 0
+    negative = np.flatnonzero(np.signbit(values))
+    columns[signColumn[negative] - 1, negative] = ord("-")
+    return columns.T
+
+
+def _formatPoints(xs, ys, zs):
+    # Text of the Points CSV for the circles with points at xs, ys (NumPy arrays of a row for each circle)
+    # and elevations zs, or None if it can't be formatted exactly by _fixed2
+    circles, pointsNum = xs.shape
+    xChars = _fixed2(xs.ravel())
+    yChars = _fixed2(ys.ravel())
+    zChars = _fixed2(zs)
+    if xChars is None or yChars is None or zChars is None:
+        return None
+
+    xWidth = xChars.shape[1]
+    yWidth = yChars.shape[1]
+    zWidth = zChars.shape[1]
+    lineWidth = xWidth + yWidth + zWidth + 3
+    # Each circle's lines followed by a blank line
+    text = np.empty((circles, pointsNum*lineWidth + 1), dtype=np.uint8)
+    text[:, -1] = ord("\n")
+    lines = text[:, :-1].reshape(circles, pointsNum, lineWidth)
+    lines[:, :, :xWidth] = xChars.reshape(circles, pointsNum, xWidth)
+    lines[:, :, xWidth] = ord(",")
+    lines[:, :, xWidth+1:xWidth+yWidth+1] = yChars.reshape(circles, pointsNum, yWidth)
+    lines[:, :, xWidth+yWidth+1] = ord(",")
+    lines[:, :, xWidth+yWidth+2:-1] = zChars[:, np.newaxis, :]
+    lines[:, :, -1] = ord("\n")
+    text = text.ravel()
+    return text[text != ord(" ")].tobytes().decode("ascii")
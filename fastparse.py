@@ -0,0 +1,301 @@
+# Fast parser for files with the X,Y,Z columns at known positions and no ID column.
+#
+# The file is memory-mapped and read a block of lines at a time. Line, separator and token
+# boundaries are found for the whole block with NumPy and the coordinate columns are converted
+# straight into float64 arrays, which are stored in a PolygonBatch without making a Python object
+# for each point. The polygons found are exactly the same as parsing each line with
+# smartSplit and float(), as parseWithoutID does: NumPy converts text to float64 with the same
+# correctly rounded conversion as float(), and anything it could treat differently (non-ASCII
+# text, unusual characters, lone carriage returns, tokens that aren't plain numbers) is handled
+# line by line with float() instead.
+
+import mmap
+import locale
+
+from polygonbatch import PolygonBatch
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Only used if NumPy is installed
+available = np is not None
+
+# Bytes read at a time, extended to the end of the line
+BLOCK_SIZE = 1 << 25
+# Longer tokens are handled line by line
+_MAX_TOKEN = 64
+# Tokens checked for numbers too long to convert directly before parsing a block
+_SAMPLE_SIZE = 64
+
+if np is not None:
+    # Each character's code for _readColumn, digits are their value. Tokens with any _OTHER
+    # characters are handled line by line
+    _DOT, _MINUS, _PLUS, _SPACE, _EXPONENT, _OTHER, _END = range(10, 17)
+    _CODES = np.full(256, _OTHER, dtype=np.uint8)
+    _CODES[list(b"0123456789")] = range(10)
+    _CODES[ord(".")] = _DOT
+    _CODES[ord("-")] = _MINUS
+    _CODES[ord("+")] = _PLUS
+    _CODES[list(b" \t\r")] = _SPACE
+    _CODES[list(b"eE")] = _EXPONENT
+    _SCALE = np.ones(_END + 1)
+    _SCALE[:10] = 10
+    _DIGIT_VALUE = np.zeros(_END + 1)
+    _DIGIT_VALUE[:10] = range(10)
+    # Control characters other than tab and line endings, and all non-ASCII bytes
+    _UNUSUAL = np.zeros(256, dtype=bool)
+    _UNUSUAL[[c for c in range(32) if c not in b"\t\n\r"]] = True
+    _UNUSUAL[128:] = True
+    _POWERS_OF_TEN = np.array([float(10 ** k) for k in range(16)])
+
+
+def iterRuns(fileName, columns, separator):
+    # Yields a PolygonBatch of the runs of consecutive lines that have numbers in the columns given by
+    # columns[:3] for each block of the file, including runs of fewer than 3 points. Lines count if they
+    # have more tokens than max(columns) and the tokens in those columns can be converted with float()
+    # Raises OSError if the file can't be read
+    numColumns = max(columns[:3]) + 1
+    with open(fileName, "rb") as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file
+            return
+
+        with data:
+            # x, y and z of a run that reached the end of the last block, it may continue in the next one
+            carried = None
+            start = 0
+            while start < len(data):
+                end = min(start + BLOCK_SIZE, len(data))
+                if end < len(data):
+                    newLine = data.find(b"\n", end - 1)
+                    end = len(data) if newLine < 0 else newLine + 1
+
+                xs, ys, zs, isRecord = _parseBlock(data, start, end, columns, numColumns, separator)
+                start = end
+
+                runs = _runs(isRecord)
+                counts = [runEnd - runStart for runStart, runEnd in runs]
+                if carried is not None:
+                    # A run is ended by the first line that isn't a record
+                    if runs and runs[0][0] == 0:
+                        counts[0] += len(carried[2])
+                    else:
+                        counts.insert(0, len(carried[2]))
+                    xs = np.concatenate((carried[0], xs))
+                    ys = np.concatenate((carried[1], ys))
+                    zs = np.concatenate((carried[2], zs))
+                    carried = None
+                if start < len(data) and isRecord[-1]:
+                    count = counts.pop()
+                    carried = (xs[-count:].copy(), ys[-count:].copy(), zs[-count:].copy())
+                    xs = xs[:-count]
+                    ys = ys[:-count]
+                    zs = zs[:-count]
+                if counts:
+                    yield PolygonBatch.fromArrays(xs, ys, zs, counts)
+            if carried is not None:
+                yield PolygonBatch.fromArrays(*carried, [len(carried[2])])
+
+
+def _runs(isRecord):
+    # (start, end) of each run of True values in the bool array isRecord
+    if not len(isRecord):
+        return []
+    bounds = np.concatenate(([0], np.flatnonzero(np.diff(isRecord.view(np.int8))) + 1, [len(isRecord)])).tolist()
+    return [(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1) if isRecord[bounds[i]]]
+
+
+def _parseBlock(data, start, end, columns, numColumns, separator):
+    # Returns arrays of x, y and z for each record line and a bool array of whether each line is a record
+    block = np.frombuffer(data, dtype=np.uint8, count=end - start, offset=start)
+    if _UNUSUAL[block].any():
+        return _parseLines(data[start:end], columns, numColumns, separator)
+
+    # Universal newlines treat a lone carriage return as the end of a line
+    returns = np.flatnonzero(block == 13)
+    if len(returns) and (returns[-1] == len(block) - 1 or (block[returns + 1] != 10).any()):
+        return _parseLines(data[start:end], columns, numColumns, separator)
+
+    lineEnds = np.flatnonzero(block == 10)
+    if not len(lineEnds) or lineEnds[-1] != len(block) - 1:
+        lineEnds = np.append(lineEnds, len(block))
+    lineStarts = np.concatenate(([0], lineEnds[:-1] + 1))
+
+    if separator.isspace():
+        # str.split() semantics, tokens are runs of anything but whitespace
+        isSpace = (block == 32) | (block == 9) | (block == 10) | (block == 13)
+        starts = np.flatnonzero(~isSpace & np.concatenate(([True], isSpace[:-1])))
+        ends = np.flatnonzero(~isSpace & np.concatenate((isSpace[1:], [True]))) + 1
+        firstToken = np.searchsorted(starts, lineStarts)
+        numTokens = np.searchsorted(starts, lineEnds) - firstToken
+        candidate = numTokens >= numColumns
+        first = firstToken[candidate]
+        tokenStarts = [starts[first + column] for column in columns[:3]]
+        tokenEnds = [ends[first + column] for column in columns[:3]]
+    else:
+        if len(separator) != 1 or ord(separator) > 127:
+            return _parseLines(data[start:end], columns, numColumns, separator)
+        separators = np.flatnonzero(block == ord(separator))
+        contentEnds = lineEnds - ((lineEnds > lineStarts) & (block.take(lineEnds - 1, mode="clip") == 13))
+        firstSeparator = np.searchsorted(separators, lineStarts)
+        numTokens = np.searchsorted(separators, lineEnds) - firstSeparator + 1
+        candidate = numTokens >= numColumns
+        first = firstSeparator[candidate]
+        last = numTokens[candidate] - 1
+        tokenStarts = []
+        tokenEnds = []
+        for column in columns[:3]:
+            if column == 0:
+                tokenStarts.append(lineStarts[candidate])
+            else:
+                tokenStarts.append(separators[first + column - 1] + 1)
+            # The last token ends at the end of the line, before any carriage return
+            isLast = last == column
+            tokenEnds.append(np.where(isLast, contentEnds[candidate],
+                                      separators[np.minimum(first + column, len(separators) - 1)] if len(separators) else 0))
+
+    candidateLines = np.flatnonzero(candidate)
+
+    # Numbers of more than 15 digits can't be converted directly, if most are that long the block is
+    # quicker to parse line by line
+    sample = slice(0, _SAMPLE_SIZE)
+    longTokens = 0
+    for tokenStart, tokenEnd in zip(tokenStarts, tokenEnds):
+        for sampleStart, sampleEnd in zip(tokenStart[sample].tolist(), tokenEnd[sample].tolist()):
+            if sum(1 for char in data[start + sampleStart:start + sampleEnd] if 48 <= char <= 57) > 15:
+                longTokens += 1
+    if longTokens * 2 > len(candidateLines[sample]) * 3:
+        return _parseLines(data[start:end], columns, numColumns, separator)
+
+    coords = []
+    isRecord = np.ones(len(candidateLines), dtype=bool)
+    checkLines = np.zeros(len(candidateLines), dtype=bool)
+    for tokenStart, tokenEnd in zip(tokenStarts, tokenEnds):
+        lengths = tokenEnd - tokenStart
+        if len(lengths) and lengths.max() > _MAX_TOKEN:
+            return _parseLines(data[start:end], columns, numColumns, separator)
+        values, isNumber, isUnusual = _readColumn(block, tokenStart, lengths)
+        isRecord &= isNumber
+        checkLines |= isUnusual
+        coords.append(values)
+
+    plain = isRecord & ~checkLines
+    coords = [values[plain] for values in coords]
+
+    isLineRecord = np.zeros(len(lineStarts), dtype=bool)
+    isLineRecord[candidateLines[plain]] = True
+    xs, ys, zs = coords
+
+    # The few lines with unusual tokens are checked with float() as parseWithoutID would
+    checked = np.flatnonzero(checkLines)
+    if len(checked):
+        found = {}
+        for i in checked.tolist():
+            line = candidateLines[i]
+            text = bytes(block[lineStarts[line]:lineEnds[line]]).decode("ascii")
+            tokens = text.split() if separator.isspace() else text.split(separator)
+            try:
+                found[line] = tuple(float(tokens[column]) for column in columns[:3])
+            except ValueError:
+                pass
+        if found:
+            isLineRecord[list(found)] = True
+            recordLines = np.flatnonzero(isLineRecord).tolist()
+            plainValues = iter(zip(xs.tolist(), ys.tolist(), zs.tolist()))
+            merged = [found[line] if line in found else next(plainValues) for line in recordLines]
+            xs, ys, zs = np.array(merged, dtype=np.float64).T
+
+    return xs, ys, zs, isLineRecord
+
+
+def _readColumn(block, starts, lengths):
+    # Converts the tokens of one column, returns the values, whether each token is a number and
+    # whether each token has characters that aren't part of plain numbers (values aren't set for these)
+    # Tokens of an optional sign then up to 15 digits with at most one dot are converted directly:
+    # the digits as an integer and a power of ten are both exact in float64, so dividing them is
+    # correctly rounded like float(). Any other plain tokens are converted by NumPy
+    n = len(starts)
+    mantissa = np.zeros(n)
+    numDigits = np.zeros(n, dtype=np.int8)
+    numDecimals = np.zeros(n, dtype=np.int8)
+    seenDot = np.zeros(n, dtype=bool)
+    negative = np.zeros(n, dtype=bool)
+    irregular = np.zeros(n, dtype=bool)
+    isUnusual = np.zeros(n, dtype=bool)
+
+    shortest = int(lengths.min()) if n else 0
+    for offset in range(int(lengths.max()) if n else 0):
+        code = _CODES.take(block.take(starts + offset, mode="clip"))
+        if offset >= shortest:
+            code = np.where(offset < lengths, code, _END).astype(np.uint8)
+        isDigit = code < 10
+        mantissa *= _SCALE.take(code)
+        mantissa += _DIGIT_VALUE.take(code)
+        numDigits += isDigit
+        numDecimals += isDigit & seenDot
+        isDot = code == _DOT
+        irregular |= isDot & seenDot
+        seenDot |= isDot
+        if offset == 0:
+            negative = code == _MINUS
+            irregular |= code - np.uint8(_SPACE) < 3
+        else:
+            # Anything but digits and the first dot after the first character
+            irregular |= code - np.uint8(_MINUS) < 5
+        isUnusual |= code == _OTHER
+
+    isNumber = numDigits > 0
+    irregular |= numDigits > 15
+    values = mantissa / _POWERS_OF_TEN[np.minimum(numDecimals, 15)]
+    values = np.where(negative, -values, values)
+
+    # The rest are converted by NumPy, or float() if there are any it can't convert
+    rest = np.flatnonzero(isNumber & ~isUnusual & irregular)
+    if len(rest):
+        width = max(int(lengths[rest].max()), 1)
+        offsets = np.arange(width)
+        inToken = offsets < lengths[rest, None]
+        chars = np.where(inToken, block.take(starts[rest, None] + offsets, mode="clip"), 0).astype(np.uint8)
+        try:
+            values[rest] = chars.view(f"S{width}").ravel().astype(np.float64)
+        except ValueError:
+            for i in rest.tolist():
+                try:
+                    values[i] = float(bytes(block[starts[i]:starts[i] + lengths[i]]))
+                except ValueError:
+                    isNumber[i] = False
+    return values, isNumber, isUnusual
+
+
+def _parseLines(blockBytes, columns, numColumns, separator):
+    # The same as _parseBlock one line at a time with float(), for blocks NumPy can't handle exactly
+    text = blockBytes.decode(locale.getpreferredencoding(False))
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    # A block ends with a line ending, which doesn't start another line
+    if lines and lines[-1] == "":
+        lines.pop()
+    xs = []
+    ys = []
+    zs = []
+    isRecord = []
+    for line in lines:
+        tokens = line.split() if separator.isspace() else line.split(separator)
+        if len(tokens) >= numColumns:
+            try:
+                x = float(tokens[columns[0]])
+                y = float(tokens[columns[1]])
+                z = float(tokens[columns[2]])
+                xs.append(x)
+                ys.append(y)
+                zs.append(z)
+                isRecord.append(True)
+                continue
+            except ValueError:
+                pass
+        isRecord.append(False)
+    return (np.array(xs, dtype=np.float64), np.array(ys, dtype=np.float64), np.array(zs, dtype=np.float64),
+            np.array(isRecord, dtype=bool))
@@ -0,0 +1,1173 @@
+# The GUI, for adding files and previewing their polygons and circles before saving them. Kept apart from
+# main so batch mode can be run without tkinter, main only imports it when the GUI is started.
+
+from os import chdir, makedirs, path, cpu_count
+from functools import partial
+from itertools import islice
+from time import perf_counter
+import queue
+import sqlite3
+import webbrowser
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox, font as tkfont
+from polygonbatch import PolygonBatch
+from spatialindex import BoxIndex
+from metrics import RunMetrics
+from main import (ENGINES, PRECISION, PRECISION_POLICIES, DXF_ITEMS, SEPARATORS, showError, showWarning, openCache,
+                  smartSplit, parseData, reportProblems, SolveJob, saveOutputs)
+
+
+# How much larger or smaller the preview can be resized before the polygons are drawn again in more or less detail
+REDRAW_SCALE = 2
+# How much each step of the mouse wheel zooms the preview, and how far it can zoom in from showing everything
+ZOOM_STEP = 1.25
+MAX_ZOOM = 10000
+# Milliseconds after the preview stops being zoomed or resized before it is drawn again
+REDRAW_DELAY = 200
+# Milliseconds between checks of the progress of the circles being calculated by the GUI
+PROGRESS_INTERVAL = 100
+# What each column of a file in another format can be chosen to contain
+COLUMN_OPTIONS = ["Ignore", "X", "Y", "Z", "ID"]
+# Lines shown from the start of a file in another format when choosing its columns
+PREVIEW_LINES = 102
+
+
+class MenuBar(tk.Menu):
+    def __init__(self, root):
+        super().__init__()
+
+        self.option_add("*tearOff", False)
+
+        file_menu = tk.Menu(self)
+        file_menu.add_command(label="Clear Result Cache", command=root.clearCache)
+        file_menu.add_command(label="Show Run Report", command=root.showReport)
+        file_menu.add_command(label="Save Run Report...", command=root.saveReport)
+        file_menu.add_command(label="Exit", command=root.quit)
+
+        help_menu = tk.Menu(self)
+        help_menu.add_command(label="Support", command=lambda: webbrowser.open(r"https://github.com/Archer4499/Maximum-Inscribed-Circle"))
+        help_menu.add_command(label="About",
+                              command=lambda: messagebox.showinfo("About", "Reads data files containing polygons and outputs the co-ordinates and diameter "
+                                                                           "(and optionally points of the circle) of maximum inscribed circles to be "
+                                                                           "contained within the digitized polygons.\n\n"
+                                                                           "Read more at https://github.com/Archer4499/Maximum-Inscribed-Circle\n\n"
+                                                                           "This project is licensed under the MIT License."))
+
+        self.add_cascade(menu=file_menu, label="File")
+        self.add_cascade(menu=help_menu, label="Help")
+
+        root.config(menu=self)
+
+
+class NumEntry(ttk.Spinbox):
+    # A number validated Spinbox, numType is int or float, allowBlank lets it be left empty for no value
+    def __init__(self, length, min_val, max_val, *args, numType=int, allowBlank=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.numType = numType
+        self.allowBlank = allowBlank
+        self.length = length
+        self.min_val = min_val
+        self.max_val = max_val
+        self.default_val = self.get()
+        self.configure(from_=self.min_val, to=self.max_val, width=self.length + 1, validate="all",
+                       validatecommand=(self.register(self.on_validate), "%P", "%d", "%V"))
+
+    def on_validate(self, new_value, action_type, validate_type):
+        if validate_type == "key":
+            # Don't validate if action is delete
+            if action_type != "0" and new_value.strip() != "":
+                try:
+                    value = self.numType(new_value)
+                except ValueError:
+                    self.bell()
+                    return False
+        elif validate_type == "focusout":
+            if self.allowBlank and new_value.strip() == "":
+                return True
+            try:
+                value = self.numType(new_value)
+                if value < self.min_val:
+                    self.bell()
+                    self.set(self.min_val)
+                    return False
+                if value > self.max_val:
+                    self.bell()
+                    self.set(self.max_val)
+                    return False
+            except ValueError:
+                self.bell()
+                self.set(self.default_val)
+                return False
+
+        return True
+
+
+class SessionFile:
+    # The PolygonBatch of the polygons loaded from a file and their circles
+    def __init__(self, fileName, polygons, colour):
+        self.fileName = fileName
+        self.polygons = polygons
+        # Index into the preview colours of the first polygon
+        self.colour = colour
+        self.tag = f"file{id(self)}"
+        self.bounds = polygons.bounds()
+        # Index of each polygon's bounds, so only the polygons in view need to be drawn
+        self.index = BoxIndex(polygons.boxes())
+
+
+class CanvasView:
+    # How co-ordinates within bounds (xMin, yMin, xMax, yMax) were scaled to fit the canvas
+    def __init__(self, bounds, scale, xCanvasMin, yCanvasMin):
+        self.bounds = bounds
+        self.scale = scale
+        self.xCanvasMin = xCanvasMin
+        self.yCanvasMin = yCanvasMin
+
+    def contains(self, bounds):
+        return (self.bounds[0] <= bounds[0] and self.bounds[1] <= bounds[1] and
+                bounds[2] <= self.bounds[2] and bounds[3] <= self.bounds[3])
+
+    def touches(self, bounds):
+        # True if bounds reach any edge of the view's bounds
+        return any(a == b for a, b in zip(self.bounds, bounds))
+
+    def zoom(self, factor, x, y):
+        # This view zoomed in by factor (out if less than 1), keeping what is at canvas point x,y there
+        return CanvasView(self.bounds, self.scale*factor, x - (x-self.xCanvasMin)*factor, y - (y-self.yCanvasMin)*factor)
+
+    def move(self, dx, dy):
+        return CanvasView(self.bounds, self.scale, self.xCanvasMin + dx, self.yCanvasMin + dy)
+
+    def area(self, width, height):
+        # (xMin, yMin, xMax, yMax) of the co-ordinates shown on a canvas width by height
+        return (self.bounds[0] - self.xCanvasMin/self.scale,
+                self.bounds[1] + (self.yCanvasMin-height)/self.scale,
+                self.bounds[0] + (width-self.xCanvasMin)/self.scale,
+                self.bounds[1] + self.yCanvasMin/self.scale)
+
+
+class Gui(tk.Tk):
+    def __init__(self):
+        super().__init__()
+
+        # Files loaded in this session, self.polygons is all of their polygons and circles joined together
+        self.files = []
+        self.polygons = PolygonBatch()
+        self.numPolygons = tk.IntVar()
+        self.numPolygons.set(0)
+        # Colour of the first polygon of the next file loaded, so colours don't change as files are removed
+        self.nextColour = 0
+        # CanvasView of what is drawn, None if nothing is, and the scale the polygons were simplified for
+        self.view = None
+        self.drawnScale = None
+        # Scale of the view showing everything, whether the view has been zoomed or moved from it since,
+        # the after() id of the redraw waiting for zooming to stop and where the preview is being dragged from
+        self.fitScale = None
+        self.zoomed = False
+        self.redrawAfter = None
+        self.dragPoint = None
+        # SolveJob calculating the circles of the files being added and those files' names and numbers
+        # of polygons, None when not calculating
+        self.job = None
+        self.jobFiles = []
+        # When the job was started and the cache's total hits and misses then
+        self.jobStart = 0
+        self.jobCacheCounts = (0, 0)
+        # Time taken by each stage and the solver's statistics for each polygon this session, and the
+        # number in it of the job's first polygon
+        self.metrics = RunMetrics()
+        self.jobFirstPolygon = 0
+        # Added to the status line once the job is done, saying how many of its files were read with Auto
+        self.jobNote = ""
+
+        # Settings
+        self.outputDXF = tk.IntVar()
+        self.outputDXF.set(1)
+        self.outputDXFCircle = tk.IntVar()
+        self.outputDXFCircle.set(0)
+        self.outputDXFDiameter = tk.IntVar()
+        self.outputDXFDiameter.set(1)
+        self.outputDXFLabel = tk.IntVar()
+        self.outputDXFLabel.set(0)
+        self.outputDXFPoints = tk.IntVar()
+        self.outputDXFPoints.set(0)
+        self.outputDXFPolyLines = tk.IntVar()
+        self.outputDXFPolyLines.set(1)
+
+        self.outputCircles = tk.IntVar()
+        self.outputCircles.set(0)
+
+        self.outputPoints = tk.IntVar()
+        self.outputPoints.set(1)
+        self.outputBinary = tk.IntVar()
+        self.outputBinary.set(0)
+        self.outputBinaryPoints = tk.IntVar()
+        self.outputBinaryPoints.set(0)
+
+        self.outputPointsNum = tk.StringVar()
+        self.outputPointsNum.set("16")
+
+        self.outputFolder = tk.StringVar()
+        self.outputFolder.set("./")
+
+        self.outputPerFile = tk.IntVar()
+        self.outputPerFile.set(0)
+
+        self.solverWorkers = tk.StringVar()
+        self.solverWorkers.set(str(cpu_count() or 1))
+
+        self.solverEngine = tk.StringVar()
+        self.solverEngine.set("polylabel")
+
+        self.solverTimeLimit = tk.StringVar()
+        # Blank for no time limit
+        self.solverTimeLimit.set("")
+
+        self.simplifyTolerance = tk.StringVar()
+        self.simplifyTolerance.set("0")
+
+        self.precisionPolicy = tk.StringVar()
+        self.precisionPolicy.set("absolute")
+        self.precisionValue = tk.StringVar()
+        self.precisionValue.set(str(PRECISION))
+
+        self.cacheStats = tk.StringVar()
+        self.progressText = tk.StringVar()
+
+        self.title("Maximum Inscribed Circle")
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+        self.cache = openCache()
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        MenuBar(self)
+
+        mainframe = ttk.Frame(self)
+        mainframe.grid(column=0, row=0, sticky="NESW")
+        # Clear focus from text boxes on click
+        mainframe.bind("<1>", lambda event: mainframe.focus_set())
+
+        # TODO(Derek): Not sure how to set correct minsizes
+        # Uses 3 columns
+        self.initLoad(mainframe, 1)
+        mainframe.columnconfigure(1, weight=1)
+        mainframe.columnconfigure(2, weight=0)
+        mainframe.columnconfigure(3, weight=1)
+
+        ttk.Separator(mainframe, orient="vertical")\
+            .grid(column=4, row=0, rowspan=30, padx=5, pady=0, sticky="NS")
+        mainframe.rowconfigure(29, weight=1)
+
+        # Uses 2 columns
+        self.initSave(mainframe, 5)
+        mainframe.columnconfigure(5, weight=0, minsize=15)
+        mainframe.columnconfigure(6, weight=2)
+
+    def initLoad(self, parentFrame, column):
+        self.loadButton = ttk.Button(parentFrame, text="Add csv file/s", command=self.load)
+        self.loadButton.grid(column=column, row=0, padx=5, pady=5)
+        self.loadButton.focus_set()
+
+        ttk.Label(parentFrame, text="Number of polygons found:")\
+            .grid(column=column+1, row=0, sticky="E", padx=(5, 0), pady=0)
+        ttk.Label(parentFrame, textvariable=self.numPolygons)\
+            .grid(column=column+2, row=0, sticky="W", padx=(0, 5), pady=0)
+
+        ttk.Label(parentFrame, text="Solver processes:")\
+            .grid(column=column+1, row=1, sticky="E", padx=(5, 0), pady=0)
+        NumEntry(3, 1, 256, parentFrame, textvariable=self.solverWorkers)\
+            .grid(column=column+2, row=1, sticky="W", padx=(0, 5), pady=0)
+
+        engineFrame = ttk.Frame(parentFrame)
+        engineFrame.grid(column=column, row=1, padx=5, pady=0)
+        ttk.Label(engineFrame, text="Solver:")\
+            .grid(column=0, row=0, sticky="E", padx=(0, 5), pady=0)
+        ttk.Combobox(engineFrame, textvariable=self.solverEngine, values=list(ENGINES), width=9, state="readonly")\
+            .grid(column=1, row=0, sticky="W", padx=0, pady=0)
+
+        ttk.Label(parentFrame, text="Time limit per polygon (s):")\
+            .grid(column=column+1, row=2, sticky="E", padx=(5, 0), pady=0)
+        NumEntry(4, 1, 3600, parentFrame, textvariable=self.solverTimeLimit, allowBlank=True)\
+            .grid(column=column+2, row=2, sticky="W", padx=(0, 5), pady=0)
+
+        ttk.Label(parentFrame, textvariable=self.cacheStats)\
+            .grid(column=column, row=2, padx=5, pady=0)
+
+        filesFrame = ttk.Frame(parentFrame)
+        filesFrame.grid(column=column, columnspan=3, row=3, sticky="EW", padx=5, pady=(5, 0))
+        filesFrame.columnconfigure(1, weight=1)
+        ttk.Label(filesFrame, text="Loaded files:")\
+            .grid(column=0, row=0, sticky="E", padx=(0, 5), pady=0)
+        self.fileSelector = ttk.Combobox(filesFrame, state="readonly")
+        self.fileSelector.grid(column=1, row=0, sticky="EW", padx=0, pady=0)
+        self.removeButton = ttk.Button(filesFrame, text="Remove file", command=self.removeFile)
+        self.removeButton.grid(column=2, row=0, padx=(5, 0), pady=0)
+        self.removeButton.state(["disabled"])
+
+        progressFrame = ttk.Frame(parentFrame)
+        progressFrame.grid(column=column, columnspan=3, row=4, sticky="EW", padx=5, pady=(5, 0))
+        progressFrame.columnconfigure(0, weight=1)
+        self.progressBar = ttk.Progressbar(progressFrame, orient="horizontal", mode="determinate")
+        self.progressBar.grid(column=0, row=0, sticky="EW", padx=0, pady=0)
+        ttk.Label(progressFrame, textvariable=self.progressText)\
+            .grid(column=1, row=0, sticky="W", padx=5, pady=0)
+        self.cancelButton = ttk.Button(progressFrame, text="Cancel", command=self.cancelJob)
+        self.cancelButton.grid(column=2, row=0, padx=0, pady=0)
+        self.cancelButton.state(["disabled"])
+
+        ttk.Label(parentFrame, text="Preview of polygons and output circles:", anchor="center")\
+            .grid(column=column, columnspan=3, row=5, sticky="EW", padx=5, pady=0)
+        self.canvas = tk.Canvas(parentFrame, background="white")
+        self.canvas.grid(column=column, columnspan=3, row=6, rowspan=24, sticky="NESW", padx=(10, 5), pady=(0, 10))
+        self.canvas.bind("<Configure>", self.resize)
+        self.canvas.bind("<Enter>", self._bind_mouse)
+        self.canvas.bind("<Leave>", self._unbind_mouse)
+        self.canvas.bind("<ButtonPress-1>", self.startDrag)
+        self.canvas.bind("<B1-Motion>", self.drag)
+        self.canvas.bind("<Double-Button-1>", lambda event: self.drawShapes())
+
+    def initSave(self, parentFrame, column):
+        ttk.Checkbutton(parentFrame, text="Output to DXF", variable=self.outputDXF, command=self.disableDXF)\
+            .grid(column=column, row=0, columnspan=2, sticky="W", padx=5, pady=(5, 0))
+
+        self.dxfCheckButtons = []
+        self.dxfCheckButtons.append(ttk.Checkbutton(parentFrame, text="Output Circle in DXF", variable=self.outputDXFCircle))
+        self.dxfCheckButtons.append(ttk.Checkbutton(parentFrame, text="Output Diameter Line in DXF", variable=self.outputDXFDiameter))
+        self.dxfCheckButtons.append(ttk.Checkbutton(parentFrame, text="Output Diameter Label in DXF", variable=self.outputDXFLabel))
+        self.dxfCheckButtons.append(ttk.Checkbutton(parentFrame, text="Output Points in DXF", variable=self.outputDXFPoints, command=self.disablePointsNum))
+        self.dxfCheckButtons.append(ttk.Checkbutton(parentFrame, text="Output PolyLine in DXF", variable=self.outputDXFPolyLines, command=self.disablePointsNum))
+        for i, button in enumerate(self.dxfCheckButtons):
+            button.grid(column=column+1, row=i+1, sticky="W", padx=5, pady=0)
+
+        ttk.Checkbutton(parentFrame, text="Output to Circles csv", variable=self.outputCircles)\
+            .grid(column=column, row=6, columnspan=2, sticky="W", padx=5, pady=5)
+
+        ttk.Checkbutton(parentFrame, text="Output to Points csv", variable=self.outputPoints, command=self.disablePointsNum)\
+            .grid(column=column, row=7, columnspan=2, sticky="W", padx=5, pady=5)
+
+        ttk.Checkbutton(parentFrame, text="Output to Binary", variable=self.outputBinary, command=self.disableBinary)\
+            .grid(column=column, row=8, columnspan=2, sticky="W", padx=5, pady=(5, 0))
+        self.binaryPointsCheckButton = ttk.Checkbutton(parentFrame, text="Output Points in Binary",
+                                                       variable=self.outputBinaryPoints, command=self.disablePointsNum)
+        self.binaryPointsCheckButton.grid(column=column+1, row=9, sticky="W", padx=5, pady=(0, 5))
+        self.binaryPointsCheckButton.state(["disabled"])
+
+        ttk.Label(parentFrame, text="Number of points on circle:")\
+            .grid(column=column, row=10, columnspan=2, sticky="W", padx=5, pady=(5, 0))
+
+        self.pointsNumCheckButton = NumEntry(4, 3, 9999, parentFrame, textvariable=self.outputPointsNum)
+        self.pointsNumCheckButton.grid(column=column, row=11, columnspan=2, sticky="W", padx=5, pady=0)
+
+        ttk.Label(parentFrame, text="Simplify tolerance (0 for none):")\
+            .grid(column=column, row=12, columnspan=2, sticky="W", padx=5, pady=(5, 0))
+        NumEntry(6, 0, 1000, parentFrame, numType=float, increment=0.01, textvariable=self.simplifyTolerance)\
+            .grid(column=column, row=13, columnspan=2, sticky="W", padx=5, pady=0)
+
+        ttk.Label(parentFrame, text="Precision:")\
+            .grid(column=column, row=14, columnspan=2, sticky="W", padx=5, pady=(5, 0))
+        precisionFrame = ttk.Frame(parentFrame)
+        precisionFrame.grid(column=column, row=15, columnspan=2, sticky="W", padx=5, pady=0)
+        precisionPolicies = ttk.Combobox(precisionFrame, textvariable=self.precisionPolicy,
+                                         values=list(PRECISION_POLICIES), width=9, state="readonly")
+        precisionPolicies.grid(column=0, row=0, sticky="W", padx=(0, 5), pady=0)
+        precisionPolicies.bind("<<ComboboxSelected>>", self.precisionPolicySet)
+        NumEntry(8, 0, 1000, precisionFrame, numType=float, increment=0.001, textvariable=self.precisionValue)\
+            .grid(column=1, row=0, sticky="W", padx=0, pady=0)
+
+        ttk.Label(parentFrame, text="Output Folder:")\
+            .grid(column=column, row=16, columnspan=2, sticky="W", padx=5, pady=(5, 0))
+        ttk.Entry(parentFrame, textvariable=self.outputFolder)\
+            .grid(column=column, row=17, columnspan=2, sticky="EW", padx=5, pady=0)
+
+        ttk.Checkbutton(parentFrame, text="Save each loaded file separately", variable=self.outputPerFile)\
+            .grid(column=column, row=18, columnspan=2, sticky="W", padx=5, pady=5)
+
+        self.browseButton = ttk.Button(parentFrame, text="Browse", command=self.browse)
+        self.browseButton.grid(column=column, row=19, columnspan=2, padx=5, pady=(5, 0))
+
+        self.saveButton = ttk.Button(parentFrame, text="Save", command=self.save)
+        self.saveButton.grid(column=column, row=20, columnspan=2, padx=5, pady=(0, 5))
+        self.saveButton.state(["disabled"])
+
+    def disableDXF(self):
+        # Bound to dxf CheckButton
+        if self.outputDXF.get():
+            for button in self.dxfCheckButtons:
+                button.state(["!disabled"])
+        else:
+            for button in self.dxfCheckButtons:
+                button.state(["disabled"])
+        self.disablePointsNum()
+
+    def disableBinary(self):
+        # Bound to binary CheckButton
+        if self.outputBinary.get():
+            self.binaryPointsCheckButton.state(["!disabled"])
+        else:
+            self.binaryPointsCheckButton.state(["disabled"])
+        self.disablePointsNum()
+
+    def precisionPolicySet(self, _=None):
+        # Bound to the precision policy Combobox, the value means something different for each policy
+        self.precisionValue.set(str(PRECISION_POLICIES[self.precisionPolicy.get()]))
+
+    def disablePointsNum(self):
+        # Bound to CheckButtons related to pointsNumCheckButton
+        if (self.outputPoints.get() or self.outputDXF.get() and (self.outputDXFPoints.get() or self.outputDXFPolyLines.get()) or
+                self.outputBinary.get() and self.outputBinaryPoints.get()):
+            self.pointsNumCheckButton.state(["!disabled"])
+        else:
+            self.pointsNumCheckButton.state(["disabled"])
+
+    def load(self):
+        # Bound to loadButton
+        # Adds the polygons and circles of the chosen files to the session, only solving the new polygons
+        if float(self.precisionValue.get()) <= 0 and self.precisionPolicy.get() != "output":
+            messagebox.showerror(title="Error", message="Precision should be greater than 0.")
+            return
+        fileNames = filedialog.askopenfilenames(filetypes=[("All Data Files", ".csv .str .txt .arch_d"),
+                                                           ("CSV", ".csv"),
+                                                           ("STR", ".str"),
+                                                           ("Text", ".txt"),
+                                                           ("Vulcan Data", ".arch_d")])
+        if not fileNames:
+            return
+
+        loaded = [sessionFile.fileName for sessionFile in self.files]
+        already = [fileName for fileName in fileNames if fileName in loaded]
+        if already:
+            showWarning("Already loaded, remove the file first to load it again:\n" + "\n".join(already))
+
+        newFiles = []
+        polygons = PolygonBatch()
+        firstPolygon = self.metrics.numPolygons()
+        # Number of files read with Auto, how each was read is in the run report rather than a dialog per file
+        autoFiles = 0
+        for fileName in fileNames:
+            if fileName in loaded:
+                continue
+            notes = []
+            with self.metrics.timed("parse", fileName):
+                filePolygons = parseData(fileName, notes=notes)
+            self.metrics.addFile(fileName, len(filePolygons))
+            self.metrics.addNotes(fileName, notes)
+            autoFiles += bool(notes)
+            if filePolygons:
+                newFiles.append((fileName, len(filePolygons)))
+                polygons.extend(filePolygons)
+        if not polygons:
+            return
+
+        timeLimit = self.solverTimeLimit.get().strip()
+        # The circles are calculated on another thread, checkJob adds the files once they are done
+        self.job = SolveJob(polygons, int(self.solverWorkers.get()), self.cache, engine=self.solverEngine.get(),
+                            maxTime=int(timeLimit) if timeLimit else None,
+                            simplifyTolerance=float(self.simplifyTolerance.get()),
+                            precisionPolicy=self.precisionPolicy.get(), precisionValue=float(self.precisionValue.get()))
+        self.jobFiles = newFiles
+        self.jobFirstPolygon = firstPolygon
+        self.jobNote = f", {autoFiles} file/s read with Auto (see Show Run Report)" if autoFiles else ""
+        self.jobStart = perf_counter()
+        if self.cache is not None:
+            self.jobCacheCounts = (self.cache.totalHits, self.cache.totalMisses)
+        self.setBusy(True)
+        self.progressBar.configure(maximum=len(polygons), value=0)
+        self.progressText.set(f"0/{len(polygons)} polygons")
+        self.job.start()
+        self.after(PROGRESS_INTERVAL, self.checkJob)
+
+    def checkJob(self):
+        # Called every PROGRESS_INTERVAL while the circles are being calculated
+        job = self.job
+        polygons = job.polygons
+        finished = False
+        progress = None
+        try:
+            while True:
+                update = job.updates.get_nowait()
+                if update is None:
+                    finished = True
+                    break
+                progress = update
+        except queue.Empty:
+            pass
+
+        if progress is not None and not job.cancelled.is_set():
+            done, vertices = progress
+            # Time left estimated from the vertices left to calculate
+            remaining = (perf_counter() - self.jobStart) * (polygons.totalVertices() - vertices) / vertices
+            self.progressBar.configure(value=done)
+            self.progressText.set(f"{done}/{len(polygons)} polygons, about {int(remaining)//60}:{int(remaining)%60:02d} left")
+        if not finished:
+            self.after(PROGRESS_INTERVAL, self.checkJob)
+            return
+
+        self.job = None
+        self.setBusy(False)
+        self.metrics.addStage("solve", None, perf_counter() - self.jobStart)
+        self.metrics.addStatuses(polygons, job.statuses, self.jobFirstPolygon, job.options["precisionPolicy"],
+                                 job.options["precisionValue"])
+        if job.error is not None:
+            self.progressText.set("")
+            showError(f"Could not calculate the circles: {job.error!r}")
+            return
+        if self.cache is not None:
+            hits = self.cache.totalHits - self.jobCacheCounts[0]
+            misses = self.cache.totalMisses - self.jobCacheCounts[1]
+            self.cacheStats.set(f"Cache: {hits} hits, {misses} misses")
+        if job.cancelled.is_set():
+            # Polygons that weren't calculated are still added, without circles
+            numSolved = len(polygons.solved())
+            self.progressBar.configure(value=numSolved)
+            self.progressText.set(f"Cancelled, {numSolved}/{len(polygons)} polygons calculated{self.jobNote}")
+        else:
+            self.progressText.set(f"{len(polygons)}/{len(polygons)} polygons in {perf_counter() - self.jobStart:.1f}s"
+                                  f"{self.jobNote}")
+        if reportProblems(polygons, job.statuses):
+            return
+        self.addFiles(polygons, self.jobFiles)
+
+    def addFiles(self, polygons, newFiles):
+        # Adds the files in newFiles, a list of (file name, number of polygons), to the session
+        # with their polygons and circles taken in turn from the PolygonBatch polygons
+        added = []
+        start = 0
+        for fileName, numPolygons in newFiles:
+            end = start + numPolygons
+            filePolygons = polygons if len(newFiles) == 1 else polygons.select(range(start, end))
+            added.append(SessionFile(fileName, filePolygons, self.nextColour))
+            self.nextColour += numPolygons
+            start = end
+        self.files.extend(added)
+        self.updateSession()
+
+        # Only draw the new files unless they are outside of what is already drawn, a zoomed in view is kept
+        if self.view is not None and (self.zoomed or all(self.view.contains(sessionFile.bounds) for sessionFile in added)):
+            for sessionFile in added:
+                self.drawFile(sessionFile)
+        else:
+            self.drawShapes()
+
+    def cancelJob(self):
+        # Bound to cancelButton
+        if self.job is not None:
+            self.job.cancel()
+            self.cancelButton.state(["disabled"])
+            self.progressText.set("Cancelling...")
+
+    def setBusy(self, busy):
+        # Stops the session being changed while circles are being calculated
+        if busy:
+            self.loadButton.state(["disabled"])
+            self.removeButton.state(["disabled"])
+            self.saveButton.state(["disabled"])
+            self.cancelButton.state(["!disabled"])
+        else:
+            self.loadButton.state(["!disabled"])
+            self.cancelButton.state(["disabled"])
+            if self.files:
+                self.removeButton.state(["!disabled"])
+                self.saveButton.state(["!disabled"])
+
+    def close(self):
+        # Bound to closing the window
+        if self.job is not None:
+            self.job.cancel()
+        self.destroy()
+
+    def removeFile(self):
+        # Bound to removeButton
+        index = self.fileSelector.current()
+        if index < 0:
+            return
+        sessionFile = self.files.pop(index)
+        self.updateSession()
+
+        self.canvas.delete(sessionFile.tag)
+        # Everything has to be rescaled if the file was on the edge of what is drawn, unless zoomed in
+        if self.view is not None and not self.zoomed and self.view.touches(sessionFile.bounds):
+            self.drawShapes()
+
+    def updateSession(self):
+        # Called after files are added or removed
+        self.polygons = PolygonBatch.concatenate(sessionFile.polygons for sessionFile in self.files)
+        self.numPolygons.set(len(self.polygons))
+
+        self.fileSelector.configure(values=[path.basename(sessionFile.fileName) for sessionFile in self.files])
+        if self.files:
+            self.fileSelector.current(len(self.files) - 1)
+            self.removeButton.state(["!disabled"])
+            self.saveButton.state(["!disabled"])
+        else:
+            self.fileSelector.set("")
+            self.removeButton.state(["disabled"])
+            self.saveButton.state(["disabled"])
+            self.view = None
+
+    def fitView(self, bounds):
+        # Returns the CanvasView fitting bounds to the canvas
+        xMin, yMin, xMax, yMax = bounds
+
+        canvasWidth = self.canvas.winfo_width()
+        canvasHeight = self.canvas.winfo_height()
+
+        # Flip y-axis because origin of canvas is top left
+        xCanvasMin = 10
+        xCanvasMax = canvasWidth  - 10
+        yCanvasMin = canvasHeight - 10
+        yCanvasMax = 10
+
+        xScale = (xCanvasMax-xCanvasMin)/(xMax-xMin)
+        yScale = (yCanvasMin-yCanvasMax)/(yMax-yMin)
+
+        if xScale < yScale:
+            scale = xScale
+            # Centre vertically
+            yCanvasMin -= (canvasHeight - scale*(yMax-yMin)) / 2.0
+        else:
+            scale = yScale
+            # Centre horizontally
+            xCanvasMin += (canvasWidth - scale*(xMax-xMin)) / 2.0
+
+        return CanvasView(bounds, scale, xCanvasMin, yCanvasMin)
+
+    def drawShapes(self):
+        # Redraws every file scaled to fit the canvas
+        if self.files:
+            xMin = min(sessionFile.bounds[0] for sessionFile in self.files)
+            yMin = min(sessionFile.bounds[1] for sessionFile in self.files)
+            xMax = max(sessionFile.bounds[2] for sessionFile in self.files)
+            yMax = max(sessionFile.bounds[3] for sessionFile in self.files)
+
+            self.view = self.fitView((xMin, yMin, xMax, yMax))
+            self.fitScale = self.view.scale
+            self.zoomed = False
+            self.redraw()
+
+    def redraw(self):
+        # Draws every file again using the current view, e.g. to show the detail and polygons that
+        # have come into view after zooming
+        if self.redrawAfter is not None:
+            self.after_cancel(self.redrawAfter)
+            self.redrawAfter = None
+        # Clear the canvas before drawing new shapes
+        self.canvas.delete("all")
+        if self.view is not None:
+            self.drawnScale = self.view.scale
+            for sessionFile in self.files:
+                self.drawFile(sessionFile)
+
+    def scheduleRedraw(self):
+        # Redraws once this hasn't been called again for REDRAW_DELAY ms
+        if self.redrawAfter is not None:
+            self.after_cancel(self.redrawAfter)
+        self.redrawAfter = self.after(REDRAW_DELAY, self.redraw)
+
+    def resize(self, _=None):
+        # Bound to self.canvas resize event
+        # _ argument to allow being used as resize callback
+        # Moves and scales what is already drawn to fit the new size instead of drawing it again, unless
+        # the polygons would then have too much or too little detail for their new size
+        if self.view is None:
+            self.drawShapes()
+            return
+        if self.zoomed:
+            # Keeps the zoom, only drawing the polygons that have come into view
+            self.scheduleRedraw()
+            return
+
+        view = self.fitView(self.view.bounds)
+        if not 1/REDRAW_SCALE <= view.scale/self.drawnScale <= REDRAW_SCALE:
+            self.drawShapes()
+            return
+
+        factor = view.scale / self.view.scale
+        self.canvas.scale("all", self.view.xCanvasMin, self.view.yCanvasMin, factor, factor)
+        self.canvas.move("all", view.xCanvasMin - self.view.xCanvasMin, view.yCanvasMin - self.view.yCanvasMin)
+        self.view = view
+        self.fitScale = view.scale
+
+    def _bind_mouse(self, _=None):
+        self.canvas.bind_all("<4>", self._on_mousewheel)
+        self.canvas.bind_all("<5>", self._on_mousewheel)
+        self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)
+
+    def _unbind_mouse(self, _=None):
+        self.canvas.unbind_all("<4>")
+        self.canvas.unbind_all("<5>")
+        self.canvas.unbind_all("<MouseWheel>")
+
+    def _on_mousewheel(self, event):
+        # Zooms the preview in or out around the mouse
+        # Linux uses event.num; Windows / Mac uses event.delta
+        if self.view is None:
+            return
+        if event.num == 4 or event.delta > 0:
+            factor = ZOOM_STEP
+        elif event.num == 5 or event.delta < 0:
+            factor = 1/ZOOM_STEP
+        else:
+            return
+        # Never zoom out further than showing everything or in further than MAX_ZOOM
+        factor = min(max(factor, self.fitScale/self.view.scale), MAX_ZOOM*self.fitScale/self.view.scale)
+
+        # Scale what is already drawn straight away and draw it in the detail for the new zoom once zooming stops
+        self.canvas.scale("all", event.x, event.y, factor, factor)
+        self.view = self.view.zoom(factor, event.x, event.y)
+        self.zoomed = True
+        self.scheduleRedraw()
+
+    def startDrag(self, event):
+        # Bound to pressing the mouse on self.canvas
+        self.dragPoint = (event.x, event.y)
+
+    def drag(self, event):
+        # Bound to dragging the mouse on self.canvas, moves the preview with the mouse
+        if self.view is None or self.dragPoint is None:
+            return
+        dx = event.x - self.dragPoint[0]
+        dy = event.y - self.dragPoint[1]
+        self.dragPoint = (event.x, event.y)
+
+        self.canvas.move("all", dx, dy)
+        self.view = self.view.move(dx, dy)
+        self.zoomed = True
+        self.scheduleRedraw()
+
+    def drawFile(self, sessionFile):
+        # Draws one file's polygons and circles using the current view, tagged so they can be removed together
+        start = perf_counter()
+        colours = ["#e6194B", "#3cb44b", "#ffe119", "#4363d8", "#f58231",
+                   "#42d4f4", "#f032e6", "#fabebe", "#469990", "#e6beff",
+                   "#9A6324", "#fffac8", "#800000", "#aaffc3", "#000075",
+                   "#a9a9a9", "#000000"]
+        xMin, yMin = self.view.bounds[:2]
+        scale = self.view.scale
+        xCanvasMin = self.view.xCanvasMin
+        yCanvasMin = self.view.yCanvasMin
+
+        polygons = sessionFile.polygons
+        # Only the polygons in view are drawn
+        visible = sessionFile.index.query(self.view.area(self.canvas.winfo_width(), self.canvas.winfo_height()))
+        visiblePolygons = polygons if len(visible) == len(polygons) else polygons.select(visible)
+        # Points closer together than a pixel aren't drawn
+        scaledPolygons = visiblePolygons.scaled(xMin, yMin, scale, -scale, xCanvasMin, yCanvasMin, decimate=True)
+        for i, scaledPoints in zip(visible, scaledPolygons):
+            colour = colours[(i+sessionFile.colour)%len(colours)]
+            self.canvas.create_polygon(scaledPoints, fill="", outline=colour, width=1, tags=sessionFile.tag)
+
+        for i in visible:
+            if not polygons.hasCircle(i):
+                continue
+            colour = colours[(i+sessionFile.colour)%len(colours)]
+            radius = polygons.radii[i]
+            centreX, centreY = polygons.centres[3*i:3*i+2]
+            x = (centreX-xMin)*scale + xCanvasMin
+            y = (centreY-yMin)*-scale + yCanvasMin
+
+            x1 = (centreX-radius-xMin)*scale + xCanvasMin
+            x2 = (centreX+radius-xMin)*scale + xCanvasMin
+            y1 = (centreY-radius-yMin)*-scale + yCanvasMin
+            y2 = (centreY+radius-yMin)*-scale + yCanvasMin
+
+            self.canvas.create_oval(x, y, x, y, outline=colour, tags=sessionFile.tag)
+            self.canvas.create_oval(x1, y1, x2, y2, outline=colour, tags=sessionFile.tag)
+        self.metrics.addStage("draw", sessionFile.fileName, perf_counter() - start)
+
+    def browse(self):
+        # Bound to browse_button
+        directory = filedialog.askdirectory(mustexist=True)
+        if not directory:
+            return
+        try:
+            chdir(directory)
+        except OSError as e:
+            messagebox.showerror(title="Error", message=repr(e))
+            return
+
+        self.outputFolder.set(directory)
+
+    def clearCache(self):
+        # Bound to the Clear Result Cache menu item
+        if self.cache is None:
+            messagebox.showerror(title="Error", message="The result cache could not be opened.")
+            return
+        if self.job is not None:
+            messagebox.showerror(title="Error", message="The result cache can't be cleared while circles are being calculated.")
+            return
+        try:
+            self.cache.clear()
+        except sqlite3.Error as e:
+            messagebox.showerror(title="Error", message=f"Could not clear the result cache: {e}")
+            return
+        self.cacheStats.set("Cache cleared")
+
+    def save(self):
+        # Bound to saveButton
+        if not self.outputFolder.get():
+            messagebox.showerror(title="Error", message="Output Folder not set.")
+            return
+        try:
+            if self.outputFolder.get()[-1] != "/":
+                makedirs(self.outputFolder.get(), exist_ok=True)
+                self.outputFolder.set(self.outputFolder.get()+"/")
+            else:
+                makedirs(self.outputFolder.get()[:-1], exist_ok=True)
+        except OSError:
+            messagebox.showerror(title="Error", message=f"Output Folder: {self.outputFolder.get()} is not able to be created.")
+            return
+
+
+        if self.outputPoints.get() or self.outputDXFPoints.get() or self.outputDXFPolyLines.get() or self.outputBinaryPoints.get():
+            if int(self.outputPointsNum.get()) < 3:
+                messagebox.showerror(title="Error", message="Number of points on circle should be greater than 2.")
+                return
+
+        pointsNum = int(self.outputPointsNum.get())
+        if self.outputDXF.get() and not (self.outputDXFCircle.get() or self.outputDXFDiameter.get() or self.outputDXFLabel.get() or
+                                         self.outputDXFPoints.get() or self.outputDXFPolyLines.get()):
+            messagebox.showerror(title="Error", message="Output to DXF is selected, at least one of the sub options needs to also be selected.")
+            return
+
+        # Output files are prefixed with the name of the file the circles came from when saving each file separately
+        # Each output's time is recorded for the file it came from, or None for all of the files
+        if self.outputPerFile.get():
+            outputs = [(path.splitext(path.basename(sessionFile.fileName))[0] + "_", sessionFile.polygons,
+                        sessionFile.fileName) for sessionFile in self.files]
+        else:
+            outputs = [("", self.polygons, None)]
+
+        dxfItems = None
+        if self.outputDXF.get():
+            selected = [self.outputDXFCircle, self.outputDXFDiameter, self.outputDXFLabel,
+                        self.outputDXFPoints, self.outputDXFPolyLines]
+            dxfItems = [item for item, variable in zip(DXF_ITEMS, selected) if variable.get()]
+
+        failed = 0
+        for prefix, polygons, fileName in outputs:
+            with self.metrics.timed("save", fileName):
+                failed += saveOutputs(self.outputFolder.get(), polygons, prefix, pointsNum, dxfItems,
+                                      self.outputCircles.get(), self.outputPoints.get(),
+                                      self.outputBinary.get(), self.outputBinaryPoints.get())
+
+        if not failed:
+            messagebox.showinfo(title="Success", message="Saved File/s")
+
+    def showReport(self):
+        # Bound to the Show Run Report menu item
+        messagebox.showinfo(title="Run Report", message=self.metrics.summary())
+
+    def saveReport(self):
+        # Bound to the Save Run Report menu item
+        fileName = filedialog.asksaveasfilename(defaultextension=".jsonl", initialfile="report.jsonl",
+                                                filetypes=[("JSON Lines", ".jsonl"), ("All Files", "*")])
+        if not fileName:
+            return
+        try:
+            with open(fileName, "w") as f:
+                self.metrics.write(f)
+        except OSError as e:
+            messagebox.showerror(title="Error", message=f"Could not save the run report: {e}")
+
+
+class AskColumns(tk.Toplevel):
+    def __init__(self, fileName):
+        self.parent = tk._default_root  # pylint: disable=W0212
+        super().__init__(self.parent)
+
+        self.result = None
+        self.separatorList = SEPARATORS
+        self.currSeparator = self.separatorList["Comma"]
+        self.fileName = fileName
+        # Lines from the start of the file, read once and split again whenever the delimiter is changed
+        self.rawLines = []
+        self.csvLines = []
+        self.maxWidth = 0
+        # What each column has been chosen to contain, as an index into COLUMN_OPTIONS
+        self.selections = []
+        self.loadLines()
+
+        self.withdraw() # remain invisible for now
+        # If the master is not viewable, don't
+        # make the child transient, or else it
+        # would be opened withdrawn
+        if self.parent.winfo_viewable():
+            self.transient(self.parent)
+
+        self.title("Select Columns")
+
+        # Layout
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+        self.mainframe = ttk.Frame(self)
+        self.mainframe.bind("<1>", lambda event: self.mainframe.focus_set())
+        self.mainframe.grid(column=0, row=0, sticky="NESW")
+        self.mainframe.columnconfigure(0, weight=1)
+        self.mainframe.rowconfigure(1, weight=1)
+
+        descLabel = ttk.Label(self.mainframe, text=f"Select the columns that contain the X,Y,Z co-ordinates of the polygons.\n"
+                              "If the polygons aren't separated by non-numerical lines, a column needs to be chosen to use as an ID string. "
+                              "The ID needs to be the same for each point in a polygon and different or not continuous between polygons.\n"
+                              "Click on the heading of a column to choose what it contains.\n"
+                              "Use the selection box at the bottom to change the delimiter if the file isn't comma delimited.",
+                              anchor="w", justify="left", wraplength=500)
+        descLabel.grid(column=0, row=0, padx=10, pady=10, sticky="EW")
+        descLabel.bind('<Configure>', lambda e: descLabel.config(wraplength=descLabel.winfo_width()))
+        # NOTE(Derek): possibly add tooltip for showing full path? (https://stackoverflow.com/questions/20399243/display-message-when-hovering-over-something-with-mouse-cursor-in-python)
+        ttk.Label(self.mainframe, text=f"File: {path.basename(self.fileName)}",
+                  anchor="e", justify="right", wraplength=300)\
+            .grid(column=1, row=0, padx=10, pady=10, sticky="ESW")
+
+        self.data(self.mainframe)
+        self.buttonbox(self.mainframe)
+        ##
+
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+
+        # become visible now
+        self.deiconify()
+
+        # wait for window to appear on screen before calling grab_set
+        self.wait_visibility()
+        self.grab_set()
+        self.focus_force()
+        self.wait_window(self)
+
+    def destroy(self):
+        tk.Toplevel.destroy(self)
+
+    def data(self, master):
+        self.dataFrame = ttk.Frame(master, relief="sunken", borderwidth=4)
+        self.dataFrame.grid(column=0, columnspan=2, row=1, padx=10, pady=0, sticky="NESW")
+        self.dataFrame.columnconfigure(0, weight=1)
+        self.dataFrame.rowconfigure(0, weight=1)
+
+        # Show a preview of some of the data file, the table only draws the rows scrolled into view
+        self.table = ttk.Treeview(self.dataFrame, show="headings", selectmode="none", height=20)
+        self.table.grid(column=0, row=0, sticky="NESW")
+
+        yScroll = ttk.Scrollbar(self.dataFrame, orient="vertical", command=self.table.yview)
+        yScroll.grid(column=1, row=0, sticky="NS")
+        xScroll = ttk.Scrollbar(self.dataFrame, orient="horizontal", command=self.table.xview)
+        xScroll.grid(column=0, row=1, sticky="EW")
+        self.table.configure(yscrollcommand=yScroll.set, xscrollcommand=xScroll.set)
+
+        self.columnChoice = tk.IntVar()
+        self.columnMenu = tk.Menu(self, tearoff=0)
+
+        self.fillTable()
+
+    def fillTable(self):
+        # Shows self.csvLines in the table with every column set to "Ignore"
+        self.table.delete(*self.table.get_children())
+        self.table.configure(columns=list(range(self.maxWidth)))
+        self.selections = [0] * self.maxWidth
+
+        font = tkfont.nametofont("TkDefaultFont")
+        for column in range(self.maxWidth):
+            longest = max((line[column].strip() for line in self.csvLines if column < len(line)), key=len, default="")
+            width = max(font.measure(longest), font.measure(f"{column}: {COLUMN_OPTIONS[-1]}")) + 20
+            self.table.column(column, width=width, minwidth=width, stretch=False, anchor="center")
+            self.table.heading(column, command=partial(self.showColumnMenu, column))
+            self.setHeading(column)
+
+        for line in self.csvLines:
+            self.table.insert("", "end", values=[token.strip() for token in line])
+
+    def setHeading(self, column):
+        self.table.heading(column, text=f"{column}: {COLUMN_OPTIONS[self.selections[column]]}")
+
+    def showColumnMenu(self, column):
+        # Bound to clicking a column heading, shows a menu of what the column can contain under the mouse
+        self.columnChoice.set(self.selections[column])
+        self.columnMenu.delete(0, "end")
+        for i, option in enumerate(COLUMN_OPTIONS):
+            self.columnMenu.add_radiobutton(label=option, variable=self.columnChoice, value=i,
+                                            command=partial(self.selected, column))
+        try:
+            self.columnMenu.tk_popup(*self.winfo_pointerxy())
+        finally:
+            self.columnMenu.grab_release()
+
+    def buttonbox(self, master):
+        box = ttk.Frame(master)
+        box.grid(column=0, columnspan=2, row=2, padx=10, pady=10, sticky="EW")
+
+        # NOTE(Derek): possibly allow entering characters
+        ttk.Label(box, text="Delimiter:")\
+            .grid(column=0, row=0, padx=(5, 0), pady=5, sticky="E")
+        self.separatorSelect = ttk.Combobox(box, values=list(self.separatorList), width=9, state="readonly")
+        self.separatorSelect.grid(column=1, row=0, padx=(0, 5), pady=5, sticky="W")
+        self.separatorSelect.bind("<<ComboboxSelected>>", self.separatorSet)
+        self.separatorSelect.current(0)
+
+        self.okButton = ttk.Button(box, text="OK", width=10, command=self.ok, default=tk.ACTIVE)
+        self.okButton.grid(column=2, row=0, padx=5, pady=5, sticky="E")
+        ttk.Button(box, text="Cancel", width=10, command=self.cancel)\
+            .grid(column=3, row=0, padx=5, pady=5, sticky="E")
+
+        box.columnconfigure(1, weight=1)
+
+        self.bind("<Return>", self.ok)
+        self.bind("<Escape>", self.cancel)
+
+    def selected(self, column):
+        current = self.columnChoice.get()
+        self.selections[column] = current
+        self.setHeading(column)
+        # Check for other selections having the same value if not "Ignore"
+        #  and reset any to "Ignore".
+        if current > 0:
+            for other, selection in enumerate(self.selections):
+                # Only check other columns
+                if other != column and selection == current:
+                    self.selections[other] = 0
+                    self.setHeading(other)
+
+    def separatorSet(self, event):
+        newSeparator = self.separatorList[event.widget.get()]
+
+        if newSeparator != self.currSeparator:
+            self.currSeparator = newSeparator
+            self.splitLines()
+            self.fillTable()
+
+    def loadLines(self):
+        self.rawLines = []
+        try:
+            with open(self.fileName, "r") as f:
+                self.rawLines = [line.strip() for line in islice(f, PREVIEW_LINES)]
+        except OSError:
+            messagebox.showerror(title="Error", message=f"Could not open input file:\n{self.fileName}")
+        self.splitLines()
+
+    def splitLines(self):
+        # Splits the lines read by loadLines with the current delimiter
+        self.csvLines = [smartSplit(line, self.currSeparator) for line in self.rawLines]
+        self.maxWidth = max((len(line) for line in self.csvLines), default=0)
+
+    def getSelections(self):
+        selections = [-1, -1, -1, -1]
+
+        for i, current in enumerate(self.selections):
+            if current > 0:
+                selections[current-1] = i
+
+        return selections
+
+    def ok(self, _=None):
+        # _ to allow event binding
+
+        # Make sure X,Y,Z are all selected (>0)
+        selections = self.getSelections()
+        if min(selections[:3]) < 0:
+            self.bell()
+            # Flash effect
+            self.after(70, self.mainframe.focus_set)
+            self.after(140, self.okButton.focus_set)
+            self.after(210, self.mainframe.focus_set)
+            self.after(280, self.okButton.focus_set)
+            self.after(350, self.mainframe.focus_set)
+            return
+
+        self.withdraw()
+        self.update_idletasks()
+
+        self.result = self.getSelections()
+        self.cancel()
+
+    def cancel(self, _=None):
+        # _ to allow event binding
+        self.parent.focus_set()
+        self.destroy()
+
+
+class AskAuto(tk.Toplevel):
+    def __init__(self, baseFileName):
+        self.parent = tk._default_root  # pylint: disable=W0212
+        super().__init__(self.parent)
+
+        self.result = None
+        self.baseFileName = baseFileName
+
+        self.withdraw() # remain invisible for now
+        # If the master is not viewable, don't
+        # make the child transient, or else it
+        # would be opened withdrawn
+        if self.parent.winfo_viewable():
+            self.transient(self.parent)
+
+        self.title("Process File")
+
+        # Layout
+        self.resizable(False, False)
+        self.geometry("+%d+%d" % (self.parent.winfo_rootx()+50,
+                                  self.parent.winfo_rooty()+50))
+        self.mainframe = ttk.Frame(self)
+        self.mainframe.bind("<1>", lambda event: self.mainframe.focus_set())
+        self.mainframe.grid(column=0, row=0, sticky="NESW")
+        self.mainframe.columnconfigure(0, weight=1)
+
+        self.body(self.mainframe)
+        self.buttonbox(self.mainframe)
+        ##
+
+        self.protocol("WM_DELETE_WINDOW", self.skip)
+
+        # become visible now
+        self.deiconify()
+
+        # wait for window to appear on screen before calling grab_set
+        self.wait_visibility()
+        self.grab_set()
+        self.focus_force()
+        self.wait_window(self)
+
+    def body(self, master):
+        bodyFrame = ttk.Frame(master)
+        bodyFrame.grid(column=0, columnspan=4, row=0, padx=20, pady=20, sticky="NESW")
+        bodyFrame.columnconfigure(3, weight=1)
+
+        ttk.Label(bodyFrame, wraplength=400, text=f"{self.baseFileName}", font="-weight bold")\
+            .grid(column=0, columnspan=4, row=0, sticky="NESW")
+        ttk.Label(bodyFrame, wraplength=400, text="Is not in a recognised format.\nAttempt to parse automatically or manually specify columns?")\
+            .grid(column=0, columnspan=4, row=1, sticky="NESW")
+        ttk.Label(bodyFrame, wraplength=400, text="If you would like this format to be automatically processed, please report an issue to the")\
+            .grid(column=0, columnspan=4, row=2, sticky="NESW")
+
+        linkLabel = ttk.Label(bodyFrame, foreground="#0645AD", font="-underline 1", anchor="w",
+                              text=r"GitHub")
+        linkLabel.grid(column=0, row=3, sticky="NW")
+        linkLabel.bind("<Button-1>", lambda event: webbrowser.open(r"https://github.com/Archer4499/Maximum-Inscribed-Circle"))
+
+        ttk.Label(bodyFrame, anchor="w", text="page or email")\
+            .grid(column=1, row=3, sticky="NW")
+
+        emailLabel = ttk.Label(bodyFrame, foreground="#0645AD", font="-underline 1", anchor="w",
+                               text=r"king.dm49@gmail.com")
+        emailLabel.grid(column=2, row=3, sticky="NW")
+        emailLabel.bind("<Button-1>", lambda event: webbrowser.open(r"mailto:?to=king.dm49+mic@gmail.com&subject=Add%20support%20for%20new%20file%20format"))
+
+    def buttonbox(self, master):
+        autoButton = ttk.Button(master, text="Auto", command=self.auto, default=tk.ACTIVE)
+        autoButton.grid(column=1, row=1, padx=0, pady=10, sticky="E")
+        autoButton.focus_set()
+        ttk.Button(master, text="Manual", command=self.manual)\
+            .grid(column=2, row=1, padx=5, pady=10, sticky="E")
+        ttk.Button(master, text="Skip", command=self.skip)\
+            .grid(column=3, row=1, padx=10, pady=10, sticky="E")
+
+        self.bind("<Return>", self.auto)
+        self.bind("<Escape>", self.skip)
+
+    def auto(self, _=None):
+        self.result = True
+        self.skip()
+
+    def manual(self, _=None):
+        self.result = False
+        self.skip()
+
+    def skip(self, _=None):
+        self.parent.focus_set()
@@ -2,14 +2,31 @@
 
 # Requires Python 3.6 and above
 
-from os import chdir, makedirs, path
-from sys import platform
-from math import pi, sin, cos, inf
-import webbrowser
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
+from os import makedirs, path, cpu_count, remove, replace
+from sys import platform, stderr, exit
+from glob import glob
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice, repeat
+from contextlib import ExitStack
+from multiprocessing import freeze_support
+from time import perf_counter
+import gc
+import queue
+import threading
+import multiprocessing
+import sqlite3
+import argparse
 from ezdxf.r12writer import r12writer
-from polylabel import polylabel
+from polylabel import polylabel, VERSION as POLYLABEL_VERSION
+from medial import medial_axis_circle, VERSION as MEDIAL_VERSION
+from cache import ResultCache, defaultCachePath, DEFAULT_MAX_ENTRIES
+from simplify import simplify, diameter_error_bound
+from polygonbatch import PolygonBatch
+from circlepoints import circlePoints, pointsText
+from binaryoutput import BinaryWriter
+from metrics import RunMetrics
+import fastparse
 
 # Use Windows high DPI scaling
 if platform == 'win32':
@@ -19,778 +36,79 @@ if platform == 'win32':
     except (ImportError, AttributeError, OSError):
         pass
 
+# Set by the batch command so errors are printed instead of shown in dialogs
+headless = False
+
+# Solvers that can be chosen to calculate the circles, all take the same arguments as polylabel
+ENGINES = {"polylabel": polylabel,  # Searches for the centre to within the precision
+           "medial": medial_axis_circle}  # The same search refined by solving for a vertex of the medial axis
+ENGINE_VERSIONS = {"polylabel": POLYLABEL_VERSION,
+                   "medial": MEDIAL_VERSION}
+
+# Precision the circles are calculated to with the absolute precision policy
+PRECISION = 0.001
+# Ways the precision of each circle can be decided, with the default value of each. With "absolute" the value
+# is the precision, "bbox" the value times the shorter side of the polygon's bounding box, "inradius" the
+# value times the radius found and with "output" the value is the number of decimal places the diameter is
+# output to, only calculating each circle as precisely as they show
+PRECISION_POLICIES = {"absolute": PRECISION, "bbox": 1e-4, "inradius": 1e-4, "output": 2}
+# With the inradius policy the precision is never less than this times the shorter side of the bounding box,
+# so polygons with almost no area still finish
+MIN_RELATIVE_PRECISION = 1e-9
+# Polygons solved together per process when streaming
+STREAM_CHUNK = 16
+# Seconds between checks for a SolveJob being cancelled while it waits for a polygon to be solved
+CANCEL_INTERVAL = 0.1
+# Polygons read into each PolygonBatch by the parsers that read a line at a time
+PARSE_CHUNK = 4096
+# Items that can be written for each circle in the DXF output, in the order writeDXFCircle takes them
+DXF_ITEMS = ["circle", "diameter", "label", "points", "polyline"]
+# Names of the output files
+OUTPUT_FILES = {"dxf": "circles.dxf", "circles": "circles.csv", "points": "points.csv", "binary": "circles.bin"}
+# Delimiters that can be chosen for files in other formats
+SEPARATORS = {"Comma": ",", "Whitespace": " ", "Colon": ":", "Semicolon": ";", "Equals Sign": "="}
+# Delimiters tried by Auto, in order, and the lines read from the start of a file to choose one
+SNIFF_SEPARATORS = [",", " ", ";"]
+SNIFF_LINES = 1000
+
+
+def showError(message):
+    if headless:
+        print(f"Error: {message}", file=stderr)
+    else:
+        from tkinter import messagebox
+        messagebox.showerror(title="Error", message=message)
 
-class MenuBar(tk.Menu):
-    def __init__(self, root):
-        super().__init__()
-
-        self.option_add("*tearOff", False)
-
-        file_menu = tk.Menu(self)
-        file_menu.add_command(label="Exit", command=root.quit)
-
-        help_menu = tk.Menu(self)
-        help_menu.add_command(label="Support", command=lambda: webbrowser.open(r"https://github.com/Archer4499/Maximum-Inscribed-Circle"))
-        help_menu.add_command(label="About",
-                              command=lambda: messagebox.showinfo("About", "Reads data files containing polygons and outputs the co-ordinates and diameter "
-                                                                           "(and optionally points of the circle) of maximum inscribed circles to be "
-                                                                           "contained within the digitized polygons.\n\n"
-                                                                           "Read more at https://github.com/Archer4499/Maximum-Inscribed-Circle\n\n"
-                                                                           "This project is licensed under the MIT License."))
-
-        self.add_cascade(menu=file_menu, label="File")
-        self.add_cascade(menu=help_menu, label="Help")
-
-        root.config(menu=self)
-
-
-class NumEntry(ttk.Spinbox):
-    # A number validated Spinbox
-    def __init__(self, length, min_val, max_val, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.length = length
-        self.min_val = min_val
-        self.max_val = max_val
-        self.default_val = self.get()
-        self.configure(from_=self.min_val, to=self.max_val, width=self.length + 1, validate="all",
-                       validatecommand=(self.register(self.on_validate), "%P", "%d", "%V"))
-
-    def on_validate(self, new_value, action_type, validate_type):
-        if validate_type == "key":
-            # Don't validate if action is delete
-            if action_type != "0" and new_value.strip() != "":
-                try:
-                    value = int(new_value)
-                except ValueError:
-                    self.bell()
-                    return False
-        elif validate_type == "focusout":
-            try:
-                value = int(new_value)
-                if value < self.min_val:
-                    self.bell()
-                    self.set(self.min_val)
-                    return False
-                if value > self.max_val:
-                    self.bell()
-                    self.set(self.max_val)
-                    return False
-            except ValueError:
-                self.bell()
-                self.set(self.default_val)
-                return False
-
-        return True
-
-
-class Gui(tk.Tk):
-    def __init__(self):
-        super().__init__()
-
-        self.polygons = []
-        self.numPolygons = tk.IntVar()
-        self.numPolygons.set(0)
-        self.circles = []
-
-        # Settings
-        self.outputDXF = tk.IntVar()
-        self.outputDXF.set(1)
-        self.outputDXFCircle = tk.IntVar()
-        self.outputDXFCircle.set(0)
-        self.outputDXFDiameter = tk.IntVar()
-        self.outputDXFDiameter.set(1)
-        self.outputDXFLabel = tk.IntVar()
-        self.outputDXFLabel.set(0)
-        self.outputDXFPoints = tk.IntVar()
-        self.outputDXFPoints.set(0)
-        self.outputDXFPolyLines = tk.IntVar()
-        self.outputDXFPolyLines.set(1)
-
-        self.outputCircles = tk.IntVar()
-        self.outputCircles.set(0)
-
-        self.outputPoints = tk.IntVar()
-        self.outputPoints.set(1)
-
-        self.outputPointsNum = tk.StringVar()
-        self.outputPointsNum.set("16")
-
-        self.outputFolder = tk.StringVar()
-        self.outputFolder.set("./")
-
-        self.title("Maximum Inscribed Circle")
-        self.columnconfigure(0, weight=1)
-        self.rowconfigure(0, weight=1)
-
-        MenuBar(self)
-
-        mainframe = ttk.Frame(self)
-        mainframe.grid(column=0, row=0, sticky="NESW")
-        # Clear focus from text boxes on click
-        mainframe.bind("<1>", lambda event: mainframe.focus_set())
-
-        # TODO(Derek): Not sure how to set correct minsizes
-        # Uses 3 columns
-        self.initLoad(mainframe, 1)
-        mainframe.columnconfigure(1, weight=1)
-        mainframe.columnconfigure(2, weight=0)
-        mainframe.columnconfigure(3, weight=1)
-
-        ttk.Separator(mainframe, orient="vertical")\
-            .grid(column=4, row=0, rowspan=30, padx=5, pady=0, sticky="NS")
-        mainframe.rowconfigure(29, weight=1)
-
-        # Uses 2 columns
-        self.initSave(mainframe, 5)
-        mainframe.columnconfigure(5, weight=0, minsize=15)
-        mainframe.columnconfigure(6, weight=2)
-
-    def initLoad(self, parentFrame, column):
-        self.loadButton = ttk.Button(parentFrame, text="Open csv file/s", command=self.load)
-        self.loadButton.grid(column=column, row=0, padx=5, pady=5)
-        self.loadButton.focus_set()
-
-        ttk.Label(parentFrame, text="Number of polygons found:")\
-            .grid(column=column+1, row=0, sticky="E", padx=(5, 0), pady=0)
-        ttk.Label(parentFrame, textvariable=self.numPolygons)\
-            .grid(column=column+2, row=0, sticky="W", padx=(0, 5), pady=0)
-
-
-        ttk.Label(parentFrame, text="Preview of polygons and output circles:", anchor="center")\
-            .grid(column=column, columnspan=3, row=2, sticky="EW", padx=5, pady=0)
-        self.canvas = tk.Canvas(parentFrame, background="white")
-        self.canvas.grid(column=column, columnspan=3, row=3, rowspan=27, sticky="NESW", padx=(10, 5), pady=(0, 10))
-        self.canvas.bind("<Configure>", self.drawShapes)
-
-    def initSave(self, parentFrame, column):
-        ttk.Checkbutton(parentFrame, text="Output to DXF", variable=self.outputDXF, command=self.disableDXF)\
-            .grid(column=column, row=0, columnspan=2, sticky="W", padx=5, pady=(5, 0))
-
-        self.dxfCheckButtons = []
-        self.dxfCheckButtons.append(ttk.Checkbutton(parentFrame, text="Output Circle in DXF", variable=self.outputDXFCircle))
-        self.dxfCheckButtons.append(ttk.Checkbutton(parentFrame, text="Output Diameter Line in DXF", variable=self.outputDXFDiameter))
-        self.dxfCheckButtons.append(ttk.Checkbutton(parentFrame, text="Output Diameter Label in DXF", variable=self.outputDXFLabel))
-        self.dxfCheckButtons.append(ttk.Checkbutton(parentFrame, text="Output Points in DXF", variable=self.outputDXFPoints, command=self.disablePointsNum))
-        self.dxfCheckButtons.append(ttk.Checkbutton(parentFrame, text="Output PolyLine in DXF", variable=self.outputDXFPolyLines, command=self.disablePointsNum))
-        for i, button in enumerate(self.dxfCheckButtons):
-            button.grid(column=column+1, row=i+1, sticky="W", padx=5, pady=0)
-
-        ttk.Checkbutton(parentFrame, text="Output to Circles csv", variable=self.outputCircles)\
-            .grid(column=column, row=6, columnspan=2, sticky="W", padx=5, pady=5)
-
-        ttk.Checkbutton(parentFrame, text="Output to Points csv", variable=self.outputPoints, command=self.disablePointsNum)\
-            .grid(column=column, row=7, columnspan=2, sticky="W", padx=5, pady=5)
-
-        ttk.Label(parentFrame, text="Number of points on circle:")\
-            .grid(column=column, row=8, columnspan=2, sticky="W", padx=5, pady=(5, 0))
-
-        self.pointsNumCheckButton = NumEntry(4, 3, 9999, parentFrame, textvariable=self.outputPointsNum)
-        self.pointsNumCheckButton.grid(column=column, row=9, columnspan=2, sticky="W", padx=5, pady=0)
-
-        ttk.Label(parentFrame, text="Output Folder:")\
-            .grid(column=column, row=10, columnspan=2, sticky="W", padx=5, pady=(5, 0))
-        ttk.Entry(parentFrame, textvariable=self.outputFolder)\
-            .grid(column=column, row=11, columnspan=2, sticky="EW", padx=5, pady=0)
-
-        self.browseButton = ttk.Button(parentFrame, text="Browse", command=self.browse)
-        self.browseButton.grid(column=column, row=14, columnspan=2, padx=5, pady=(5, 0))
-
-        self.saveButton = ttk.Button(parentFrame, text="Save", command=self.save)
-        self.saveButton.grid(column=column, row=15, columnspan=2, padx=5, pady=(0, 5))
-        self.saveButton.state(["disabled"])
-
-    def disableDXF(self):
-        # Bound to dxf CheckButton
-        if self.outputDXF.get():
-            for button in self.dxfCheckButtons:
-                button.state(["!disabled"])
-        else:
-            for button in self.dxfCheckButtons:
-                button.state(["disabled"])
-        self.disablePointsNum()
-
-    def disablePointsNum(self):
-        # Bound to CheckButtons related to pointsNumCheckButton
-        if self.outputPoints.get() or self.outputDXF.get() and (self.outputDXFPoints.get() or self.outputDXFPolyLines.get()):
-            self.pointsNumCheckButton.state(["!disabled"])
-        else:
-            self.pointsNumCheckButton.state(["disabled"])
-
-    def load(self):
-        # Bound to loadButton
-        fileNames = filedialog.askopenfilenames(filetypes=[("All Data Files", ".csv .str .txt .arch_d"),
-                                                           ("CSV", ".csv"),
-                                                           ("STR", ".str"),
-                                                           ("Text", ".txt"),
-                                                           ("Vulcan Data", ".arch_d")])
-        if not fileNames:
-            return
-
-        polygons = []
-        for fileName in fileNames:
-            polygons.extend(parseData(fileName))
-        if not polygons:
-            return
-
-        circles = []
-
-        for polygon in polygons:
-            # TODO(Derek): polylabel sometimes infinite loops if bad data is given
-            #               contained multiple polygons in one, with 0, 0 in between.
-            # circle is formatted as [[x,y,z],radius]
-            circle = list(polylabel(polygon[0], precision=0.001, with_distance=True))
-            if not circle[1]:
-                prettyPolygon = [[polygon[0][i][0], polygon[0][i][1], polygon[1][i]] for i in range(len(polygon[0]))]
-                messagebox.showerror(title="Error", message=f"Could not create circle from polygon:\n{prettyPolygon}")
-                return
-            circle[0].append(sum(polygon[1])/len(polygon[1]))
-            circles.append(circle)
-
-        self.polygons = polygons
-        self.circles = circles
-
-        self.numPolygons.set(len(polygons))
-        self.saveButton.state(["!disabled"])
-
-        self.drawShapes()
-
-    def drawShapes(self, _=None):
-        # Bound to self.canvas resize event
-        # _ argument to allow being used as resize callback
-        if self.polygons:
-            # Clear the canvas before drawing new shapes
-            self.canvas.delete("all")
-
-            colours = ["#e6194B", "#3cb44b", "#ffe119", "#4363d8", "#f58231",
-                       "#42d4f4", "#f032e6", "#fabebe", "#469990", "#e6beff",
-                       "#9A6324", "#fffac8", "#800000", "#aaffc3", "#000075",
-                       "#a9a9a9", "#000000"]
-
-            xMin = inf
-            xMax = 0
-            yMin = inf
-            yMax = 0
-
-            # Polygon max and mins
-            for polygon in self.polygons:
-                for point in polygon[0]:
-                    if point[0] < xMin:
-                        xMin = point[0]
-                    if point[0] > xMax:
-                        xMax = point[0]
-                    if point[1] < yMin:
-                        yMin = point[1]
-                    if point[1] > yMax:
-                        yMax = point[1]
-
-            canvasWidth = self.canvas.winfo_width()
-            canvasHeight = self.canvas.winfo_height()
-
-            # Flip y-axis because origin of canvas is top left
-            xCanvasMin = 10
-            xCanvasMax = canvasWidth  - 10
-            yCanvasMin = canvasHeight - 10
-            yCanvasMax = 10
-
-            xScale = (xCanvasMax-xCanvasMin)/(xMax-xMin)
-            yScale = (yCanvasMin-yCanvasMax)/(yMax-yMin)
-
-            if xScale < yScale:
-                scale = xScale
-                # Centre vertically
-                yCanvasMin -= (canvasHeight - scale*(yMax-yMin)) / 2.0
-            else:
-                scale = yScale
-                # Centre horizontally
-                xCanvasMin += (canvasWidth - scale*(xMax-xMin)) / 2.0
-
-            for i, polygon in enumerate(self.polygons):
-                scaledPoints = []
-                for point in polygon[0]:
-                    scaledPoints.append((point[0]-xMin)*scale + xCanvasMin)
-                    scaledPoints.append((point[1]-yMin)*-scale + yCanvasMin)
-                self.canvas.create_polygon(scaledPoints, fill="", outline=colours[i%len(colours)], width=1)
-
-            for i, circle in enumerate(self.circles):
-                radius = circle[1]
-                x = (circle[0][0]-xMin)*scale + xCanvasMin
-                y = (circle[0][1]-yMin)*-scale + yCanvasMin
-
-                x1 = (circle[0][0]-radius-xMin)*scale + xCanvasMin
-                x2 = (circle[0][0]+radius-xMin)*scale + xCanvasMin
-                y1 = (circle[0][1]-radius-yMin)*-scale + yCanvasMin
-                y2 = (circle[0][1]+radius-yMin)*-scale + yCanvasMin
-
-                self.canvas.create_oval(x, y, x, y, outline=colours[i%len(colours)])
-                self.canvas.create_oval(x1, y1, x2, y2, outline=colours[i%len(colours)])
-
-    def browse(self):
-        # Bound to browse_button
-        directory = filedialog.askdirectory(mustexist=True)
-        if not directory:
-            return
-        try:
-            chdir(directory)
-        except OSError as e:
-            messagebox.showerror(title="Error", message=repr(e))
-            return
-
-        self.outputFolder.set(directory)
-
-    def save(self):
-        # Bound to saveButton
-        dxfFileName = "circles.dxf"
-        circlesFileName = "circles.csv"
-        pointsFileName = "points.csv"
-
-        if not self.outputFolder.get():
-            messagebox.showerror(title="Error", message="Output Folder not set.")
-            return
-        try:
-            if self.outputFolder.get()[-1] != "/":
-                makedirs(self.outputFolder.get(), exist_ok=True)
-                self.outputFolder.set(self.outputFolder.get()+"/")
-            else:
-                makedirs(self.outputFolder.get()[:-1], exist_ok=True)
-        except OSError:
-            messagebox.showerror(title="Error", message=f"Output Folder: {self.outputFolder.get()} is not able to be created.")
-            return
-
-
-        if self.outputPoints.get() or self.outputDXFPoints.get() or self.outputDXFPolyLines.get():
-            if int(self.outputPointsNum.get()) < 3:
-                messagebox.showerror(title="Error", message="Number of points on circle should be greater than 2.")
-                return
-
-        if self.outputDXF.get():
-            if self.outputDXFCircle.get() or self.outputDXFDiameter.get() or self.outputDXFLabel.get() or self.outputDXFPoints.get() or self.outputDXFPolyLines.get():
-                self.saveDXF(self.outputFolder.get()+dxfFileName)
-            else:
-                messagebox.showerror(title="Error", message="Output to DXF is selected, at least one of the sub options needs to also be selected.")
-                return
-        if self.outputCircles.get():
-            self.saveCircles(self.outputFolder.get()+circlesFileName)
-        if self.outputPoints.get():
-            self.savePoints(self.outputFolder.get()+pointsFileName)
-
-        messagebox.showinfo(title="Success", message="Saved File/s")
-
-    def saveDXF(self, outFileNameDXF):
-        try:
-            with r12writer(outFileNameDXF) as dxf:
-                for i, circle in enumerate(self.circles):
-                    pointsNum = int(self.outputPointsNum.get())
-
-                    centre = circle[0]
-                    radius = circle[1]
-
-                    x = centre[0]
-                    x1 = x + radius
-                    x2 = x - radius
-                    y = centre[1]
-                    z = centre[2]
-
-                    arc = 2 * pi / pointsNum
-
-                    # Draw the circle
-                    if self.outputDXFCircle.get():
-                        dxf.add_circle(centre, radius=radius, layer="Circle"+str(i))
-
-                    # Draw the diameter line
-                    if self.outputDXFDiameter.get():
-                        dxf.add_line((x1, y, z), (x2, y, z), layer="Circle"+str(i))
-
-                    # Draw the diameter label
-                    if self.outputDXFLabel.get():
-                        diameter = radius * 2.0  # polylabel gives the radius of the circle, we want the diameter
-                        lineCentre = [(x2-x1)/2.0 + x1, y + 0.2, z]  # Centre of the line with a slight offset
-                        dxf.add_text(f"{diameter:.2f}", lineCentre, align="CENTER", layer="Circle"+str(i))
-
-                    # Draw the points approximating circle
-                    if self.outputDXFPoints.get():
-                        # For each circle calculate outputPointsNum number of points around it
-                        for j in range(pointsNum):
-                            angle = arc * j
-                            currX = x + radius*cos(angle)
-                            currY = y + radius*sin(angle)
-                            dxf.add_point((currX, currY, z), layer="Circle"+str(i))
-
-                    # Draw the polylines approximating circle
-                    if self.outputDXFPolyLines.get():
-                        # For each circle calculate outputPointsNum number of points around it
-                        points = [(x+radius*cos(arc*j), y+radius*sin(arc*j), z) for j in range(pointsNum)]
-                        points.append(points[0])
-                        dxf.add_polyline(points, layer="Circle"+str(i))
-        except OSError:
-            messagebox.showerror(title="Error", message=f"Could not write to output file: {outFileNameDXF}")
-            return 1
-        return 0
 
-    def saveCircles(self, outFileNameCircles):
-        try:
-            with open(outFileNameCircles, "w") as f:
-                for circle in self.circles:
-                    diameter = circle[1] * 2.0  # polylabel gives the radius of the circle, we want to print the diameter
-                    # Output to 2 decimal places
-                    output = f"{circle[0][0]:.2f},{circle[0][1]:.2f},{circle[0][2]:.2f},{diameter:.2f}\n"
-                    f.write(output)
-        except OSError:
-            messagebox.showerror(title="Error", message=f"Could not write to output file: {outFileNameCircles}")
-            return 1
-        return 0
+def showInfo(message):
+    if headless:
+        print(message)
+    else:
+        from tkinter import messagebox
+        messagebox.showinfo(title="Information", message=message)
 
-    def savePoints(self, outFileNamePoints):
-        pointsNum = int(self.outputPointsNum.get())
 
-        try:
-            with open(outFileNamePoints, "w") as f:
-                for circle in self.circles:
-                    # For each circle calculate outputPointsNum number of points around it
-                    arc = 2 * pi / pointsNum
-                    for i in range(pointsNum):
-                        angle = arc * i
-                        x = circle[0][0] + circle[1]*cos(angle)
-                        y = circle[0][1] + circle[1]*sin(angle)
-                        # Output to 2 decimal places
-                        output = f"{x:.2f},{y:.2f},{circle[0][2]:.2f}\n"
-                        f.write(output)
-                    f.write("\n")
-        except OSError:
-            messagebox.showerror(title="Error", message=f"Could not write to output file: {outFileNamePoints}")
-            return 1
-        return 0
+def showWarning(message):
+    if headless:
+        print(f"Warning: {message}", file=stderr)
+    else:
+        from tkinter import messagebox
+        messagebox.showwarning(title="Warning", message=message)
 
 
-class AskColumns(tk.Toplevel):
-    def __init__(self, fileName):
-        self.parent = tk._default_root  # pylint: disable=W0212
-        super().__init__(self.parent)
-
-        self.result = None
-        self.separatorList = {"Comma":",", "Whitespace":" ", "Colon":":", "Semicolon":";", "Equals Sign":"="}
-        self.currSeparator = self.separatorList["Comma"]
-        self.fileName = fileName
-        self.csvLines = []
-        self.maxWidth = 0
-        self.loadLines()
-
-        self.withdraw() # remain invisible for now
-        # If the master is not viewable, don't
-        # make the child transient, or else it
-        # would be opened withdrawn
-        if self.parent.winfo_viewable():
-            self.transient(self.parent)
-
-        self.title("Select Columns")
-
-        # Layout
-        self.columnconfigure(0, weight=1)
-        self.rowconfigure(0, weight=1)
-        self.mainframe = ttk.Frame(self)
-        self.mainframe.bind("<1>", lambda event: self.mainframe.focus_set())
-        self.mainframe.grid(column=0, row=0, sticky="NESW")
-        self.mainframe.columnconfigure(0, weight=1)
-        self.mainframe.rowconfigure(1, weight=1)
-
-        descLabel = ttk.Label(self.mainframe, text=f"Select the columns that contain the X,Y,Z co-ordinates of the polygons.\n"
-                              "If the polygons aren't separated by non-numerical lines, a column needs to be chosen to use as an ID string. "
-                              "The ID needs to be the same for each point in a polygon and different or not continuous between polygons.\n"
-                              "Use the selection box at the bottom to change the delimiter if the file isn't comma delimited.",
-                              anchor="w", justify="left", wraplength=500)
-        descLabel.grid(column=0, row=0, padx=10, pady=10, sticky="EW")
-        descLabel.bind('<Configure>', lambda e: descLabel.config(wraplength=descLabel.winfo_width()))
-        # NOTE(Derek): possibly add tooltip for showing full path? (https://stackoverflow.com/questions/20399243/display-message-when-hovering-over-something-with-mouse-cursor-in-python)
-        ttk.Label(self.mainframe, text=f"File: {path.basename(self.fileName)}",
-                  anchor="e", justify="right", wraplength=300)\
-            .grid(column=1, row=0, padx=10, pady=10, sticky="ESW")
-
-        self.data(self.mainframe)
-        self.buttonbox(self.mainframe)
-        ##
-
-        self.protocol("WM_DELETE_WINDOW", self.cancel)
-
-        # become visible now
-        self.deiconify()
-
-        # wait for window to appear on screen before calling grab_set
-        self.wait_visibility()
-        self.grab_set()
-        self.focus_force()
-        self.wait_window(self)
-
-    def destroy(self):
-        tk.Toplevel.destroy(self)
-
-    def yview(self, *args):
-        for canvas in self.dataCanvases:
-            canvas.yview(*args)
-
-    def _bind_mouse(self, _=None):
-        self.dataFrame.bind_all("<4>", self._on_mousewheel)
-        self.dataFrame.bind_all("<5>", self._on_mousewheel)
-        self.dataFrame.bind_all("<MouseWheel>", self._on_mousewheel)
-
-    def _unbind_mouse(self, _=None):
-        self.dataFrame.unbind_all("<4>")
-        self.dataFrame.unbind_all("<5>")
-        self.dataFrame.unbind_all("<MouseWheel>")
-
-    def _on_mousewheel(self, event):
-        # Linux uses event.num; Windows / Mac uses event.delta
-        if event.num == 4 or event.delta > 0:
-            for canvas in self.dataCanvases:
-                canvas.yview_scroll(-1, "units")
-        elif event.num == 5 or event.delta < 0:
-            for canvas in self.dataCanvases:
-                canvas.yview_scroll(1, "units")
-
-    def data(self, master):
-        def onFrameConfigure(canvas):
-            # Reset the scroll region to encompass the inner frame
-            x1, y1, x2, y2 = canvas.bbox("all")
-            canvas.configure(scrollregion=(x1, y1, x2, y2))
-            canvas.configure(width=x2-x1)
-
-        self.dataFrame = ttk.Frame(master, relief="sunken", borderwidth=4)
-        self.dataFrame.grid(column=0, columnspan=2, row=1, padx=10, pady=0, sticky="NESW")
-        # self.dataFrame.grid(column=0, row=1, padx=10, pady=0, sticky="NESW")
-        self.dataFrame.rowconfigure(1, weight=1)
-
-        self.dataFrame.bind("<Enter>", self._bind_mouse)
-        self.dataFrame.bind("<Leave>", self._unbind_mouse)
-
-        scroll = tk.Scrollbar(self.dataFrame, orient="vertical", command=self.yview)
-        scroll.grid(column=self.maxWidth, row=1, sticky="NS")
-
-        options = ["Ignore", "X", "Y", "Z", "ID"]
-
-        self.selectionBoxes = []
-        self.dataCanvases = []
-        for column in range(self.maxWidth):
-            self.dataFrame.columnconfigure(column, weight=1)
-
-            # Header
-            header = ttk.Frame(self.dataFrame, relief="groove", borderwidth=1)
-            header.grid(column=column, row=0, sticky="EW")
-            header.columnconfigure(0, weight=1)
-
-            ttk.Label(header, text=column, anchor="center")\
-                .grid(column=0, row=0, sticky="EW")
-
-            selection = ttk.Combobox(header, values=options, width=5, state="readonly")
-            selection.grid(column=0, row=1, sticky="EW")
-            selection.bind("<<ComboboxSelected>>", self.selected)
-            selection.current(0)
-            self.selectionBoxes.append(selection)
-
-            # Show a preview of some of the data file
-            canvas = tk.Canvas(self.dataFrame, borderwidth=0, highlightthickness=0)
-            canvas.grid(column=column, row=1, sticky="NSW")
-
-            canvasFrame = ttk.Frame(canvas, borderwidth=0)
-            canvasFrame.grid(column=0, row=0, sticky="NESW")
-
-            canvas.create_window((0, 0), window=canvasFrame, anchor="nw")
-            canvas.configure(yscrollcommand=scroll.set)
-
-            canvasFrame.bind("<Configure>", lambda event, canvas=canvas: onFrameConfigure(canvas))
-
-            self.dataCanvases.append(canvas)
-
-            for row, line in enumerate(self.csvLines):
-                if column < len(line):
-                    token = line[column]
-                    ttk.Label(canvasFrame, text=token.strip(), relief="sunken", borderwidth=1)\
-                        .grid(column=0, row=row, padx=1, sticky="EW")
-                else:
-                    ttk.Label(canvasFrame, text="", borderwidth=1)\
-                        .grid(column=0, row=row, padx=1, sticky="EW")
-
-    def buttonbox(self, master):
-        box = ttk.Frame(master)
-        box.grid(column=0, columnspan=2, row=2, padx=10, pady=10, sticky="EW")
-
-        # NOTE(Derek): possibly allow entering characters
-        ttk.Label(box, text="Delimiter:")\
-            .grid(column=0, row=0, padx=(5, 0), pady=5, sticky="E")
-        self.separatorSelect = ttk.Combobox(box, values=list(self.separatorList), width=9, state="readonly")
-        self.separatorSelect.grid(column=1, row=0, padx=(0, 5), pady=5, sticky="W")
-        self.separatorSelect.bind("<<ComboboxSelected>>", self.separatorSet)
-        self.separatorSelect.current(0)
-
-        self.okButton = ttk.Button(box, text="OK", width=10, command=self.ok, default=tk.ACTIVE)
-        self.okButton.grid(column=2, row=0, padx=5, pady=5, sticky="E")
-        ttk.Button(box, text="Cancel", width=10, command=self.cancel)\
-            .grid(column=3, row=0, padx=5, pady=5, sticky="E")
-
-        box.columnconfigure(1, weight=1)
-
-        self.bind("<Return>", self.ok)
-        self.bind("<Escape>", self.cancel)
-
-    def selected(self, event):
-        current = event.widget.current()
-        # Check for other selections having the same value if not "Ignore"
-        #  and reset any to "Ignore".
-        if current > 0:
-            for selection in self.selectionBoxes:
-                # Only check other widgets
-                if selection is not event.widget:
-                    if selection.current() == current:
-                        selection.current(0)
-
-    def separatorSet(self, event):
-        newSeparator = self.separatorList[event.widget.get()]
-
-        if newSeparator != self.currSeparator:
-            self.currSeparator = newSeparator
-            self.loadLines()
-            self.dataFrame.grid_forget()
-            self.dataFrame.destroy()
-            self.data(self.mainframe)
-
-    def loadLines(self):
-        self.csvLines = []
-        self.maxWidth = 0
-        try:
-            with open(self.fileName, "r") as f:
-                for i, line in enumerate(f):
-                    self.csvLines.append(smartSplit(line.strip(), self.currSeparator))
-                    self.maxWidth = max(self.maxWidth, len(self.csvLines[i]))
-                    # Only take at most 100 lines
-                    if i > 100:
-                        break
-        except OSError:
-            messagebox.showerror(title="Error", message=f"Could not open input file:\n{self.fileName}")
-            return
+def openCache(fileName=None, maxEntries=DEFAULT_MAX_ENTRIES):
+    # Returns None if the cache can't be used, in which case every circle is calculated
+    try:
+        return ResultCache(fileName, maxEntries)
+    except (sqlite3.Error, OSError):
+        showWarning(f"Could not open the result cache: {fileName or defaultCachePath()}\n"
+                    "Circles will be calculated every time files are loaded.")
+        return None
 
-    def getSelections(self):
-        selections = [-1, -1, -1, -1]
-
-        for i, selection in enumerate(self.selectionBoxes):
-            current = selection.current()
-            if current > 0:
-                selections[current-1] = i
-
-        return selections
-
-    def ok(self, _=None):
-        # _ to allow event binding
-
-        # Make sure X,Y,Z are all selected (>0)
-        selections = self.getSelections()
-        if min(selections[:3]) < 0:
-            self.bell()
-            # Flash effect
-            self.after(70, self.mainframe.focus_set)
-            self.after(140, self.okButton.focus_set)
-            self.after(210, self.mainframe.focus_set)
-            self.after(280, self.okButton.focus_set)
-            self.after(350, self.mainframe.focus_set)
-            return
 
-        self.withdraw()
-        self.update_idletasks()
-
-        self.result = self.getSelections()
-        self.cancel()
-
-    def cancel(self, _=None):
-        # _ to allow event binding
-        self.parent.focus_set()
-        self.destroy()
-
-
-class AskAuto(tk.Toplevel):
-    def __init__(self, baseFileName):
-        self.parent = tk._default_root  # pylint: disable=W0212
-        super().__init__(self.parent)
-
-        self.result = None
-        self.baseFileName = baseFileName
-
-        self.withdraw() # remain invisible for now
-        # If the master is not viewable, don't
-        # make the child transient, or else it
-        # would be opened withdrawn
-        if self.parent.winfo_viewable():
-            self.transient(self.parent)
-
-        self.title("Process File")
-
-        # Layout
-        self.resizable(False, False)
-        self.geometry("+%d+%d" % (self.parent.winfo_rootx()+50,
-                                  self.parent.winfo_rooty()+50))
-        self.mainframe = ttk.Frame(self)
-        self.mainframe.bind("<1>", lambda event: self.mainframe.focus_set())
-        self.mainframe.grid(column=0, row=0, sticky="NESW")
-        self.mainframe.columnconfigure(0, weight=1)
-
-        self.body(self.mainframe)
-        self.buttonbox(self.mainframe)
-        ##
-
-        self.protocol("WM_DELETE_WINDOW", self.skip)
-
-        # become visible now
-        self.deiconify()
-
-        # wait for window to appear on screen before calling grab_set
-        self.wait_visibility()
-        self.grab_set()
-        self.focus_force()
-        self.wait_window(self)
-
-    def body(self, master):
-        bodyFrame = ttk.Frame(master)
-        bodyFrame.grid(column=0, columnspan=4, row=0, padx=20, pady=20, sticky="NESW")
-        bodyFrame.columnconfigure(3, weight=1)
-
-        ttk.Label(bodyFrame, wraplength=400, text=f"{self.baseFileName}", font="-weight bold")\
-            .grid(column=0, columnspan=4, row=0, sticky="NESW")
-        ttk.Label(bodyFrame, wraplength=400, text="Is not in a recognised format.\nAttempt to parse automatically or manually specify columns?")\
-            .grid(column=0, columnspan=4, row=1, sticky="NESW")
-        ttk.Label(bodyFrame, wraplength=400, text="If you would like this format to be automatically processed, please report an issue to the")\
-            .grid(column=0, columnspan=4, row=2, sticky="NESW")
-
-        linkLabel = ttk.Label(bodyFrame, foreground="#0645AD", font="-underline 1", anchor="w",
-                              text=r"GitHub")
-        linkLabel.grid(column=0, row=3, sticky="NW")
-        linkLabel.bind("<Button-1>", lambda event: webbrowser.open(r"https://github.com/Archer4499/Maximum-Inscribed-Circle"))
-
-        ttk.Label(bodyFrame, anchor="w", text="page or email")\
-            .grid(column=1, row=3, sticky="NW")
-
-        emailLabel = ttk.Label(bodyFrame, foreground="#0645AD", font="-underline 1", anchor="w",
-                               text=r"king.dm49@gmail.com")
-        emailLabel.grid(column=2, row=3, sticky="NW")
-        emailLabel.bind("<Button-1>", lambda event: webbrowser.open(r"mailto:?to=king.dm49+mic@gmail.com&subject=Add%20support%20for%20new%20file%20format"))
-
-    def buttonbox(self, master):
-        autoButton = ttk.Button(master, text="Auto", command=self.auto, default=tk.ACTIVE)
-        autoButton.grid(column=1, row=1, padx=0, pady=10, sticky="E")
-        autoButton.focus_set()
-        ttk.Button(master, text="Manual", command=self.manual)\
-            .grid(column=2, row=1, padx=5, pady=10, sticky="E")
-        ttk.Button(master, text="Skip", command=self.skip)\
-            .grid(column=3, row=1, padx=10, pady=10, sticky="E")
-
-        self.bind("<Return>", self.auto)
-        self.bind("<Escape>", self.skip)
-
-    def auto(self, _=None):
-        self.result = True
-        self.skip()
-
-    def manual(self, _=None):
-        self.result = False
-        self.skip()
-
-    def skip(self, _=None):
-        self.parent.focus_set()
-        self.destroy()
+class ParseError(Exception):
+    # Raised by the parsers with a message to show the user
+    pass
 
 
 def smartSplit(line, separator):
@@ -803,54 +121,61 @@ def smartSplit(line, separator):
     return tokens
 
 
-def parseWithoutID(fileName, columns, separator):
-    # Parse columns given in columns[] without ID
-    polygons = []
-    points = []
-    elevations = []
+def readRuns(fileName, columns, separator):
+    # Yields PolygonBatches of the runs of consecutive lines with numbers in the columns given in columns[:3],
+    # including runs of fewer than 3 points. Raises OSError
+    if fastparse.available:
+        # Same runs, found with NumPy a block of lines at a time
+        yield from fastparse.iterRuns(fileName, columns, separator)
+        return
 
-    try:
-        with open(fileName, "r") as f:
-            for line in f:
-                tokens = smartSplit(line, separator)
+    polygons = PolygonBatch()
+    with open(fileName, "r") as f:
+        for line in f:
+            tokens = smartSplit(line, separator)
 
-                # Make sure the line has at least as many tokens as required, otherwise treat it as empty
-                if len(tokens) >= max(columns):
-                    try:
-                        x = float(tokens[columns[0]])
-                        y = float(tokens[columns[1]])
-                        z = float(tokens[columns[2]])
-                        points.append([x, y])
-                        elevations.append(z)
-                        continue  # for line in f
-                    except ValueError:
-                        pass
+            # Make sure the line has more tokens than the largest column, otherwise treat it as empty
+            if len(tokens) > max(columns):
+                try:
+                    x = float(tokens[columns[0]])
+                    y = float(tokens[columns[1]])
+                    z = float(tokens[columns[2]])
+                    polygons.addPoint(x, y, z)
+                    continue  # for line in f
+                except ValueError:
+                    pass
 
-                # If either empty line or floats can't be found in specified columns treat as end of polygon
-                if points:
-                    if len(points) < 3:
-                        messagebox.showerror(title="Error", message=f"Not enough points in number {len(polygons)} polygon in file: {fileName}")
-                        return []
-                    polygons.append([points, elevations])
-                points = []
-                elevations = []
-            if points:
-                if len(points) < 3:
-                    messagebox.showerror(title="Error", message=f"Not enough points in number {len(polygons)} polygon in file: {fileName}")
-                    return []
-                polygons.append([points, elevations])
-    except OSError:
-        messagebox.showerror(title="Error", message=f"Could not open input file: {fileName}")
-        return []
+            # If either empty line or floats can't be found in specified columns treat as end of polygon
+            if polygons.endPolygon() and len(polygons) >= PARSE_CHUNK:
+                yield polygons
+                polygons = PolygonBatch()
+        polygons.endPolygon()
+        if polygons:
+            yield polygons
 
-    return polygons
+
+def parseWithoutID(fileName, columns, separator):
+    # Parse columns given in columns[] without ID
+    # Yields PolygonBatches of the polygons as they are read, raises ParseError
+    numPolygons = 0
+    try:
+        for polygons in readRuns(fileName, columns, separator):
+            short = next((i for i in range(len(polygons)) if polygons.vertexCount(i) < 3), None)
+            if short is not None:
+                # The polygons before it are still given
+                if short:
+                    yield polygons.select(range(short))
+                raise ParseError(f"Not enough points in number {numPolygons + short} polygon in file: {fileName}")
+            numPolygons += len(polygons)
+            yield polygons
+    except OSError:
+        raise ParseError(f"Could not open input file: {fileName}")
 
 
 def parseWithID(fileName, columns, separator):
     # Parse columns given in columns[] with ID
-    polygons = []
-    points = []
-    elevations = []
+    # Yields PolygonBatches of the polygons as they are read, raises ParseError
+    polygons = PolygonBatch()
 
     try:
         with open(fileName, "r") as f:
@@ -864,99 +189,160 @@ def parseWithID(fileName, columns, separator):
                         newID = tokens[columns[3]]
                         # If ID is different we are in a new object
                         if newID != currID:
-                            if len(points) >= 3:
-                                polygons.append([points, elevations])
-                            points = []
-                            elevations = []
+                            if polygons.endPolygon(3) and len(polygons) >= PARSE_CHUNK:
+                                yield polygons
+                                polygons = PolygonBatch()
                             currID = newID
                         x = float(tokens[columns[0]])
                         y = float(tokens[columns[1]])
                         z = float(tokens[columns[2]])
-                        points.append([x, y])
-                        elevations.append(z)
+                        polygons.addPoint(x, y, z)
                         continue  # for line in f
                     except ValueError:
                         pass
 
                 # If either empty line or floats can't be found in specified columns treat as end of polygon
-                if len(points) >= 3:
-                    polygons.append([points, elevations])
-                points = []
-                elevations = []
-            if len(points) >= 3:
-                polygons.append([points, elevations])
+                if polygons.endPolygon(3) and len(polygons) >= PARSE_CHUNK:
+                    yield polygons
+                    polygons = PolygonBatch()
+            polygons.endPolygon(3)
+            if polygons:
+                yield polygons
 
     except OSError:
-        messagebox.showerror(title="Error", message=f"Could not open input file: {fileName}")
-        return []
-
-    return polygons
+        raise ParseError(f"Could not open input file: {fileName}")
 
 
-def parseUnknown(fileName):
+def findXYZ(tokens):
+    # Returns the index of the first of 3 consecutive numbers in tokens, or None
+    for i in range(len(tokens)-2):
+        try:
+            float(tokens[i])
+            float(tokens[i+1])
+            float(tokens[i+2])
+            return i
+        except ValueError:
+            pass
+    return None
+
+
+def sniffFormat(fileName):
+    # Decides how to parse an unknown format from the first SNIFF_LINES lines of the file
+    # Returns (offset, separator) where offset is the column of the x co-ordinate, or None if the numbers
+    #  aren't always in the same columns. Returns None if no polygons were found in those lines
+    # The separators are tried in the order of SNIFF_SEPARATORS and the first that finds a polygon is used
+    # Raises OSError
+    with open(fileName, "r") as f:
+        lines = list(islice(f, SNIFF_LINES))
+
+    for separator in SNIFF_SEPARATORS:
+        offsets = set()
+        run = []
+        # An empty line at the end finishes the last polygon
+        for line in lines + [""]:
+            offset = findXYZ(smartSplit(line, separator))
+            if offset is not None:
+                run.append(offset)
+                continue
+            # Same as parsing, a line without 3 numbers ends the polygon and shorter ones are ignored
+            if len(run) >= 3:
+                offsets.update(run)
+            run = []
+
+        if offsets:
+            if len(offsets) == 1:
+                return offsets.pop(), separator
+            return None, separator
+    return None
+
+
+def searchRuns(fileName, separator):
+    # Yields PolygonBatches of the polygons of at least 3 lines that have 3 consecutive numbers anywhere
+    # in them, interpreted as x,y,z. Raises OSError
+    polygons = PolygonBatch()
+    with open(fileName, "r") as f:
+        for line in f:
+            tokens = smartSplit(line, separator)
+            i = findXYZ(tokens)
+            if i is not None:
+                polygons.addPoint(float(tokens[i]), float(tokens[i+1]), float(tokens[i+2]))
+                continue
+            # If line is either too short or doesn't contain 3 floats,
+            #   then it counts as an empty line and we move onto the next polygon
+            if polygons.endPolygon(3) and len(polygons) >= PARSE_CHUNK:
+                yield polygons
+                polygons = PolygonBatch()
+        polygons.endPolygon(3)
+        if polygons:
+            yield polygons
+
+
+def parseUnknown(fileName, notes=None):
     # Attempt to parse unknown format
-    separators = [",", " ", ";"]
-    polygons = []
-
+    # Yields PolygonBatches of the polygons as they are read, raises ParseError
+    # The separator and columns are decided from the start of the file so it is only read once,
+    #  and the decision is added to the list notes so the file can be read with the same settings using Manual,
+    #  in batch mode it is also printed with the --columns and --separator to use
     try:
-        with open(fileName, "r") as f:
-            for separator in separators:
-                f.seek(0)  # Go back to start of file for each separator
-                points = []
-                elevations = []
-
-                for line in f:
-                    tokens = smartSplit(line, separator)
-
-                    # Searches the line for a group of 3 consecutive numbers
-                    for i in range(len(tokens)-2):
-                        try:
-                            x = float(tokens[i])
-                            y = float(tokens[i+1])
-                            z = float(tokens[i+2])
-                            points.append([x, y])
-                            elevations.append(z)
-                            break
-                        except ValueError:
-                            pass
-                    else:
-                        # If line is either too short or doesn't contain 3 floats,
-                        #   then it counts as an empty line and we move onto the next polygon
-                        if len(points) >= 3:
-                            polygons.append([points, elevations])
-                        points = []
-                        elevations = []
-                if len(points) >= 3:
-                    polygons.append([points, elevations])
-
-                if polygons:
+        decision = sniffFormat(fileName)
+        if decision is None:
+            # Nothing found near the start of the file, search the whole file with each separator
+            for separator in SNIFF_SEPARATORS:
+                found = False
+                for polygons in searchRuns(fileName, separator):
+                    found = True
+                    yield polygons
+                if found:
                     # If we found polygons in file finish processing, else try again with a different separator
                     break
-    except OSError:
-        messagebox.showerror(title="Error", message=f"Could not open input file: {fileName}")
-        return []
+            return
 
-    return polygons
+        offset, separator = decision
+        separatorName = next(name for name, char in SEPARATORS.items() if char == separator)
+        if offset is None:
+            note = f"Auto: {fileName} is delimited by {separatorName}, the X,Y,Z columns vary between lines"
+            if notes is not None:
+                notes.append(note)
+            if headless:
+                showInfo(note)
+            yield from searchRuns(fileName, separator)
+            return
+
+        columns = [offset, offset+1, offset+2, -1]
+        note = f"Auto: {fileName} is delimited by {separatorName} with X,Y,Z in columns {offset},{offset+1},{offset+2}"
+        if notes is not None:
+            notes.append(note)
+        if headless:
+            showInfo(f"{note} (--columns {offset},{offset+1},{offset+2} --separator \"{separator}\")")
+        for polygons in readRuns(fileName, columns, separator):
+            # Short runs of numbers, e.g. in headers, aren't polygons
+            long = [i for i in range(len(polygons)) if polygons.vertexCount(i) >= 3]
+            if len(long) < len(polygons):
+                polygons = polygons.select(long)
+            if polygons:
+                yield polygons
+    except OSError:
+        raise ParseError(f"Could not open input file: {fileName}")
 
 
-def parseData(fileName):
-    # Parses data from the file fileName in the CSV format GEM4D outputs
+def openData(fileName, formatRule=None, notes=None):
+    # Returns a generator of PolygonBatches of the polygons in the file fileName in the CSV format GEM4D outputs,
+    # or None if the file is skipped. Raises ParseError, including while iterating the generator
     # And attempts to parse similar CSV files, main requirements are:
         # At least one line, without 3 consecutive numbers, separating each polygon
         # Comma separated values
         # 3 consecutive numbers on each polygon line interpreted as x,y,z
+    # formatRule decides what to do with unrecognised formats without asking the user:
+    #  None asks with AskAuto/AskColumns, "auto" parses automatically, "skip" skips the file,
+    #  or a tuple of (columns, separator) as AskColumns would return
+    # How files in unrecognised formats are read is added to the list notes, as for parseUnknown
     try:
         with open(fileName, "r") as f:
             firstLine = f.readline()
-            if not firstLine:
-                messagebox.showerror(title="Error", message=f"File: {fileName} is empty")
-                return []
-            # Reset position in file to beginning after reading first line
     except OSError:
-        messagebox.showerror(title="Error", message=f"Could not open input file: {fileName}")
-        return []
-
-    polygons = []
+        raise ParseError(f"Could not open input file: {fileName}")
+    if not firstLine:
+        raise ParseError(f"File: {fileName} is empty")
 
     columns = []
     separator = ","
@@ -977,13 +363,20 @@ def parseData(fileName):
     elif "SimpleFormat" in firstToken:
         # Custom SimpleFormat
         columns = [0, 1, 2, -1]
+    elif formatRule == "skip":
+        return None
+    elif formatRule == "auto":
+        pass
+    elif formatRule is not None:
+        columns, separator = formatRule
     else:
         # TODO(Derek): checkbox to allow temp suppress warning? (while program still open)
+        from gui import AskAuto, AskColumns
         ask = AskAuto(baseFileName)
         answer = ask.result
         if answer is None:
             # Skip file
-            return []
+            return None
         elif not answer:
             # Ask user to specify columns
             ask = AskColumns(fileName)
@@ -991,23 +384,739 @@ def parseData(fileName):
             separator = ask.currSeparator
             if columns is None:
                 # Cancel, skip file
-                return []
+                return None
 
-    # Parse
     if columns:
         if columns[3] < 0:
-            polygons = parseWithoutID(fileName, columns, separator)
-        else:
-            polygons = parseWithID(fileName, columns, separator)
-    else:
-        polygons = parseUnknown(fileName)
+            return parseWithoutID(fileName, columns, separator)
+        return parseWithID(fileName, columns, separator)
+    return parseUnknown(fileName, notes)
+
+
+def parseData(fileName, formatRule=None, notes=None):
+    # Returns a PolygonBatch of all the polygons in the file fileName
+    # Errors are shown and give an empty batch, formatRule and notes are as for openData
+    try:
+        parser = openData(fileName, formatRule, notes)
+        if parser is None:
+            return PolygonBatch()
+        # Parsing makes millions of short lived objects that can't form reference cycles, so the garbage
+        # collector scanning them over and over as they are created would only slow parsing down
+        gcEnabled = gc.isenabled()
+        gc.disable()
+        try:
+            polygons = PolygonBatch.concatenate(parser)
+        finally:
+            if gcEnabled:
+                gc.enable()
+    except ParseError as e:
+        showError(str(e))
+        return PolygonBatch()
 
     if not polygons:
-        messagebox.showerror(title="Error", message=f"No polygons found in file: {fileName}")
-        return []
+        showError(f"No polygons found in file: {fileName}")
+        return PolygonBatch()
 
     return polygons
 
 
-if __name__ == '__main__':
+def streamData(fileNames, formatRule=None, metrics=None):
+    # Yields PolygonBatches of the polygons of each file in turn without reading whole files into memory
+    # Errors are shown and parsing carries on with the next file, so unlike parseData a file
+    # with an error still gives the polygons read before the error
+    # The time spent parsing each file, its number of polygons and notes are added to the RunMetrics metrics
+    for fileName in fileNames:
+        numPolygons = 0
+        seconds = 0.0
+        notes = []
+        start = perf_counter()
+        try:
+            parser = openData(fileName, formatRule, notes)
+            if parser is None:
+                continue
+            for polygons in parser:
+                numPolygons += len(polygons)
+                # Only the time taken by the parser, not by whatever is done with the polygons
+                seconds += perf_counter() - start
+                yield polygons
+                start = perf_counter()
+        except ParseError as e:
+            showError(str(e))
+            continue
+        finally:
+            if metrics is not None:
+                metrics.addStage("parse", fileName, seconds + perf_counter() - start)
+                metrics.addFile(fileName, numPolygons)
+                metrics.addNotes(fileName, notes)
+        if not numPolygons:
+            showError(f"No polygons found in file: {fileName}")
+
+
+def solverPrecision(points, precisionPolicy="absolute", precisionValue=PRECISION):
+    # Returns the precision and relative precision to give the solvers for the polygon with the x,y points
+    # as given by PolygonBatch.points, with precisionPolicy one of PRECISION_POLICIES and its value
+    if precisionPolicy == "absolute":
+        return precisionValue, 0.0
+    if precisionPolicy == "output":
+        # The radius to within a quarter of the last decimal place keeps the diameter within half of it
+        return 10.0 ** -precisionValue / 4, 0.0
+
+    if hasattr(points, "min"):
+        xMin, yMin = points.min(axis=0).tolist()
+        xMax, yMax = points.max(axis=0).tolist()
+    else:
+        xs, ys = zip(*points)
+        xMin, yMin, xMax, yMax = min(xs), min(ys), max(xs), max(ys)
+    side = min(xMax - xMin, yMax - yMin)
+    if precisionPolicy == "bbox":
+        return precisionValue * side, 0.0
+    return MIN_RELATIVE_PRECISION * side, precisionValue
+
+
+def solvePolygon(points, elevation, engine="polylabel", maxProbes=None, maxTime=None, simplifyTolerance=0,
+                 precisionPolicy="absolute", precisionValue=PRECISION):
+    # Returns the circle of the polygon with the x,y points as given by PolygonBatch.points, formatted as
+    # [[x,y,z],radius] with z the elevation given, or None if no circle could be found, and the polylabel.Status
+    # of the search
+    # engine is the name of the solver in ENGINES to use, the search stops early after maxProbes or maxTime seconds
+    # With a simplifyTolerance the polygon is simplified first and the circle is
+    # [[x,y,z],radius,vertices removed,diameter error bound]
+    # The precision is decided by precisionPolicy and precisionValue as for solverPrecision
+    # Runs in the worker processes so can't show any errors itself
+    numPoints = len(points)
+    if simplifyTolerance > 0:
+        points = simplify(points, simplifyTolerance)
+    precision, relativePrecision = solverPrecision(points, precisionPolicy, precisionValue)
+    centre, radius, status = ENGINES[engine](points, precision=precision, max_probes=maxProbes, max_time=maxTime,
+                                             with_status=True, relative_precision=relativePrecision)
+    # A search stopped very early may not have found any point inside the polygon
+    if radius is None or radius <= 0:
+        return None, status
+    centre.append(elevation)
+    if simplifyTolerance > 0:
+        return [centre, radius, numPoints - len(points), diameter_error_bound(simplifyTolerance)], status
+    return [centre, radius], status
+
+
+def cacheLookup(polygons, indices, cache, options):
+    # Sets the circles of the polygons at indices of the PolygonBatch polygons that are in the cache
+    # Returns the indices of the polygons still to calculate and the cache key of each polygon by index,
+    # options are as passed on to solvePolygon
+    if cache is None:
+        return indices, None
+    # maxProbes and maxTime aren't part of the key since circles that stopped early aren't cached
+    engine = options.get("engine", "polylabel")
+    precisionPolicy = options.get("precisionPolicy", "absolute")
+    precisionValue = options.get("precisionValue", PRECISION)
+    # Absolute precisions have the same key as before there were other policies, so those circles are still found
+    precisionKey = precisionValue if precisionPolicy == "absolute" else (precisionPolicy, precisionValue)
+    settings = (engine, ENGINE_VERSIONS[engine], precisionKey, options.get("simplifyTolerance", 0))
+    keys = {i: cache.key(*polygons.arrays(i), settings) for i in indices}
+    found = cache.lookup(list(keys.values()))
+    for i in indices:
+        if keys[i] in found:
+            polygons.setCircle(i, found[keys[i]])
+    return [i for i in indices if keys[i] not in found], keys
+
+
+def cacheStore(polygons, statuses, cache, keys):
+    # Adds the circles calculated to the cache, statuses and keys are as from calculateCircles and cacheLookup
+    if cache is not None:
+        cache.store({keys[i]: polygons.circle(i) for i in statuses
+                     if polygons.hasCircle(i) and not statuses[i].stopped_early})
+
+
+def calculateCircles(polygons, indices, workers=1, cache=None, executor=None, **options):
+    # Calculates the circles of the polygons at indices of the PolygonBatch polygons, storing them in the batch
+    # Returns a dict of the polylabel.Status of each polygon calculated by index
+    # Doesn't show any messages, so can be run on any thread, reportProblems shows them afterwards
+    # options are passed on to solvePolygon
+    # Circles found in the cache aren't calculated again, and circles calculated are added to it
+    # executor is a ProcessPoolExecutor to use instead of starting one
+    statuses = {}
+    toSolve, keys = cacheLookup(polygons, indices, cache, options)
+
+    # Polygons with the most points are solved first so the workers all finish at about the same time
+    order = sorted(toSolve, key=polygons.vertexCount, reverse=True)
+    orderedPoints = (polygons.points(i) for i in order)
+    orderedElevations = (polygons.meanElevation(i) for i in order)
+
+    # Not worth starting processes for only a few polygons
+    if workers <= 1 or len(order) < 2 * workers:
+        orderedResults = map(partial(solvePolygon, **options), orderedPoints, orderedElevations)
+    else:
+        # Small chunks keep the largest polygons at the front while reducing the overhead of sending each one
+        chunksize = max(1, len(order) // (workers * 16))
+        if executor is None:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                orderedResults = list(executor.map(partial(solvePolygon, **options), orderedPoints, orderedElevations,
+                                                   chunksize=chunksize))
+        else:
+            orderedResults = list(executor.map(partial(solvePolygon, **options), orderedPoints, orderedElevations,
+                                               chunksize=chunksize))
+
+    for i, (circle, status) in zip(order, orderedResults):
+        if circle is not None:
+            polygons.setCircle(i, circle)
+        statuses[i] = status
+
+    cacheStore(polygons, statuses, cache, keys)
+    return statuses
+
+
+def reportProblems(polygons, statuses, firstNumber=1):
+    # Shows the problems with the circles calculated by calculateCircles, statuses is as it returns
+    # Returns the number of polygons no circle could be found for
+    # firstNumber is the number of the first polygon in messages
+    failed = [i for i in sorted(statuses) if not polygons.hasCircle(i)]
+    for i in failed:
+        points, elevations = polygons.polygon(i)
+        prettyPolygon = [[x, y, z] for (x, y), z in zip(points, elevations)]
+        showError(f"Could not create circle from polygon:\n{prettyPolygon}")
+        # Only show the first error in the GUI
+        if not headless:
+            break
+
+    # Polygons that ran out of time, usually bad data such as multiple polygons joined with 0,0 points between them
+    degraded = [f"Polygon {i+firstNumber} stopped after {status.probes} probes, the diameter could be up to {2*status.gap:.3f} larger"
+                for i, status in sorted(statuses.items()) if status.stopped_early]
+    if degraded:
+        if headless:
+            for message in degraded:
+                showWarning(message)
+        else:
+            more = f"\n... and {len(degraded)-10} more" if len(degraded) > 10 else ""
+            showWarning(f"{len(degraded)} polygon/s took too long to solve and may be inaccurate:\n" +
+                        "\n".join(degraded[:10]) + more)
+
+    return len(failed)
+
+
+def solvePolygons(polygons, workers=1, cache=None, executor=None, firstNumber=1, metrics=None, **options):
+    # Calculates the circles of the PolygonBatch polygons, storing them in the batch, and shows any problems
+    # Returns the number of polygons no circle could be found for
+    # Arguments are as for calculateCircles and reportProblems, the statuses are added to the RunMetrics metrics
+    statuses = calculateCircles(polygons, range(len(polygons)), workers, cache, executor, **options)
+    if metrics is not None:
+        metrics.addStatuses(polygons, statuses, firstNumber - 1, options.get("precisionPolicy", "absolute"),
+                            options.get("precisionValue", PRECISION))
+    return reportProblems(polygons, statuses, firstNumber)
+
+
+def solvePolygonArgs(pointsElevation, **options):
+    # solvePolygon of the (points, elevation) tuple, for Pool.imap
+    return solvePolygon(*pointsElevation, **options)
+
+
+class SolveJob(threading.Thread):
+    # Calculates the circles of a PolygonBatch on a background thread a chunk at a time, so the GUI stays
+    # responsive. (polygons done, vertices done) is put on updates after each chunk and None once finished
+    # The polygons are solved in a pool of worker processes, so cancel can stop them part way through a polygon,
+    # keeping the circles already found
+    # Once finished statuses is as returned by calculateCircles, and error is any exception that stopped it
+    def __init__(self, polygons, workers=1, cache=None, **options):
+        super().__init__(daemon=True)
+        self.polygons = polygons
+        self.workers = workers
+        self.cache = cache
+        self.options = options
+        self.statuses = {}
+        self.error = None
+        self.updates = queue.Queue()
+        self.cancelled = threading.Event()
+        # Started once there is a polygon to solve that isn't in the cache. Its processes are daemons, so they
+        # are stopped rather than waited for if the program exits
+        self.pool = None
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def solveChunk(self, chunk):
+        # Calculates the circles of the polygons at the indices chunk as calculateCircles does, polygons
+        # not yet solved when the job is cancelled are left without a circle or status
+        toSolve, keys = cacheLookup(self.polygons, chunk, self.cache, self.options)
+        order = sorted(toSolve, key=self.polygons.vertexCount, reverse=True)
+        if not order:
+            return
+        if self.pool is None:
+            self.pool = multiprocessing.Pool(max(self.workers, 1))
+        pointsElevations = ((self.polygons.points(i), self.polygons.meanElevation(i)) for i in order)
+        results = self.pool.imap(partial(solvePolygonArgs, **self.options), pointsElevations)
+        statuses = {}
+        try:
+            for i in order:
+                # Waits a little at a time so a cancel isn't held up by a slow polygon
+                while True:
+                    if self.cancelled.is_set():
+                        return
+                    try:
+                        circle, status = results.next(CANCEL_INTERVAL)
+                        break
+                    except multiprocessing.TimeoutError:
+                        pass
+                if circle is not None:
+                    self.polygons.setCircle(i, circle)
+                statuses[i] = status
+        finally:
+            self.statuses.update(statuses)
+            cacheStore(self.polygons, statuses, self.cache, keys)
+
+    def run(self):
+        polygons = self.polygons
+        # Largest first as in calculateCircles, so the progress by vertices is close to the time taken
+        order = sorted(range(len(polygons)), key=polygons.vertexCount, reverse=True)
+        chunkSize = STREAM_CHUNK if self.workers <= 1 else self.workers * STREAM_CHUNK
+        done = 0
+        vertices = 0
+        try:
+            for start in range(0, len(order), chunkSize):
+                chunk = order[start:start + chunkSize]
+                self.solveChunk(chunk)
+                if self.cancelled.is_set():
+                    break
+                done += len(chunk)
+                vertices += sum(polygons.vertexCount(i) for i in chunk)
+                self.updates.put((done, vertices))
+        except Exception as e:
+            # Passed on to be shown by the GUI, which would otherwise wait for the job forever
+            self.error = e
+        finally:
+            # Also stops any polygons still being solved once cancelled
+            if self.pool is not None:
+                self.pool.terminate()
+            self.updates.put(None)
+
+
+def streamSolvePolygons(batches, workers=1, cache=None, metrics=None, **options):
+    # Yields a PolygonBatch with circles for each chunk of the polygons from the iterable of PolygonBatches
+    # batches, in the same order, with metrics and options as for solvePolygons. Polygons are solved a chunk
+    # at a time so only one chunk is kept in memory besides the batch being read
+    chunkSize = STREAM_CHUNK if workers <= 1 else workers * STREAM_CHUNK
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    seconds = 0.0
+    try:
+        numSolved = 0
+        for polygons in batches:
+            for start in range(0, len(polygons), chunkSize):
+                chunk = polygons.select(range(start, min(start + chunkSize, len(polygons))))
+                solveStart = perf_counter()
+                solvePolygons(chunk, workers, cache, executor, numSolved + 1, metrics, **options)
+                seconds += perf_counter() - solveStart
+                numSolved += len(chunk)
+                yield chunk
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        # The chunks are solved in between the other stages, so their times are added up into one
+        if metrics is not None:
+            metrics.addStage("solve", None, seconds)
+
+
+def writeDXFCircle(dxf, number, polygons, i, xs=None, ys=None, outputCircle=False, outputDiameter=True,
+                   outputLabel=False, outputPoints=False, outputPolyLines=True):
+    # Writes the items for the circle of polygon i of the PolygonBatch polygons to the open r12writer dxf,
+    # on the layer for circle number. xs and ys are the points approximating the circle from circlePoints,
+    # only needed for outputPoints and outputPolyLines
+    x, y, z = polygons.centres[3*i:3*i+3]
+    radius = polygons.radii[i]
+    layer = "Circle"+str(number)
+
+    x1 = x + radius
+    x2 = x - radius
+
+    # Draw the circle
+    if outputCircle:
+        dxf.add_circle((x, y, z), radius=radius, layer=layer)
+
+    # Draw the diameter line
+    if outputDiameter:
+        dxf.add_line((x1, y, z), (x2, y, z), layer=layer)
+
+    # Draw the diameter label
+    if outputLabel:
+        diameter = radius * 2.0  # polylabel gives the radius of the circle, we want the diameter
+        lineCentre = [(x2-x1)/2.0 + x1, y + 0.2, z]  # Centre of the line with a slight offset
+        dxf.add_text(f"{diameter:.2f}", lineCentre, align="CENTER", layer=layer)
+
+    # Draw the points approximating circle
+    if outputPoints:
+        for currX, currY in zip(xs, ys):
+            dxf.add_point((currX, currY, z), layer=layer)
+
+    # Draw the polylines approximating circle
+    if outputPolyLines:
+        points = list(zip(xs, ys, repeat(z)))
+        points.append(points[0])
+        dxf.add_polyline(points, layer=layer)
+
+
+def writeDXFCircles(dxf, firstNumber, polygons, indices, pointsNum, outputCircle=False, outputDiameter=True,
+                    outputLabel=False, outputPoints=False, outputPolyLines=True):
+    # Writes the circles of the polygons at indices of the PolygonBatch polygons to the open r12writer dxf,
+    # numbered from firstNumber
+    if outputPoints or outputPolyLines:
+        # For each circle calculate pointsNum number of points around it
+        circles = circlePoints(polygons, indices, pointsNum)
+    else:
+        circles = ((i, None, None) for i in indices)
+    for number, (i, xs, ys) in enumerate(circles, firstNumber):
+        writeDXFCircle(dxf, number, polygons, i, xs, ys, outputCircle, outputDiameter, outputLabel,
+                       outputPoints, outputPolyLines)
+
+
+def writeCircles(f, polygons, indices):
+    # Writes the lines of the Circles CSV for the circles of the polygons at indices of the PolygonBatch
+    # polygons to the open file f
+    lines = []
+    for i in indices:
+        x, y, z = polygons.centres[3*i:3*i+3]
+        diameter = polygons.radii[i] * 2.0  # polylabel gives the radius of the circle, we want to print the diameter
+        # Output to 2 decimal places
+        lines.append(f"{x:.2f},{y:.2f},{z:.2f},{diameter:.2f}\n")
+    f.write("".join(lines))
+
+
+def writePoints(f, polygons, indices, pointsNum):
+    # Writes the points of the circles of the polygons at indices of the PolygonBatch polygons to the open
+    # Points CSV file f, many circles at a time
+    for text in pointsText(polygons, indices, pointsNum):
+        f.write(text)
+
+
+class OutputSink:
+    # Writes circles to every selected output file in one pass, a batch at a time as they are calculated
+    # Each output is written to a temporary file next to it that only replaces the output file once close
+    # is called, so an output is never left half written. Used as a context manager it is closed at the end,
+    # or the temporary files are removed if there was an exception
+    # Raises OSError if the files can't be written
+    def __init__(self, folder, prefix="", pointsNum=16, dxfItems=None, circles=False, points=False, binary=False,
+                 binaryPoints=False):
+        # Outputs are named after OUTPUT_FILES in folder, starting with prefix. dxfItems is a list of the
+        # DXF_ITEMS to write to the DXF file, None for no DXF file. binaryPoints adds the points block to
+        # the binary output
+        self.pointsNum = pointsNum
+        self.dxfItems = dxfItems
+        self.numCircles = 0
+        # Polygons written so far, so each circle in the binary output has the number of its polygon
+        self.numPolygons = 0
+        # Output file name: temporary file name
+        self.fileNames = {}
+        self.stack = ExitStack()
+        self.dxf = None
+        self.circlesFile = None
+        self.pointsFile = None
+        self.binary = None
+        try:
+            if dxfItems is not None:
+                self.dxf = self.stack.enter_context(r12writer(self._open(folder, prefix, "dxf")))
+            if circles:
+                self.circlesFile = self._open(folder, prefix, "circles")
+            if points:
+                self.pointsFile = self._open(folder, prefix, "points")
+            if binary:
+                self.binary = BinaryWriter(self._open(folder, prefix, "binary", "wb"), pointsNum if binaryPoints else 0)
+                self.stack.callback(self.binary.close)
+        except OSError:
+            self.abort()
+            raise
+
+    def _open(self, folder, prefix, output, mode="w"):
+        fileName = path.join(folder, prefix + OUTPUT_FILES[output])
+        tempFileName = fileName + ".tmp"
+        f = self.stack.enter_context(open(tempFileName, mode))
+        self.fileNames[fileName] = tempFileName
+        return f
+
+    def write(self, polygons, indices=None):
+        # Writes the circles of the polygons at indices of the PolygonBatch polygons, default all of its circles
+        if indices is None:
+            indices = polygons.solved()
+        if self.dxf is not None:
+            writeDXFCircles(self.dxf, self.numCircles, polygons, indices, self.pointsNum,
+                            *(item in self.dxfItems for item in DXF_ITEMS))
+        if self.circlesFile is not None:
+            writeCircles(self.circlesFile, polygons, indices)
+        if self.pointsFile is not None:
+            writePoints(self.pointsFile, polygons, indices, self.pointsNum)
+        if self.binary is not None:
+            self.binary.write(polygons, indices, self.numPolygons)
+        self.numCircles += len(indices)
+        self.numPolygons += len(polygons)
+
+    def close(self):
+        # Finishes the files and moves them to the output file names. If finishing or moving them fails,
+        # e.g. on a full disk, the temporary files not yet moved are removed as for abort
+        try:
+            self.stack.close()
+            for fileName, tempFileName in list(self.fileNames.items()):
+                replace(tempFileName, fileName)
+                del self.fileNames[fileName]
+        except Exception:
+            self.abort()
+            raise
+
+    def abort(self):
+        # Removes the temporary files, leaving any previous output files as they were
+        self.stack.close()
+        for tempFileName in self.fileNames.values():
+            try:
+                remove(tempFileName)
+            except OSError:
+                pass
+        self.fileNames = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        if excType is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def saveOutputs(folder, polygons, prefix="", pointsNum=16, dxfItems=None, circles=False, points=False, binary=False,
+                binaryPoints=False):
+    # Writes the circles of the PolygonBatch polygons to each output selected as for OutputSink
+    # Returns 1 if they couldn't be written
+    try:
+        with OutputSink(folder, prefix, pointsNum, dxfItems, circles, points, binary, binaryPoints) as sink:
+            sink.write(polygons)
+    except OSError:
+        showError(f"Could not write to output files in: {folder}")
+        return 1
+    return 0
+
+
+def batch(args):
+    # Runs the load -> polylabel -> save pipeline without any Tk windows
+    global headless
+    headless = True
+
+    if args.columns is None:
+        formatRule = args.unknown
+    else:
+        columns = [int(column) for column in args.columns.split(",")]
+        if len(columns) == 3:
+            columns.append(-1)
+        formatRule = (columns, args.separator)
+
+    fileNames = []
+    for pattern in args.files:
+        # Windows shells don't expand wildcards
+        matches = sorted(glob(pattern))
+        if matches:
+            fileNames.extend(matches)
+        else:
+            fileNames.append(pattern)
+
+    outputFolder = args.out
+    try:
+        makedirs(outputFolder, exist_ok=True)
+    except OSError:
+        showError(f"Output Folder: {outputFolder} is not able to be created.")
+        return 1
+
+    cache = None
+    if not args.no_cache:
+        cache = openCache(args.cache, args.cache_size)
+        if cache is not None and args.clear_cache:
+            try:
+                cache.clear()
+            except sqlite3.Error as e:
+                showError(f"Could not clear the result cache: {e}")
+                return 1
+
+    startTime = perf_counter()
+    # The polygon records are only kept for the report, in a temporary file when streaming so memory
+    # use doesn't grow with the number of polygons
+    if args.report is None:
+        metrics = RunMetrics(polygonRecords=None)
+    else:
+        metrics = RunMetrics(polygonRecords="file" if args.stream else "memory")
+
+    if args.stream:
+        numPolygons, numCircles, vertices, failed = streamOutputs(args, fileNames, formatRule, cache, metrics)
+        if not numPolygons:
+            showError("No polygons found in any input file")
+            return 1
+        elapsed = perf_counter() - startTime
+        print(f"Processed {numCircles}/{numPolygons} polygons ({vertices} vertices) from {len(fileNames)} file/s "
+              f"in {elapsed:.2f}s ({numPolygons/elapsed:.1f} polygons/s, {vertices/elapsed:.0f} vertices/s)")
+        if cache is not None:
+            print(f"Result cache: {cache.totalHits} hits, {cache.totalMisses} misses")
+            cache.close()
+        failed += writeReport(args.report, metrics)
+        if failed or numCircles < numPolygons:
+            return 1
+        return 0
+
+    polygons = PolygonBatch()
+    for fileName in fileNames:
+        notes = []
+        with metrics.timed("parse", fileName):
+            filePolygons = parseData(fileName, formatRule, notes)
+        metrics.addFile(fileName, len(filePolygons))
+        metrics.addNotes(fileName, notes)
+        polygons.extend(filePolygons)
+    if not polygons:
+        showError("No polygons found in any input file")
+        return 1
+
+    with metrics.timed("solve"):
+        unsolved = solvePolygons(polygons, args.workers, cache=cache, metrics=metrics, engine=args.engine,
+                                 maxProbes=args.max_probes, maxTime=args.time_limit, simplifyTolerance=args.simplify,
+                                 precisionPolicy=args.precision_policy, precisionValue=args.precision)
+
+    dxfItems = args.dxf_items.split(",") if args.dxf else None
+    with metrics.timed("save"):
+        failed = saveOutputs(outputFolder, polygons, pointsNum=args.points, dxfItems=dxfItems, circles=args.circles,
+                             points=args.points_csv, binary=args.binary, binaryPoints=args.binary_points)
+
+    vertices = polygons.totalVertices()
+    elapsed = perf_counter() - startTime
+    print(f"Processed {len(polygons)-unsolved}/{len(polygons)} polygons ({vertices} vertices) from {len(fileNames)} file/s "
+          f"in {elapsed:.2f}s ({len(polygons)/elapsed:.1f} polygons/s, {vertices/elapsed:.0f} vertices/s), "
+          f"reading took {metrics.seconds('parse'):.2f}s, solving took {metrics.seconds('solve'):.2f}s, "
+          f"saving took {metrics.seconds('save'):.2f}s")
+    if cache is not None:
+        print(f"Result cache: {cache.totalHits} hits, {cache.totalMisses} misses")
+        cache.close()
+
+    failed += writeReport(args.report, metrics)
+    if failed or unsolved:
+        return 1
+    return 0
+
+
+def writeReport(fileName, metrics):
+    # Writes the report of the RunMetrics metrics to fileName as JSON lines, if it isn't None
+    # Returns 1 if it couldn't be written
+    if fileName is None:
+        return 0
+    try:
+        with open(fileName, "w") as f:
+            metrics.write(f)
+    except OSError:
+        showError(f"Could not write the run report: {fileName}")
+        return 1
+    return 0
+
+
+def streamOutputs(args, fileNames, formatRule, cache, metrics=None):
+    # The batch pipeline with polygons parsed, solved and written a chunk at a time, so memory use
+    # doesn't grow with the size of the files
+    # Returns the number of polygons, circles and vertices processed and 1 if the outputs couldn't be written
+    # The time taken by each stage is added to the RunMetrics metrics
+    numPolygons = 0
+    vertices = 0
+    dxfItems = args.dxf_items.split(",") if args.dxf else None
+    sink = None
+    seconds = 0.0
+    try:
+        with OutputSink(args.out, pointsNum=args.points, dxfItems=dxfItems, circles=args.circles,
+                        points=args.points_csv, binary=args.binary, binaryPoints=args.binary_points) as sink:
+            for polygons in streamSolvePolygons(streamData(fileNames, formatRule, metrics), args.workers,
+                                                cache=cache, metrics=metrics, engine=args.engine,
+                                                maxProbes=args.max_probes, maxTime=args.time_limit,
+                                                simplifyTolerance=args.simplify,
+                                                precisionPolicy=args.precision_policy, precisionValue=args.precision):
+                numPolygons += len(polygons)
+                vertices += polygons.totalVertices()
+                start = perf_counter()
+                sink.write(polygons)
+                seconds += perf_counter() - start
+            # Finishing the outputs is saving too
+            start = perf_counter()
+        seconds += perf_counter() - start
+        if metrics is not None:
+            metrics.addStage("save", None, seconds)
+    except OSError:
+        showError(f"Could not write to output files in: {args.out}")
+        return numPolygons, sink.numCircles if sink is not None else 0, vertices, 1
+    return numPolygons, sink.numCircles, vertices, 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calculates the maximum inscribed circles of digitized polygons. "
+                                                 "Starts the GUI if no command is given.")
+    subparsers = parser.add_subparsers(dest="command")
+
+    batchParser = subparsers.add_parser("batch", help="process files without the GUI")
+    batchParser.add_argument("files", nargs="+", help="input files, wildcards are expanded")
+    batchParser.add_argument("--out", default="./", help="output folder (default: %(default)s)")
+    batchParser.add_argument("--dxf", action="store_true", help="output circles.dxf")
+    batchParser.add_argument("--dxf-items", default="diameter,polyline",
+                             help="comma separated items to output in the DXF from circle,diameter,label,points,polyline "
+                                  "(default: %(default)s)")
+    batchParser.add_argument("--circles", action="store_true", help="output circles.csv")
+    batchParser.add_argument("--points-csv", action="store_true", help="output points.csv")
+    batchParser.add_argument("--binary", action="store_true", help="output circles.bin, a binary file of the circles")
+    batchParser.add_argument("--binary-points", action="store_true",
+                             help="also output the points on each circle in circles.bin")
+    batchParser.add_argument("--points", type=int, default=16, help="number of points on circle (default: %(default)s)")
+    batchParser.add_argument("--workers", type=int, default=cpu_count() or 1,
+                             help="number of processes used to solve polygons (default: %(default)s)")
+    batchParser.add_argument("--engine", choices=list(ENGINES), default="polylabel",
+                             help="solver used to calculate the circles (default: %(default)s)")
+    batchParser.add_argument("--time-limit", type=float,
+                             help="seconds to spend on each polygon before using the best circle found so far "
+                                  "(default: no limit)")
+    batchParser.add_argument("--max-probes", type=int,
+                             help="maximum number of points tried for each polygon before using the best circle found so far")
+    batchParser.add_argument("--simplify", type=float, default=0,
+                             help="simplify polygons to within this distance before solving, each diameter is then "
+                                  "within twice this of the exact one (default: %(default)s, no simplification)")
+    batchParser.add_argument("--precision-policy", choices=list(PRECISION_POLICIES), default="absolute",
+                             help="how the precision of each circle is decided (default: %(default)s)")
+    batchParser.add_argument("--precision", type=float,
+                             help="the precision for the absolute policy, the fraction of the bounding box or radius for "
+                                  "the bbox and inradius policies or the decimal places for the output policy "
+                                  "(default: " + ", ".join(f"{value:g} for {policy}" for policy, value in PRECISION_POLICIES.items()) + ")")
+    batchParser.add_argument("--cache", help=f"result cache file (default: {defaultCachePath()})")
+    batchParser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_ENTRIES,
+                             help="maximum number of circles kept in the result cache, the least recently used are "
+                                  "removed first (default: %(default)s)")
+    batchParser.add_argument("--no-cache", action="store_true", help="calculate every circle without using the result cache")
+    batchParser.add_argument("--clear-cache", action="store_true", help="empty the result cache before loading")
+    batchParser.add_argument("--stream", action="store_true",
+                             help="write each circle as soon as it is calculated instead of reading every file first, "
+                                  "for input files too large to fit in memory")
+    batchParser.add_argument("--unknown", choices=["auto", "skip"], default="auto",
+                             help="how to handle files that aren't in a recognised format (default: %(default)s)")
+    batchParser.add_argument("--columns", help="X,Y,Z[,ID] column numbers to use for files that aren't in a recognised format")
+    batchParser.add_argument("--separator", default=",", help="delimiter used with --columns (default: %(default)s)")
+    batchParser.add_argument("--report", help="write the time taken by each stage and the solver's statistics for "
+                                              "each polygon to this file as JSON lines")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "batch":
+        if not (args.dxf or args.circles or args.points_csv or args.binary):
+            parser.error("at least one of --dxf, --circles, --points-csv or --binary is required")
+        if args.binary_points and not args.binary:
+            parser.error("--binary-points requires --binary")
+        if args.points < 3:
+            parser.error("--points should be greater than 2")
+        if args.cache_size < 1:
+            parser.error("--cache-size should be greater than 0")
+        if args.simplify < 0:
+            parser.error("--simplify should not be negative")
+        if args.precision is None:
+            args.precision = PRECISION_POLICIES[args.precision_policy]
+        if args.precision <= 0 and args.precision_policy != "output":
+            parser.error("--precision should be greater than 0")
+        if args.dxf and not set(args.dxf_items.split(",")) <= set(DXF_ITEMS):
+            parser.error(f"--dxf-items contains an unknown item: {args.dxf_items}")
+        return batch(args)
+
+    # Only imported here so batch mode works without tkinter
+    from gui import Gui
     Gui().mainloop()
+    return 0
+
+
+if __name__ == '__main__':
+    # Needed for the solver processes when built with pyinstaller
+    freeze_support()
+    exit(main())
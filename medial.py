@@ -0,0 +1,314 @@
+# Maximum inscribed circle found by polylabel's cell search, refined towards a vertex of the polygon's medial axis.
+#
+# The centre of the maximum inscribed circle is usually a vertex of the medial axis: a point the same
+# distance from three of the polygon's sides and/or vertices. The same cell search as polylabel,
+# stopped at a coarse precision, finds the regions that could hold it, then the equations for a
+# circle touching each combination of three of the few nearest sides or vertices are solved. A circle
+# found this way has its centre and radius to floating point rather than to within the search precision.
+# This is not a medial axis or Voronoi diagram of the whole polygon: where many sides are almost the same
+# distance away, as along finely digitised curves, the sides the circle touches are often not among those
+# tried, and the result is only as good as the search, within the precision of the largest circle.
+
+from math import sqrt
+from heapq import heappush, heappop, heapify
+from itertools import combinations
+from time import perf_counter
+
+from polylabel import _make_evaluator, _get_centroid_cell, _cover, SQRT2, Status
+
+# Increased whenever a change could alter the results, so previously cached results aren't used
+VERSION = 1
+# The coarse search stops at this fraction of the polygon's size if that is coarser than the precision asked for
+LOCATE_FRACTION = 1e-3
+# Maximum number of separate regions refined, and sides/vertices considered near each one
+MAX_SEEDS = 8
+MAX_SITES = 6
+
+
+def _site(x, y, a, b):
+    # Nearest part of the edge a-b to the point, either ("line", ax, ay, nx, ny) with the
+    # unit normal pointing towards the point, or ("point", vx, vy) for one of the ends
+    dx = b[0] - a[0]
+    dy = b[1] - a[1]
+    len_sq = dx * dx + dy * dy
+    t = 0.0
+    if len_sq != 0:
+        t = ((x - a[0]) * dx + (y - a[1]) * dy) / len_sq
+    if t <= 0:
+        return ("point", a[0], a[1])
+    if t >= 1:
+        return ("point", b[0], b[1])
+
+    length = sqrt(len_sq)
+    nx = -dy / length
+    ny = dx / length
+    if nx * (x - a[0]) + ny * (y - a[1]) < 0:
+        nx = -nx
+        ny = -ny
+    return ("line", a[0], a[1], nx, ny, dx, dy, len_sq)
+
+
+def _site_dist(site, x, y):
+    if site[0] == "line":
+        return site[3] * (x - site[1]) + site[4] * (y - site[2])
+    ex = x - site[1]
+    ey = y - site[2]
+    return sqrt(ex * ex + ey * ey)
+
+
+def _near_sites(polygon, x, y, reach):
+    # Sides and vertices within reach of the point, nearest first
+    sites = []
+    b = polygon[-1]
+    for a in polygon:
+        site = _site(x, y, a, b)
+        dist = abs(_site_dist(site, x, y))
+        if dist <= reach and site not in (s for _, s in sites):
+            sites.append((dist, site))
+        b = a
+    sites.sort()
+    return [site for _, site in sites[:MAX_SITES]]
+
+
+def _det3(m):
+    return (m[0][0] * (m[1][1] * m[2][2] - m[1][2] * m[2][1]) -
+            m[0][1] * (m[1][0] * m[2][2] - m[1][2] * m[2][0]) +
+            m[0][2] * (m[1][0] * m[2][1] - m[1][1] * m[2][0]))
+
+
+def _solve_tangent(sites, x, y, r):
+    # Newton's method for the circle (x, y, r) touching all three sites, exact in one step
+    # for three sides. Returns None if it doesn't converge.
+    scale = max(abs(r), abs(x), abs(y), 1.0)
+    for _ in range(50):
+        jacobian = []
+        residuals = []
+        for site in sites:
+            if site[0] == "line":
+                jacobian.append((site[3], site[4], -1.0))
+                residuals.append(_site_dist(site, x, y) - r)
+            else:
+                ex = x - site[1]
+                ey = y - site[2]
+                dist = sqrt(ex * ex + ey * ey)
+                if dist == 0:
+                    return None
+                jacobian.append((ex / dist, ey / dist, -1.0))
+                residuals.append(dist - r)
+
+        if max(abs(residual) for residual in residuals) <= 1e-14 * scale:
+            return x, y, r
+
+        # Cramer's rule for J * step = -residuals
+        det = _det3(jacobian)
+        if abs(det) < 1e-12:
+            return None
+        step = []
+        for column in range(3):
+            replaced = [[-residuals[row] if c == column else jacobian[row][c] for c in range(3)] for row in range(3)]
+            step.append(_det3(replaced) / det)
+        x += step[0]
+        y += step[1]
+        r += step[2]
+
+        # Stop once the steps are down to rounding error
+        if max(abs(value) for value in step) <= 1e-15 * scale:
+            return x, y, r
+    return None
+
+
+def _refine(polygon, evaluator, seed_x, seed_y, seed_d, reach):
+    # Best medial axis vertex within reach of the seed touching three of its nearest sites, or None
+    sites = _near_sites(polygon, seed_x, seed_y, seed_d + 2 * reach)
+    best = None
+    for triple in combinations(sites, 3):
+        solution = _solve_tangent(triple, seed_x, seed_y, seed_d)
+        if solution is None:
+            continue
+        x, y, r = solution
+        if r <= 0 or abs(x - seed_x) > reach or abs(y - seed_y) > reach:
+            continue
+        # Touching the line of a side only counts if it touches the side itself
+        if any(site[0] == "line" and not 0 <= ((x - site[1]) * site[5] + (y - site[2]) * site[6]) / site[7] <= 1
+               for site in triple):
+            continue
+        # Nothing else in the polygon may be closer
+        d = evaluator.distance(x, y)
+        if d <= 0 or abs(d - r) > 1e-9 * max(r, 1.0):
+            continue
+        if best is None or d > best[2]:
+            best = (x, y, d)
+    return best
+
+
+def _search(evaluator, cell_queue, order, best, precision, candidates, probes_left, deadline):
+    # Splits cells from the queue until none can beat best by more than precision,
+    # keeping the cells left over that could still hold a better point in candidates.
+    # Cells are (-max, order, x, y, h, d) as in polylabel, best is (x, y, d, h).
+    # Stops early leaving cells in the queue before splitting a cell would take more than probes_left probes,
+    # or at deadline
+    # Returns the order of the next cell, the new best, the number of probes, the most cells in the queue
+    # and the number of times best improved
+    num_of_probes = 0
+    peak_queue = len(cell_queue)
+    improvements = 0
+    while cell_queue:
+        if probes_left is not None and num_of_probes + 4 > probes_left:
+            break
+        if deadline is not None and not num_of_probes & 255 and perf_counter() > deadline:
+            break
+        cell = heappop(cell_queue)
+        neg_max, _, x, y, h, d = cell
+        if d > best[2]:
+            best = (x, y, d, h)
+            improvements += 1
+
+        if -neg_max - best[2] <= precision:
+            if -neg_max > best[2] and d > 0:
+                candidates.append(cell)
+            continue
+
+        h /= 2
+        xs = [x - h, x + h, x - h, x + h]
+        ys = [y - h, y - h, y + h, y + h]
+        for x, y, d in zip(xs, ys, evaluator.distances(xs, ys)):
+            heappush(cell_queue, (-(d + h * SQRT2), order, x, y, h, d))
+            order += 1
+        num_of_probes += 4
+        if len(cell_queue) > peak_queue:
+            peak_queue = len(cell_queue)
+    return order, best, num_of_probes, peak_queue, improvements
+
+
+def _best_measured(best, cells):
+    # Best of best and the cells left in the queue when a search stops early, which have been measured
+    # but not compared with best
+    for _, _, x, y, h, d in cells:
+        if d > best[2]:
+            best = (x, y, d, h)
+    return best
+
+
+def _refine_candidates(polygon, evaluator, best, candidates, locate_precision):
+    # Refines the best cell and the best of the candidates in separate places,
+    # searching for a medial axis vertex anywhere in or near each cell. Returns the new best
+    best_x, best_y, best_d, best_h = best
+    seeds = [(best_x, best_y, best_d, best_d + best_h * SQRT2, 2 * (best_h * SQRT2 + locate_precision))]
+    for neg_max, _, x, y, h, d in sorted(candidates):
+        if len(seeds) >= MAX_SEEDS:
+            break
+        if -neg_max < best_d:
+            continue
+        if all(abs(x - seed[0]) > seed[4] or abs(y - seed[1]) > seed[4] for seed in seeds):
+            seeds.append((x, y, d, -neg_max, 2 * (h * SQRT2 + locate_precision)))
+
+    for seed_x, seed_y, seed_d, cell_max, reach in seeds:
+        # Skip places that can't beat a medial axis vertex already found
+        if cell_max <= best_d:
+            continue
+        refined = _refine(polygon, evaluator, seed_x, seed_y, seed_d, reach)
+        if refined is not None and refined[2] >= best_d:
+            best_x, best_y, best_d = refined
+            best_h = 0.0
+    return (best_x, best_y, best_d, best_h)
+
+
+def medial_axis_circle(polygon, precision=1.0, debug=False, with_distance=False,
+                       max_probes=None, max_time=None, with_status=False, relative_precision=0.0):
+    # Same arguments and results as polylabel. The regions to refine are located to a coarse precision,
+    # if no medial axis vertex is found that is within precision of the best possible the search continues
+    # to precision as polylabel would and refines again
+    start_time = perf_counter()
+    if hasattr(polygon, "tolist"):
+        # Every side is looked at one by one, which is quicker with lists than a NumPy array
+        polygon = polygon.tolist()
+    min_x = min(p[0] for p in polygon)
+    min_y = min(p[1] for p in polygon)
+    max_x = max(p[0] for p in polygon)
+    max_y = max(p[1] for p in polygon)
+
+    width = max_x - min_x
+    height = max_y - min_y
+    cell_size = min(width, height)
+    h = cell_size / 2.0
+
+    if cell_size == 0:
+        if with_status:
+            return [min_x, min_y], None, Status(None, False, 0, 0, 0, perf_counter() - start_time, precision)
+        if with_distance:
+            return [min_x, min_y], None
+        else:
+            return [min_x, min_y]
+
+    deadline = None
+    if max_time is not None:
+        deadline = perf_counter() + max_time
+
+    evaluator = _make_evaluator(polygon)
+    locate_precision = max(precision, LOCATE_FRACTION * cell_size)
+
+    cell_queue = []
+    order, grid_stopped = _cover(evaluator, min_x, min_y, max_x, max_y, cell_size, cell_queue, max_probes, deadline)
+    num_of_probes = order
+
+    best_cell = _get_centroid_cell(polygon, evaluator)
+    best = (best_cell.x, best_cell.y, best_cell.d, 0.0)
+    bbox_d = evaluator.distance(min_x + width / 2, min_y + height / 2)
+    if bbox_d > best[2]:
+        best = (min_x + width / 2, min_y + height / 2, bbox_d, 0.0)
+
+    candidates = []
+    probes_left = None if max_probes is None else max_probes - num_of_probes
+    order, best, probes, peak_queue, improvements = _search(evaluator, cell_queue, order, best, locate_precision,
+                                                            candidates, probes_left, deadline)
+    num_of_probes += probes
+    # Cells left if stopped early are refined as well
+    measured = _best_measured(best, cell_queue)
+    improvements += measured != best
+    best = measured
+    candidates += cell_queue
+    refined = _refine_candidates(polygon, evaluator, best, candidates, locate_precision)
+    improvements += refined != best
+    best = refined
+    # The best distance is now within locate_precision of the largest, so the relative precision can be fixed now
+    precision = max(precision, relative_precision * best[2])
+
+    # Any cell that could still beat the result by more than precision is searched further
+    cell_queue = [cell for cell in candidates if -cell[0] - best[2] > precision]
+    # Cells of the grid left unmeasured at the probe or time limit can't be refined
+    stopped_early = grid_stopped
+    if cell_queue:
+        heapify(cell_queue)
+        candidates = []
+        probes_left = None if max_probes is None else max_probes - num_of_probes
+        order, best, probes, peak, more = _search(evaluator, cell_queue, order, best, precision, candidates,
+                                                  probes_left, deadline)
+        num_of_probes += probes
+        peak_queue = max(peak_queue, peak)
+        improvements += more
+        stopped_early = grid_stopped or bool(cell_queue)
+        measured = _best_measured(best, cell_queue)
+        improvements += measured != best
+        best = measured
+        candidates += cell_queue
+        refined = _refine_candidates(polygon, evaluator, best, candidates, precision)
+        improvements += refined != best
+        best = refined
+
+    best_x, best_y, best_d, _ = best
+    gap = max([-cell[0] - best_d for cell in candidates] + [0.0])
+    if grid_stopped:
+        # No circle can be larger than one fitting across the bounding box, which bounds the unmeasured cells
+        gap = max(gap, h - best_d)
+    if debug:
+        print('num probes: {}'.format(num_of_probes))
+        print('best distance: {}'.format(best_d))
+        if stopped_early:
+            print('stopped early, gap: {}'.format(gap))
+    if with_status:
+        return [best_x, best_y], best_d, Status(gap, stopped_early, num_of_probes, peak_queue, improvements,
+                                                perf_counter() - start_time, precision)
+    if with_distance:
+        return [best_x, best_y], best_d
+    else:
+        return [best_x, best_y]
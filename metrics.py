@@ -0,0 +1,187 @@
+# Time taken by each stage of reading, solving, drawing and saving polygons, and the solver's statistics
+# for each polygon, so the slow files and polygons of a run can be found without a profiler.
+#
+# A report is written as JSON lines, one record per line, each with a "type" of:
+#   "stage"    a stage being run once, with the "stage" (one of STAGES), the "file" it was run for (null if
+#              it was run for every file at once) and the wall time it took in "seconds"
+#   "note"     something worth knowing about how a "file" was read, such as the columns Auto chose, in "message"
+#   "polygon"  a polygon's circle being calculated, with the "file" and number in the file (from 1) of the
+#              "polygon", its "vertices" and from the solver's polylabel.Status the number of "probes", the
+#              "peakQueue" length, the number of "improvements" of the best circle found, the "gap" the
+#              radius could still be out by, whether it "stoppedEarly" and the "seconds" it took, with the
+#              "precisionPolicy" and "precisionValue" it was calculated with and the "precision" they gave, and
+#              with a simplify tolerance the number of vertices "removed" and the diameter's "errorBound" (both
+#              null if it wasn't simplified).
+#              Circles found in the result cache aren't calculated, so their polygons have no record
+#   "summary"  the last record, with the numbers of "files", "polygons" calculated, "probes" and polygons
+#              that "stoppedEarly", the [policy, value] of each of the "precisionPolicies" used and the total
+#              "seconds" of each stage
+# Solving runs in several processes at once, so the seconds of the polygons add up to more than the
+# wall time of the solve stage.
+# Only running totals of the polygons are kept for the summary, their records can be kept in memory, in a
+# temporary file for long runs, or not at all when no report is wanted.
+
+import json
+from bisect import bisect_right
+from contextlib import contextmanager
+from heapq import heappush, heappushpop
+from itertools import accumulate
+from os import path
+from tempfile import TemporaryFile
+from time import perf_counter
+
+STAGES = ["parse", "solve", "draw", "save"]
+# Number of the slowest polygons listed in the summary
+SLOWEST_POLYGONS = 5
+# Where RunMetrics keeps the polygon records, in a list, in a temporary file, or only in the totals
+POLYGON_RECORDS = ["memory", "file", None]
+
+
+class RunMetrics:
+    def __init__(self, polygonRecords="memory"):
+        # polygonRecords is one of POLYGON_RECORDS
+        # (stage, file name or None for every file, seconds) of each time a stage was run
+        self.stages = []
+        # (file name, number of polygons) of each file parsed in turn. Polygons are numbered from 0 across
+        # all of the files in this order
+        self.files = []
+        # (file name, message) of each note about how a file was read
+        self.notes = []
+        # Polygon records as JSON lines with their "file" as its index in files, as the polygons of the file
+        # being parsed can be calculated before it is added
+        self.polygonRecords = polygonRecords
+        self.polygonLines = TemporaryFile("w+") if polygonRecords == "file" else []
+        # Totals of every polygon calculated, the seconds of each file's polygons by index in files,
+        # and each different (precision policy, value) used
+        self.numCalculated = 0
+        self.probes = 0
+        self.stoppedEarly = 0
+        self.fileSeconds = {}
+        self.policies = {}
+        # Heap of (seconds, minus the number of the polygon, record) of the slowest polygons, the first
+        # polygon is kept of those as slow
+        self.slowest = []
+
+    @contextmanager
+    def timed(self, stage, fileName=None):
+        # Adds the time taken by the with block as a run of stage for fileName
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.addStage(stage, fileName, perf_counter() - start)
+
+    def addStage(self, stage, fileName, seconds):
+        self.stages.append((stage, fileName, seconds))
+
+    def addFile(self, fileName, numPolygons):
+        # Called once each file is parsed, the next numPolygons polygons are from it
+        self.files.append((fileName, numPolygons))
+
+    def addNotes(self, fileName, messages):
+        # Called once each file is parsed with the notes about how it was read
+        self.notes += [(fileName, message) for message in messages]
+
+    def numPolygons(self):
+        # Number of polygons in all the files parsed so far, the number of the next file's first polygon
+        return sum(count for _, count in self.files)
+
+    def addStatuses(self, polygons, statuses, firstPolygon, precisionPolicy, precisionValue):
+        # Adds the statuses as returned by calculateCircles for the PolygonBatch polygons, which start
+        # with polygon number firstPolygon, calculated with the precision policy and value given
+        starts = list(accumulate([0] + [count for _, count in self.files]))
+        self.policies[(precisionPolicy, precisionValue)] = None
+        for i, status in sorted(statuses.items()):
+            number = firstPolygon + i
+            # Polygons after the last file added are from the next file, still being parsed
+            index = bisect_right(starts, number) - 1
+            removed = polygons.removed[i] if polygons.removed[i] >= 0 else None
+            record = {"type": "polygon", "file": index, "polygon": number - starts[index] + 1,
+                      "vertices": polygons.vertexCount(i), "probes": status.probes, "peakQueue": status.peak_queue,
+                      "improvements": status.improvements, "gap": status.gap, "stoppedEarly": status.stopped_early,
+                      "seconds": status.elapsed, "precisionPolicy": precisionPolicy, "precisionValue": precisionValue,
+                      "precision": status.precision, "removed": removed,
+                      "errorBound": polygons.errorBounds[i] if removed is not None else None}
+
+            self.numCalculated += 1
+            self.probes += status.probes
+            self.stoppedEarly += status.stopped_early
+            self.fileSeconds[index] = self.fileSeconds.get(index, 0.0) + status.elapsed
+            if len(self.slowest) < SLOWEST_POLYGONS:
+                heappush(self.slowest, (status.elapsed, -number, record))
+            else:
+                heappushpop(self.slowest, (status.elapsed, -number, record))
+
+            if self.polygonRecords == "file":
+                self.polygonLines.write(json.dumps(record) + "\n")
+            elif self.polygonRecords == "memory":
+                self.polygonLines.append(json.dumps(record))
+
+    def precisionPolicies(self):
+        # List of each different (precision policy, value) the polygons were calculated with
+        return list(self.policies)
+
+    def seconds(self, stage, fileName=None):
+        # Total seconds of stage, for one file or None for all of its runs
+        return sum(seconds for runStage, runFile, seconds in self.stages
+                   if runStage == stage and (fileName is None or runFile == fileName))
+
+    def _fileName(self, index):
+        # Name of the file at index in files, None for a file still being parsed
+        return self.files[index][0] if index < len(self.files) else None
+
+    def _polygonRecords(self):
+        lines = self.polygonLines
+        if self.polygonRecords == "file":
+            lines.seek(0)
+        for line in lines:
+            record = json.loads(line)
+            record["file"] = self._fileName(record["file"])
+            yield record
+        if self.polygonRecords == "file":
+            lines.seek(0, 2)
+
+    def records(self):
+        # Yields the records of the report as dicts
+        for stage, fileName, seconds in self.stages:
+            yield {"type": "stage", "stage": stage, "file": fileName, "seconds": seconds}
+        for fileName, message in self.notes:
+            yield {"type": "note", "file": fileName, "message": message}
+        yield from self._polygonRecords()
+        yield {"type": "summary", "files": len(self.files), "polygons": self.numCalculated, "probes": self.probes,
+               "stoppedEarly": self.stoppedEarly,
+               "precisionPolicies": [list(policy) for policy in self.precisionPolicies()],
+               "seconds": {stage: self.seconds(stage) for stage in STAGES}}
+
+    def write(self, f):
+        # Writes the report to the text file f as JSON lines
+        for record in self.records():
+            f.write(json.dumps(record) + "\n")
+
+    def summary(self):
+        # The report as text to show to the user
+        lines = ["Total: " + ", ".join(f"{stage} {self.seconds(stage):.2f}s" for stage in STAGES)]
+
+        # Solving time of each file is the total of its polygons, as files are solved together
+        fileSeconds = {}
+        for index, (fileName, _) in enumerate(self.files):
+            fileSeconds[fileName] = fileSeconds.get(fileName, 0.0) + self.fileSeconds.get(index, 0.0)
+        for fileName, solve in fileSeconds.items():
+            lines.append(f"{path.basename(fileName)}: parse {self.seconds('parse', fileName):.2f}s, "
+                         f"solve {solve:.2f}s, draw {self.seconds('draw', fileName):.2f}s, "
+                         f"save {self.seconds('save', fileName):.2f}s")
+        lines += [message for _, message in self.notes]
+
+        lines.append(f"{self.numCalculated} polygons calculated with {self.probes} probes, "
+                     f"{self.stoppedEarly} stopped early")
+        if self.numCalculated:
+            lines.append("Precision: " + ", ".join(f"{policy} {value:g}" for policy, value in self.precisionPolicies()))
+            lines.append("Slowest polygons:")
+        for _, _, record in sorted(self.slowest, key=lambda slow: slow[:2], reverse=True):
+            gap = "none" if record["gap"] is None else f"{record['gap']:.4f}"
+            fileName = self._fileName(record["file"])
+            fileName = path.basename(fileName) if fileName is not None else "?"
+            lines.append(f"  {fileName} polygon {record['polygon']}: {record['seconds']:.3f}s, "
+                         f"{record['vertices']} vertices, {record['probes']} probes, "
+                         f"peak queue {record['peakQueue']}, gap {gap}")
+        return "\n".join(lines)
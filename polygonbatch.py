@@ -0,0 +1,222 @@
+# Polygons and their circles stored in a few flat arrays instead of a list for every point.
+#
+# The x,y co-ordinates of every point are stored one after another in coords and the elevation of
+# every point in elevations, polygon i is the points from offsets[i] up to offsets[i+1]. The circle
+# calculated for each polygon is stored the same way with one entry per polygon: centres holds its
+# x,y,z, radii its radius (nan until a circle is found) and, for simplified polygons, removed and
+# errorBounds the number of vertices removed and the diameter error bound (-1 and nan otherwise).
+
+from array import array
+from math import floor, isnan, nan
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class PolygonBatch:
+    def __init__(self):
+        self.coords = array("d")
+        self.elevations = array("d")
+        self.offsets = array("q", [0])
+        self.centres = array("d")
+        self.radii = array("d")
+        self.removed = array("q")
+        self.errorBounds = array("d")
+
+    @classmethod
+    def fromArrays(cls, xs, ys, zs, counts):
+        # Batch of len(counts) polygons from NumPy arrays of the x, y and z of all of their points,
+        # the first counts[0] points are the first polygon and so on
+        batch = cls()
+        xy = np.empty(2 * len(xs))
+        xy[0::2] = xs
+        xy[1::2] = ys
+        batch.coords.frombytes(xy.tobytes())
+        batch.elevations.frombytes(np.asarray(zs, dtype=np.float64).tobytes())
+        batch.offsets.frombytes(np.cumsum(counts, dtype=np.int64).tobytes())
+        batch._addCircles(len(counts))
+        return batch
+
+    @classmethod
+    def concatenate(cls, batches):
+        # One batch of the polygons and circles of every batch in the iterable batches
+        batch = cls()
+        for other in batches:
+            batch.extend(other)
+        return batch
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def _addCircles(self, count):
+        self.centres.extend(array("d", [nan]) * (3 * count))
+        self.radii.extend(array("d", [nan]) * count)
+        self.removed.extend(array("q", [-1]) * count)
+        self.errorBounds.extend(array("d", [nan]) * count)
+
+    def addPoint(self, x, y, z):
+        # Adds a point to the polygon being read, finished by endPolygon
+        self.coords.append(x)
+        self.coords.append(y)
+        self.elevations.append(z)
+
+    def endPolygon(self, minPoints=1):
+        # Finishes the polygon of the points added since it was last called, a polygon with fewer than
+        # minPoints points is dropped instead. Returns True if a polygon was added
+        start = self.offsets[-1]
+        count = len(self.elevations) - start
+        if count < minPoints:
+            del self.coords[2 * start:]
+            del self.elevations[start:]
+            return False
+        if count == 0:
+            return False
+        self.offsets.append(len(self.elevations))
+        self._addCircles(1)
+        return True
+
+    def extend(self, other):
+        # Adds the polygons and circles of the batch other
+        base = len(self.elevations)
+        self.coords.extend(other.coords)
+        self.elevations.extend(other.elevations)
+        self.offsets.extend(offset + base for offset in other.offsets[1:])
+        self.centres.extend(other.centres)
+        self.radii.extend(other.radii)
+        self.removed.extend(other.removed)
+        self.errorBounds.extend(other.errorBounds)
+
+    def select(self, indices):
+        # New batch of the polygons and circles at indices, in that order
+        batch = PolygonBatch()
+        for i in indices:
+            start = self.offsets[i]
+            end = self.offsets[i + 1]
+            batch.coords.extend(self.coords[2 * start:2 * end])
+            batch.elevations.extend(self.elevations[start:end])
+            batch.offsets.append(len(batch.elevations))
+            batch.centres.extend(self.centres[3 * i:3 * i + 3])
+            batch.radii.append(self.radii[i])
+            batch.removed.append(self.removed[i])
+            batch.errorBounds.append(self.errorBounds[i])
+        return batch
+
+    def vertexCount(self, i):
+        return self.offsets[i + 1] - self.offsets[i]
+
+    def totalVertices(self):
+        return len(self.elevations)
+
+    def arrays(self, i):
+        # Copies of the coords and elevations of polygon i as array("d")
+        start = self.offsets[i]
+        end = self.offsets[i + 1]
+        return self.coords[2 * start:2 * end], self.elevations[start:end]
+
+    def points(self, i):
+        # The x,y of each point of polygon i as the solvers take them, an n by 2 NumPy array if
+        # NumPy is installed, otherwise a list of (x, y)
+        coords = self.arrays(i)[0]
+        if np is not None:
+            # The array owns the copy of coords, so this batch can still be extended
+            return np.frombuffer(coords).reshape(-1, 2)
+        return list(zip(coords[0::2], coords[1::2]))
+
+    def polygon(self, i):
+        # Polygon i formatted as [[[x,y],...],[z,...]]
+        coords, elevations = self.arrays(i)
+        return [[[x, y] for x, y in zip(coords[0::2], coords[1::2])], elevations.tolist()]
+
+    def meanElevation(self, i):
+        elevations = self.arrays(i)[1]
+        return sum(elevations) / len(elevations)
+
+    def bounds(self):
+        # (xMin, yMin, xMax, yMax) of every point
+        xs = self.coords[0::2]
+        ys = self.coords[1::2]
+        return (min(xs), min(ys), max(xs), max(ys))
+
+    def boxes(self):
+        # List of the (xMin, yMin, xMax, yMax) of each polygon
+        if np is not None and len(self):
+            coords = np.frombuffer(self.coords).reshape(-1, 2)
+            starts = np.frombuffer(self.offsets, dtype=np.int64)[:-1]
+            mins = np.minimum.reduceat(coords, starts)
+            maxs = np.maximum.reduceat(coords, starts)
+            return list(zip(*np.hstack((mins, maxs)).T.tolist()))
+        return [(min(self.coords[2*start:2*end:2]), min(self.coords[2*start+1:2*end:2]),
+                 max(self.coords[2*start:2*end:2]), max(self.coords[2*start+1:2*end:2]))
+                for start, end in zip(self.offsets, self.offsets[1:])]
+
+    def scaled(self, xMin, yMin, xScale, yScale, xOffset, yOffset, decimate=False):
+        # Yields the points of each polygon as a flat list of x,y moved and scaled to
+        # ((x-xMin)*xScale + xOffset, (y-yMin)*yScale + yOffset), e.g. for drawing
+        # With decimate points in the same whole unit square as the point before are left out, so there is
+        # about one point per pixel when drawn, keeping at least 3 points in each polygon
+        if np is not None and len(self.coords):
+            coords = np.frombuffer(self.coords).reshape(-1, 2)
+            scaledCoords = (coords - (xMin, yMin)) * (xScale, yScale) + (xOffset, yOffset)
+            del coords
+            offsets = np.frombuffer(self.offsets, dtype=np.int64)
+            keptCoords = scaledCoords
+            keptOffsets = offsets
+            if decimate:
+                pixels = np.floor(scaledCoords)
+                keep = np.empty(len(pixels), dtype=bool)
+                keep[1:] = (pixels[1:] != pixels[:-1]).any(axis=1)
+                keep[offsets[:-1]] = True
+                keptCoords = scaledCoords[keep]
+                keptOffsets = np.concatenate(([0], np.cumsum(keep)))[offsets]
+            keptOffsets = keptOffsets.tolist()
+            offsets = offsets.tolist()
+            for i in range(len(self)):
+                if keptOffsets[i + 1] - keptOffsets[i] >= 3:
+                    yield keptCoords[keptOffsets[i]:keptOffsets[i + 1]].ravel().tolist()
+                else:
+                    yield scaledCoords[offsets[i]:min(offsets[i + 1], offsets[i] + 3)].ravel().tolist()
+            return
+
+        for start, end in zip(self.offsets, self.offsets[1:]):
+            scaledCoords = []
+            keptCoords = []
+            lastPixel = None
+            for j in range(2 * start, 2 * end, 2):
+                x = (self.coords[j]-xMin)*xScale + xOffset
+                y = (self.coords[j+1]-yMin)*yScale + yOffset
+                scaledCoords += (x, y)
+                pixel = (floor(x), floor(y))
+                if not decimate or pixel != lastPixel:
+                    keptCoords += (x, y)
+                lastPixel = pixel
+            yield keptCoords if len(keptCoords) >= 6 else scaledCoords[:6]
+
+    def hasCircle(self, i):
+        return not isnan(self.radii[i])
+
+    def solved(self):
+        # Indices of the polygons with circles
+        return [i for i, radius in enumerate(self.radii) if not isnan(radius)]
+
+    def circle(self, i):
+        # The circle of polygon i formatted as [[x,y,z],radius], or [[x,y,z],radius,removed,errorBound]
+        # for a simplified polygon, None if it has no circle
+        if not self.hasCircle(i):
+            return None
+        circle = [self.centres[3 * i:3 * i + 3].tolist(), self.radii[i]]
+        if self.removed[i] >= 0:
+            circle += [self.removed[i], self.errorBounds[i]]
+        return circle
+
+    def setCircle(self, i, circle):
+        # circle is formatted as returned by circle
+        self.centres[3 * i:3 * i + 3] = array("d", circle[0])
+        self.radii[i] = circle[1]
+        if len(circle) > 2:
+            self.removed[i] = circle[2]
+            self.errorBounds[i] = circle[3]
+        else:
+            self.removed[i] = -1
+            self.errorBounds[i] = nan
@@ -19,18 +19,61 @@
 
 
 from math import sqrt
-import time
+from heapq import heappush, heappop
+from collections import namedtuple
+from itertools import islice
+from time import perf_counter
 
 try:
     # Python3
-    from queue import PriorityQueue
     from math import inf
 except ImportError:
     # Python2
-    from Queue import PriorityQueue
-
     inf = float("inf")
 
+SQRT2 = sqrt(2)
+
+# Increased whenever a change could alter the results, so previously cached results aren't used
+VERSION = 1
+
+# Returned with with_status, gap is how much further than best distance the true maximum could be,
+# stopped_early is True if the search ran out of probes or time before reaching the precision,
+# probes is the number of points measured, never more than max_probes as cells are split 4 at a time
+# only while there are probes left for them,
+# peak_queue is the most cells waiting to be split at once, improvements is how many times a better
+# cell was found during the search, elapsed is the seconds taken and precision is the precision the
+# search was finishing to, which grows with the distance found when using relative_precision
+Status = namedtuple("Status", "gap stopped_early probes peak_queue improvements elapsed precision")
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Below this many vertices the overhead of calling into numpy is more than the loop it replaces
+NUMPY_MIN_VERTICES = 16
+# Maximum number of point-edge pairs evaluated in one go by _EdgeTable.distances
+_BATCH_ELEMENTS = 1 << 18
+# From this many vertices a spatial index of the edges is used, so each probe only looks at nearby edges
+INDEX_MIN_VERTICES = 4000 if np is not None else 400
+# Edges in each leaf and nodes in each branch of _EdgeIndex's tree
+_INDEX_LEAF = 8
+_INDEX_FANOUT = 4
+# Most cells of the first grid measured at once between checks of the probe and time limits
+_GRID_CHUNK = 256
+
+
+def _is_array(polygon):
+    # Polygons can also be given as an n by 2 NumPy array, as PolygonBatch.points gives them
+    return np is not None and isinstance(polygon, np.ndarray)
+
+
+def _columns(polygon):
+    # Lists of the x and y of each point
+    if _is_array(polygon):
+        return polygon[:, 0].tolist(), polygon[:, 1].tolist()
+    return [p[0] for p in polygon], [p[1] for p in polygon]
+
 
 def _point_to_polygon_distance(x, y, polygon):
     inside = False
@@ -75,122 +118,454 @@ def _get_seg_dist_sq(px, py, a, b):
     return dx * dx + dy * dy
 
 
+class _EdgeTable(object):
+    # Edges of the polygon precomputed once so each probe is a single vectorised pass,
+    # edge i goes from point i to point i-1 the same as in _point_to_polygon_distance
+    def __init__(self, polygon):
+        points = np.asarray(polygon, dtype=np.float64)[:, :2]
+        previous = np.roll(points, 1, axis=0)
+        self.ax = points[:, 0].copy()
+        self.ay = points[:, 1].copy()
+        self.bx = previous[:, 0].copy()
+        self.by = previous[:, 1].copy()
+        self.dx = self.bx - self.ax
+        self.dy = self.by - self.ay
+
+        # Zero length edges have a zero numerator so t = 0 and the distance is to their start point,
+        # their divisor only needs to be non-zero
+        len_sq = self.dx * self.dx + self.dy * self.dy
+        self.len_sq = np.where(len_sq != 0, len_sq, 1.0)
+        # Horizontal edges never pass the crossing test, so the same goes for their divisor
+        self.dy_safe = np.where(self.dy != 0, self.dy, 1.0)
+
+    def distance(self, x, y):
+        px = x - self.ax
+        py = y - self.ay
+
+        t = (px * self.dx + py * self.dy) / self.len_sq
+        # Same closest point as _get_seg_dist_sq, clamped to the ends of the segment
+        cx = np.where(t > 1, self.bx, np.where(t > 0, self.ax + self.dx * t, self.ax))
+        cy = np.where(t > 1, self.by, np.where(t > 0, self.ay + self.dy * t, self.ay))
+        ex = x - cx
+        ey = y - cy
+        min_dist_sq = (ex * ex + ey * ey).min()
+
+        crossings = ((self.ay > y) != (self.by > y)) & (x < self.dx * py / self.dy_safe + self.ax)
+        result = sqrt(min_dist_sq)
+        if not np.count_nonzero(crossings) & 1:
+            return -result
+        return result
+
+    def distances(self, xs, ys):
+        # Same as distance for many points at once, as a points by edges array
+        xs = np.asarray(xs, dtype=np.float64)[:, None]
+        ys = np.asarray(ys, dtype=np.float64)[:, None]
+        results = np.empty(len(xs))
+
+        # Limit the size of the temporary arrays for large polygons
+        rows = max(1, _BATCH_ELEMENTS // len(self.ax))
+        for start in range(0, len(xs), rows):
+            x = xs[start:start + rows]
+            y = ys[start:start + rows]
+            px = x - self.ax
+            py = y - self.ay
+
+            t = (px * self.dx + py * self.dy) / self.len_sq
+            cx = np.where(t > 1, self.bx, np.where(t > 0, self.ax + self.dx * t, self.ax))
+            cy = np.where(t > 1, self.by, np.where(t > 0, self.ay + self.dy * t, self.ay))
+            ex = x - cx
+            ey = y - cy
+            min_dist = np.sqrt((ex * ex + ey * ey).min(axis=1))
+
+            crossings = ((self.ay > y) != (self.by > y)) & (x < self.dx * py / self.dy_safe + self.ax)
+            inside = np.count_nonzero(crossings, axis=1) & 1
+            results[start:start + rows] = np.where(inside, min_dist, -min_dist)
+        return results.tolist()
+
+
+class _PythonEdges(object):
+    # Fallback with the same interface as _EdgeTable when numpy isn't available
+    def __init__(self, polygon):
+        self.polygon = polygon
+
+    def distance(self, x, y):
+        return _point_to_polygon_distance(x, y, self.polygon)
+
+    def distances(self, xs, ys):
+        polygon = self.polygon
+        return [_point_to_polygon_distance(x, y, polygon) for x, y in zip(xs, ys)]
+
+
+class _EdgeIndex(object):
+    # Spatial index of the polygon's edges built once per polygon, so each probe only looks at nearby edges.
+    # Edges are (ax, ay, bx, by, dx, dy, len_sq) going from point i to point i-1 as in _point_to_polygon_distance.
+    # Distances use a bounding box tree where each leaf is a run of consecutive edges, which are close
+    # together in a polygon, and each node above groups _INDEX_FANOUT nodes of the level below.
+    # The inside test uses the edges crossing the thin horizontal row the point is in, found in a segment tree
+    # over the rows so an edge crossing many rows is only stored a few times.
+    def __init__(self, polygon):
+        xs, ys = _columns(polygon)
+
+        self.edges = []
+        bx = xs[-1]
+        by = ys[-1]
+        for ax, ay in zip(xs, ys):
+            dx = bx - ax
+            dy = by - ay
+            self.edges.append((ax, ay, bx, by, dx, dy, dx * dx + dy * dy))
+            bx = ax
+            by = ay
+
+        # Leaf bounding boxes, then each level above until there are only a few nodes left
+        level = []
+        for start in range(0, len(self.edges), _INDEX_LEAF):
+            run_xs = xs[start:start + _INDEX_LEAF] + [xs[start - 1]]
+            run_ys = ys[start:start + _INDEX_LEAF] + [ys[start - 1]]
+            level.append((min(run_xs), min(run_ys), max(run_xs), max(run_ys)))
+        self.levels = [level]
+        while len(level) > _INDEX_FANOUT:
+            level = []
+            below = self.levels[-1]
+            for start in range(0, len(below), _INDEX_FANOUT):
+                group = below[start:start + _INDEX_FANOUT]
+                level.append((min(box[0] for box in group), min(box[1] for box in group),
+                              max(box[2] for box in group), max(box[3] for box in group)))
+            self.levels.append(level)
+
+        # A row for every few vertices keeps the number of edges in each row close to
+        # the number of times the boundary crosses it
+        self.min_y = min(ys)
+        self.rows = max(1, len(polygon) // 4)
+        self.row_height = (max(ys) - self.min_y) / self.rows or 1.0
+        # Node rows + i is the leaf of row i and node i's children are 2i and 2i+1, each edge is added to the
+        # fewest nodes whose leaves are exactly the rows it crosses, at most two on each level
+        self.row_tree = [[] for _ in range(2 * self.rows)]
+        for edge in self.edges:
+            ay = edge[1]
+            by = edge[3]
+            if ay != by:
+                low = self._row(min(ay, by)) + self.rows
+                high = self._row(max(ay, by)) + self.rows + 1
+                while low < high:
+                    if low & 1:
+                        self.row_tree[low].append(edge)
+                        low += 1
+                    if high & 1:
+                        high -= 1
+                        self.row_tree[high].append(edge)
+                    low >>= 1
+                    high >>= 1
+
+    def _row(self, y):
+        return min(max(int((y - self.min_y) / self.row_height), 0), self.rows - 1)
+
+    def distance(self, x, y):
+        # Even-odd test against the edges crossing this point's row, which are in the nodes from its leaf up
+        # to the root. Every edge with y between its ends is in the row, horizontal edges never cross so are left out
+        inside = False
+        node = self._row(y) + self.rows
+        while node:
+            for ax, ay, bx, by, dx, dy, _ in self.row_tree[node]:
+                if (ay > y) != (by > y) and x < dx * (y - ay) / dy + ax:
+                    inside = not inside
+            node >>= 1
+
+        # Depth first search of the tree, nearest nodes first, skipping any node further than the closest edge so far
+        min_dist_sq = inf
+        top = len(self.levels) - 1
+        stack = [(0.0, top, i) for i in range(len(self.levels[top]))]
+        while stack:
+            node_dist_sq, level, i = stack.pop()
+            if node_dist_sq >= min_dist_sq:
+                continue
+
+            if level == 0:
+                for ax, ay, bx, by, dx, dy, len_sq in self.edges[i * _INDEX_LEAF:(i + 1) * _INDEX_LEAF]:
+                    cx = ax
+                    cy = ay
+                    if len_sq != 0:
+                        t = ((x - ax) * dx + (y - ay) * dy) / len_sq
+                        if t > 1:
+                            cx = bx
+                            cy = by
+                        elif t > 0:
+                            cx += dx * t
+                            cy += dy * t
+                    ex = x - cx
+                    ey = y - cy
+                    dist_sq = ex * ex + ey * ey
+                    if dist_sq < min_dist_sq:
+                        min_dist_sq = dist_sq
+                continue
+
+            children = []
+            below = self.levels[level - 1]
+            for child in range(i * _INDEX_FANOUT, min((i + 1) * _INDEX_FANOUT, len(below))):
+                min_x, min_y, max_x, max_y = below[child]
+                ex = min_x - x if x < min_x else (x - max_x if x > max_x else 0.0)
+                ey = min_y - y if y < min_y else (y - max_y if y > max_y else 0.0)
+                child_dist_sq = ex * ex + ey * ey
+                if child_dist_sq < min_dist_sq:
+                    children.append((child_dist_sq, level - 1, child))
+            # Furthest first so the nearest is taken off the stack next
+            children.sort(reverse=True)
+            stack += children
+
+        result = sqrt(min_dist_sq)
+        if not inside:
+            return -result
+        return result
+
+    def distances(self, xs, ys):
+        return [self.distance(x, y) for x, y in zip(xs, ys)]
+
+
+def _make_evaluator(polygon, use_numpy=None, index_min_vertices=None):
+    # Returns an object giving the signed distances from points to polygon,
+    # use_numpy None picks numpy if it is installed and the polygon is large enough,
+    # polygons with at least index_min_vertices (default INDEX_MIN_VERTICES) use an index instead
+    if index_min_vertices is None:
+        index_min_vertices = INDEX_MIN_VERTICES
+    if len(polygon) >= index_min_vertices:
+        return _EdgeIndex(polygon)
+    if use_numpy is None:
+        use_numpy = np is not None and len(polygon) >= NUMPY_MIN_VERTICES
+    if use_numpy:
+        return _EdgeTable(polygon)
+    if _is_array(polygon):
+        polygon = polygon.tolist()
+    return _PythonEdges(polygon)
+
+
+def _cover(evaluator, min_x, min_y, max_x, max_y, cell_size, cell_queue, max_probes=None, deadline=None):
+    # Covers the bounding box with square cells of cell_size, measuring them and pushing them onto the heap
+    # cell_queue as (-max, order, x, y, h, d) with order counting from 0. A thin polygon can need a great many
+    # cells, so they are measured a chunk at a time, stopping once there have been max_probes or the deadline
+    # has passed, though always measuring at least one cell. Chunks start small and double up to _GRID_CHUNK,
+    # or as many as there is time left for, so polygons that are slow to measure don't run far past the deadline.
+    # Returns the number of cells measured and whether any were left unmeasured
+    h = cell_size / 2.0
+    diagonal = h * SQRT2
+
+    def centres():
+        x = min_x
+        while x < max_x:
+            y = min_y
+            while y < max_y:
+                yield x + h, y + h
+                y += cell_size
+            x += cell_size
+
+    cells = centres()
+    count = 0
+    chunk_size = 1
+    while True:
+        if max_probes is not None:
+            chunk_size = max(min(chunk_size, max_probes - count), 1)
+        chunk = list(islice(cells, chunk_size))
+        if not chunk:
+            return count, False
+        start = perf_counter()
+        xs = [x for x, _ in chunk]
+        ys = [y for _, y in chunk]
+        for x, y, d in zip(xs, ys, evaluator.distances(xs, ys)):
+            heappush(cell_queue, (-(d + diagonal), count, x, y, h, d))
+            count += 1
+        now = perf_counter()
+        if (max_probes is not None and count >= max_probes) or (deadline is not None and now > deadline):
+            return count, next(cells, None) is not None
+
+        chunk_size = min(2 * chunk_size, _GRID_CHUNK)
+        if deadline is not None:
+            chunk_size = min(chunk_size, max(int((deadline - now) * len(chunk) / max(now - start, 1e-9)), 1))
+
+
 class Cell(object):
-    def __init__(self, x, y, h, polygon):
+    # Only used for the best cell, cells waiting in the queue are stored as plain tuples
+    __slots__ = ("x", "y", "h", "d", "max")
+
+    def __init__(self, x, y, h, d):
         self.h = h
         self.y = y
         self.x = x
-        self.d = _point_to_polygon_distance(x, y, polygon)
-        self.max = self.d + self.h * sqrt(2)
-
-    def __lt__(self, other):
-        return self.max < other.max
+        self.d = d
+        self.max = self.d + self.h * SQRT2
 
-    def __lte__(self, other):
-        return self.max <= other.max
 
-    def __gt__(self, other):
-        return self.max > other.max
-
-    def __gte__(self, other):
-        return self.max >= other.max
-
-    def __eq__(self, other):
-        return self.max == other.max
-
-
-def _get_centroid_cell(polygon):
+def _get_centroid_cell(polygon, evaluator):
     area = 0
     x = 0
     y = 0
-    b = polygon[-1]  # prev
-    for a in polygon:
-        f = a[0] * b[1] - b[0] * a[1]
-        x += (a[0] + b[0]) * f
-        y += (a[1] + b[1]) * f
+    xs, ys = _columns(polygon)
+    bx = xs[-1]  # prev
+    by = ys[-1]
+    for ax, ay in zip(xs, ys):
+        f = ax * by - bx * ay
+        x += (ax + bx) * f
+        y += (ay + by) * f
         area += f * 3
-        b = a
+        bx = ax
+        by = ay
     if area == 0:
-        return Cell(polygon[0][0], polygon[0][1], 0, polygon)
-    return Cell(x / area, y / area, 0, polygon)
+        x = xs[0]
+        y = ys[0]
+    else:
+        x /= area
+        y /= area
+    return Cell(x, y, 0, evaluator.distance(x, y))
 
     pass
 
 
-def polylabel(polygon, precision=1.0, debug=False, with_distance=False):
+def polylabel(polygon, precision=1.0, debug=False, with_distance=False, use_numpy=None, batch_size=None,
+              index_min_vertices=None, max_probes=None, max_time=None, with_status=False, relative_precision=0.0):
+    # batch_size is the number of cells taken from the queue to be split at once,
+    # their children are evaluated together which is faster with numpy but may probe
+    # some cells that would have been skipped when taking one at a time.
+    # None picks a size that only batches when the per call overhead outweighs the extra probes.
+    # Polygons with at least index_min_vertices (default INDEX_MIN_VERTICES) points build a spatial
+    # index of their edges once, so each probe only measures the distance to nearby edges.
+    # The search stops early with the best found so far after max_probes probes, which is never exceeded,
+    # or max_time seconds,
+    # with_status also returns a Status after the distance to tell if this happened
+    # With a relative_precision the search finishes to the larger of precision and relative_precision
+    # times the best distance found so far
+    start_time = perf_counter()
+
     # find bounding box
-    first_item = polygon[0]
-    min_x = first_item[0]
-    min_y = first_item[1]
-    max_x = first_item[0]
-    max_y = first_item[1]
-    for p in polygon:
-        if p[0] < min_x:
-            min_x = p[0]
-        if p[1] < min_y:
-            min_y = p[1]
-        if p[0] > max_x:
-            max_x = p[0]
-        if p[1] > max_y:
-            max_y = p[1]
+    if _is_array(polygon):
+        min_x, min_y = polygon.min(axis=0).tolist()
+        max_x, max_y = polygon.max(axis=0).tolist()
+    else:
+        first_item = polygon[0]
+        min_x = first_item[0]
+        min_y = first_item[1]
+        max_x = first_item[0]
+        max_y = first_item[1]
+        for p in polygon:
+            if p[0] < min_x:
+                min_x = p[0]
+            if p[1] < min_y:
+                min_y = p[1]
+            if p[0] > max_x:
+                max_x = p[0]
+            if p[1] > max_y:
+                max_y = p[1]
 
     width = max_x - min_x
     height = max_y - min_y
     cell_size = min(width, height)
     h = cell_size / 2.0
 
-    cell_queue = PriorityQueue()
-
     if cell_size == 0:
+        if with_status:
+            return [min_x, min_y], None, Status(None, False, 0, 0, 0, perf_counter() - start_time, precision)
         if with_distance:
             return [min_x, min_y], None
         else:
             return [min_x, min_y]
 
-    # cover polygon with initial cells
-    x = min_x
-    while x < max_x:
-        y = min_y
-        while y < max_y:
-            c = Cell(x + h, y + h, h, polygon)
-            y += cell_size
-            cell_queue.put((-c.max, time.time(), c))
-        x += cell_size
-
-    best_cell = _get_centroid_cell(polygon)
-
-    bbox_cell = Cell(min_x + width / 2, min_y + height / 2, 0, polygon)
-    if bbox_cell.d > best_cell.d:
-        best_cell = bbox_cell
+    deadline = None
+    if max_time is not None:
+        deadline = perf_counter() + max_time
 
-    num_of_probes = cell_queue.qsize()
-    while not cell_queue.empty():
-        _, __, cell = cell_queue.get()
+    evaluator = _make_evaluator(polygon, use_numpy, index_min_vertices)
+    if batch_size is None:
+        if isinstance(evaluator, _EdgeTable):
+            batch_size = min(4, max(1, 512 // len(polygon)))
+        else:
+            batch_size = 1
 
-        if cell.d > best_cell.d:
-            best_cell = cell
+    # Heap of (-max, order, x, y, h, d), order is a counter so cells with the same max
+    # are always taken in the order they were added and the search is repeatable
+    cell_queue = []
 
-            if debug:
-                print('found best {} after {} probes'.format(
-                    round(1e4 * cell.d) / 1e4, num_of_probes))
+    # cover polygon with initial cells
+    order, stopped_early = _cover(evaluator, min_x, min_y, max_x, max_y, cell_size, cell_queue, max_probes, deadline)
+    # No circle in the polygon can be larger than one fitting across the bounding box, which bounds the cells
+    # left unmeasured if the probe or time limit was reached while covering it
+    grid_max = h if stopped_early else -inf
 
-        if cell.max - best_cell.d <= precision:
-            continue
+    best_cell = _get_centroid_cell(polygon, evaluator)
 
-        h = cell.h / 2
-        c = Cell(cell.x - h, cell.y - h, h, polygon)
-        cell_queue.put((-c.max, time.time(), c))
-        c = Cell(cell.x + h, cell.y - h, h, polygon)
-        cell_queue.put((-c.max, time.time(), c))
-        c = Cell(cell.x - h, cell.y + h, h, polygon)
-        cell_queue.put((-c.max, time.time(), c))
-        c = Cell(cell.x + h, cell.y + h, h, polygon)
-        cell_queue.put((-c.max, time.time(), c))
-        num_of_probes += 4
+    bbox_cell = Cell(min_x + width / 2, min_y + height / 2, 0,
+                     evaluator.distance(min_x + width / 2, min_y + height / 2))
+    if bbox_cell.d > best_cell.d:
+        best_cell = bbox_cell
+    best_d = best_cell.d
+    threshold = max(precision, relative_precision * best_d)
+
+    # Highest max of the cells that weren't split, for the gap
+    skipped_max = grid_max
+    iterations = 0
+    improvements = 0
+    num_of_probes = len(cell_queue)
+    peak_queue = num_of_probes
+    while cell_queue and not stopped_early:
+        # Each cell split is 4 probes, only as many are split as keep within max_probes
+        probes_left = 4 * batch_size
+        if max_probes is not None:
+            probes_left = min(probes_left, (max_probes - num_of_probes) // 4 * 4)
+        if probes_left <= 0:
+            stopped_early = True
+            break
+        # Only check the time every so often to keep the overhead down
+        iterations += 1
+        if deadline is not None and not iterations & 63 and perf_counter() > deadline:
+            stopped_early = True
+            break
+
+        xs = []
+        ys = []
+        hs = []
+        while len(hs) < probes_left and cell_queue:
+            neg_max, _, x, y, h, d = heappop(cell_queue)
+
+            if d > best_d:
+                best_cell = Cell(x, y, h, d)
+                best_d = d
+                improvements += 1
+                threshold = max(precision, relative_precision * best_d)
+
+                if debug:
+                    print('found best {} after {} probes'.format(
+                        round(1e4 * d) / 1e4, num_of_probes))
+
+            if -neg_max - best_d <= threshold:
+                if -neg_max > skipped_max:
+                    skipped_max = -neg_max
+                continue
+
+            h /= 2
+            xs += [x - h, x + h, x - h, x + h]
+            ys += [y - h, y - h, y + h, y + h]
+            hs += [h, h, h, h]
+
+        for x, y, h, d in zip(xs, ys, hs, evaluator.distances(xs, ys)):
+            heappush(cell_queue, (-(d + h * SQRT2), order, x, y, h, d))
+            order += 1
+        num_of_probes += len(hs)
+        if len(cell_queue) > peak_queue:
+            peak_queue = len(cell_queue)
+
+    if stopped_early:
+        # Cells still in the queue have been measured but not compared with the best, one may be better
+        _, _, x, y, h, d = max(cell_queue, key=lambda cell: cell[5])
+        if d > best_d:
+            best_cell = Cell(x, y, h, d)
+            best_d = d
+            improvements += 1
+        skipped_max = max(skipped_max, -cell_queue[0][0])
+    gap = max(skipped_max - best_d, 0.0)
 
     if debug:
         print('num probes: {}'.format(num_of_probes))
         print('best distance: {}'.format(best_cell.d))
+        if stopped_early:
+            print('stopped early, gap: {}'.format(gap))
+    if with_status:
+        return [best_cell.x, best_cell.y], best_cell.d, Status(gap, stopped_early, num_of_probes, peak_queue,
+                                                               improvements, perf_counter() - start_time, threshold)
     if with_distance:
         return [best_cell.x, best_cell.y], best_cell.d
     else:
@@ -0,0 +1,57 @@
+# Douglas-Peucker simplification of polygon rings before solving.
+#
+# Every point removed is within tolerance of the simplified ring and the simplified ring is made
+# of the original points, so the distance from any point to the boundary changes by at most
+# tolerance. The inscribed circle found for the simplified ring therefore has a radius within
+# tolerance, and a diameter within 2 * tolerance, of the original polygon's.
+
+from polylabel import _get_seg_dist_sq
+
+
+def simplify(polygon, tolerance):
+    # Returns the simplified ring as a new list, or polygon itself if nothing can be removed
+    n = len(polygon)
+    if tolerance <= 0 or n <= 3:
+        return polygon
+    # Points given as a NumPy array by PolygonBatch.points are simplified as a list
+    if hasattr(polygon, "tolist"):
+        polygon = polygon.tolist()
+
+    # Split the ring into two chains between the first point and the point furthest from it
+    first = polygon[0]
+    far = max(range(n), key=lambda i: (polygon[i][0] - first[0]) ** 2 + (polygon[i][1] - first[1]) ** 2)
+    if far == 0:
+        return polygon
+
+    keep = [False] * n
+    keep[0] = True
+    keep[far] = True
+    tolerance_sq = tolerance * tolerance
+
+    # Index n is the first point again, closing the ring
+    stack = [(0, far), (far, n)]
+    while stack:
+        start, end = stack.pop()
+        a = polygon[start]
+        b = polygon[end % n]
+        furthest = None
+        furthest_dist_sq = tolerance_sq
+        for i in range(start + 1, end):
+            dist_sq = _get_seg_dist_sq(polygon[i][0], polygon[i][1], a, b)
+            if dist_sq > furthest_dist_sq:
+                furthest = i
+                furthest_dist_sq = dist_sq
+        if furthest is not None:
+            keep[furthest] = True
+            stack.append((start, furthest))
+            stack.append((furthest, end))
+
+    simplified = [point for point, kept in zip(polygon, keep) if kept]
+    if len(simplified) < 3:
+        return polygon
+    return simplified
+
+
+def diameter_error_bound(tolerance):
+    # Most the diameter found for a ring simplified with tolerance can differ from the original
+    return 2 * tolerance
@@ -0,0 +1,62 @@
+# Grid of bounding boxes, so the boxes overlapping an area can be found without checking every box.
+#
+# The area covered by all of the boxes is split into a grid of about one cell per box and each box
+# is listed in every cell it overlaps. A query only checks the boxes listed in the cells it overlaps.
+# Boxes overlapping more than MAX_CELLS cells are instead kept in a list checked by every query, so
+# a few very large boxes don't fill the whole grid.
+
+from math import ceil, sqrt
+
+MAX_CELLS = 64
+
+
+class BoxIndex:
+    def __init__(self, boxes):
+        # boxes is a list of (xMin, yMin, xMax, yMax), queries return indices into it
+        self.boxes = boxes
+        self.cells = {}
+        self.large = []
+        if not boxes:
+            return
+
+        self.xMin = min(box[0] for box in boxes)
+        self.yMin = min(box[1] for box in boxes)
+        xMax = max(box[2] for box in boxes)
+        yMax = max(box[3] for box in boxes)
+        side = ceil(sqrt(len(boxes)))
+        # Cells are never smaller than this, so boxes that are points or lines can still be indexed
+        self.cellWidth = max((xMax - self.xMin) / side, 1e-9)
+        self.cellHeight = max((yMax - self.yMin) / side, 1e-9)
+
+        for i, box in enumerate(boxes):
+            columns, rows = self._cellRange(box)
+            if len(columns) * len(rows) > MAX_CELLS:
+                self.large.append(i)
+                continue
+            for column in columns:
+                for row in rows:
+                    self.cells.setdefault((column, row), []).append(i)
+
+    def _cellRange(self, bounds):
+        # The columns and rows of the cells overlapping bounds
+        return (range(int((bounds[0] - self.xMin) // self.cellWidth), int((bounds[2] - self.xMin) // self.cellWidth) + 1),
+                range(int((bounds[1] - self.yMin) // self.cellHeight), int((bounds[3] - self.yMin) // self.cellHeight) + 1))
+
+    def query(self, bounds):
+        # Sorted indices of the boxes overlapping bounds, (xMin, yMin, xMax, yMax)
+        if not self.boxes:
+            return []
+        columns, rows = self._cellRange(bounds)
+        if len(columns) * len(rows) >= len(self.cells):
+            # Quicker to check every cell that has any boxes than every cell in the area
+            found = set(i for cell in self.cells.values() for i in cell)
+        else:
+            found = set()
+            for column in columns:
+                for row in rows:
+                    found.update(self.cells.get((column, row), ()))
+        found.update(self.large)
+
+        xMin, yMin, xMax, yMax = bounds
+        return sorted(i for i in found if self.boxes[i][0] <= xMax and xMin <= self.boxes[i][2] and
+                                          self.boxes[i][1] <= yMax and yMin <= self.boxes[i][3])
@@ -0,0 +1,34 @@
+# Tests for the batch command
+# Run from the repository folder:
+#   python -m unittest discover tests
+
+from os import listdir, path
+from tempfile import TemporaryDirectory
+import subprocess
+import sys
+import unittest
+
+ROOT = path.dirname(path.dirname(path.abspath(__file__)))
+
+
+class BatchTest(unittest.TestCase):
+    def testWithoutTkinter(self):
+        # Batch mode is run on servers without Tk, so it must not import tkinter. Run in another interpreter
+        # with tkinter blocked, so the modules already imported by the other tests don't count
+        with TemporaryDirectory() as folder:
+            script = ("import sys\n"
+                      "sys.modules['tkinter'] = None\n"
+                      "import main\n"
+                      f"sys.exit(main.main(['batch', 'SimpleFormat-example.csv', '--circles', '--out', {folder!r}, "
+                      "'--no-cache', '--workers', '2']))\n")
+            result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE, universal_newlines=True)
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertNotIn("tkinter", result.stderr)
+            self.assertEqual(listdir(folder), ["circles.csv"])
+            with open(path.join(folder, "circles.csv")) as f:
+                self.assertEqual(len(f.readlines()), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
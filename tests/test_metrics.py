@@ -0,0 +1,59 @@
+# Tests for the run report
+# Run from the repository folder:
+#   python -m unittest discover tests
+
+from io import StringIO
+from os import path
+import json
+import sys
+import unittest
+
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+
+from metrics import RunMetrics, POLYGON_RECORDS
+from polygonbatch import PolygonBatch
+from polylabel import Status
+
+
+def addRun(metrics):
+    # Two chunks of polygons, the second calculated before the file it ends is added
+    polygons = PolygonBatch()
+    for size in range(1, 9):
+        for x, y in [[0, 0], [size, 0], [size, size], [0, size]]:
+            polygons.addPoint(x, y, 0.0)
+        polygons.endPolygon()
+    statuses = {i: Status(0.001, i % 3 == 0, 10 * i, i, 1, i / 100, 0.001) for i in range(len(polygons))}
+    metrics.addFile("a.csv", 3)
+    metrics.addStatuses(polygons.select(range(4)), {i: statuses[i] for i in range(4)}, 0, "absolute", 0.001)
+    metrics.addStatuses(polygons.select(range(4, 8)), {i - 4: statuses[i] for i in range(4, 8)}, 4, "bbox", 0.01)
+    metrics.addFile("b.csv", 5)
+
+
+class RunMetricsTest(unittest.TestCase):
+    def testPolygonRecordsKept(self):
+        reports = {}
+        summaries = set()
+        for polygonRecords in POLYGON_RECORDS:
+            metrics = RunMetrics(polygonRecords)
+            addRun(metrics)
+            f = StringIO()
+            metrics.write(f)
+            reports[polygonRecords] = [json.loads(line) for line in f.getvalue().splitlines()]
+            summaries.add(metrics.summary())
+
+        records = reports["memory"]
+        self.assertEqual(reports["file"], records)
+        self.assertEqual(reports[None], [record for record in records if record["type"] != "polygon"])
+        self.assertEqual(len(summaries), 1)
+
+        polygonRecords = [record for record in records if record["type"] == "polygon"]
+        self.assertEqual([(record["file"], record["polygon"]) for record in polygonRecords],
+                         [("a.csv", 1), ("a.csv", 2), ("a.csv", 3)] + [("b.csv", i) for i in range(1, 6)])
+        self.assertEqual(records[-1]["probes"], 280)
+        self.assertEqual(records[-1]["stoppedEarly"], 3)
+        self.assertEqual(records[-1]["precisionPolicies"], [["absolute", 0.001], ["bbox", 0.01]])
+        self.assertIn("b.csv polygon 5: 0.070s", summaries.pop())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+# Tests for writing the output files
+# Run from the repository folder:
+#   python -m unittest discover tests
+
+from os import listdir, path
+from tempfile import TemporaryDirectory
+import sys
+import unittest
+
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+
+import main
+from polygonbatch import PolygonBatch
+
+
+class OutputSinkTest(unittest.TestCase):
+    def testFailedCloseRemovesTemporaryFiles(self):
+        polygons = PolygonBatch()
+        for x, y in [[0, 0], [10, 0], [10, 10], [0, 10]]:
+            polygons.addPoint(x, y, 100.0)
+        polygons.endPolygon()
+        polygons.setCircle(0, [[5.0, 5.0, 100.0], 5.0])
+
+        with TemporaryDirectory() as folder:
+            sink = main.OutputSink(folder, circles=True, points=True, binary=True)
+            sink.write(polygons)
+
+            # As if flushing the last of the binary file failed
+            def fail():
+                raise OSError("No space left on device")
+            sink.stack.callback(fail)
+            with self.assertRaises(OSError):
+                sink.close()
+            self.assertEqual(listdir(folder), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+# Regression tests for the circle solvers
+# Run from the repository folder:
+#   python -m unittest discover tests
+
+from math import log2
+from os import path
+from time import perf_counter
+import random
+import sys
+import unittest
+
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+sys.path.insert(0, path.join(path.dirname(path.dirname(path.abspath(__file__))), "benchmarks"))
+
+import main
+import shapes
+from polylabel import polylabel, _make_evaluator, _EdgeIndex, _PythonEdges
+
+# C shaped polygon whose centroid and bounding box centre are both outside it
+C_SHAPE = [[0, 0], [10, 0], [10, 1], [1, 1], [1, 9], [10, 9], [10, 10], [0, 10]]
+
+
+class EarlyStopTest(unittest.TestCase):
+    def testBestMeasuredCellKept(self):
+        # Every probe made with a smaller budget is also made with a larger one, so stopping
+        # later can't give a smaller distance if the best cell still in the queue is used
+        previous = None
+        for maxProbes in range(5, 80):
+            _, distance, status = polylabel(C_SHAPE, precision=0.001, max_probes=maxProbes, with_status=True)
+            self.assertTrue(status.stopped_early)
+            if previous is not None:
+                self.assertGreaterEqual(distance, previous)
+            previous = distance
+
+        # Cells inside the polygon have been measured by 40 probes, though none of them has been split yet
+        _, distance = polylabel(C_SHAPE, precision=0.001, max_probes=40, with_distance=True)
+        self.assertGreater(distance, 0)
+
+    def testThinPolygonWithinBudget(self):
+        # Covering a thin rectangle takes a million cells, the limits must still hold while covering it
+        rectangle = [[0, 0], [10000, 0], [10000, 0.01], [0, 0.01]]
+        for engine in main.ENGINES.values():
+            start = perf_counter()
+            _, distance, status = engine(rectangle, precision=0.001, max_probes=100, with_status=True)
+            self.assertLessEqual(status.probes, 100)
+            self.assertLess(perf_counter() - start, 0.5)
+            self.assertTrue(status.stopped_early)
+            self.assertGreater(distance, 0)
+
+            start = perf_counter()
+            _, distance, status = engine(rectangle, precision=0.001, max_time=0.2, with_status=True)
+            self.assertLess(perf_counter() - start, 1.0)
+            self.assertTrue(status.stopped_early)
+            self.assertGreater(distance, 0)
+
+    def testProbesWithinLimit(self):
+        # Splitting cells a batch at a time must not take more probes than allowed
+        for batchSize in (1, 4):
+            for maxProbes in range(1, 120):
+                _, _, status = polylabel(C_SHAPE, precision=0.001, batch_size=batchSize, max_probes=maxProbes,
+                                         with_status=True)
+                self.assertLessEqual(status.probes, maxProbes, (batchSize, maxProbes))
+        for engine in main.ENGINES.values():
+            for maxProbes in range(1, 120):
+                _, _, status = engine(C_SHAPE, precision=0.001, max_probes=maxProbes, with_status=True)
+                self.assertLessEqual(status.probes, maxProbes, maxProbes)
+
+    def testNoCircleOutsidePolygon(self):
+        evaluator = _make_evaluator(C_SHAPE)
+        for engine in main.ENGINES:
+            for maxProbes in range(5, 80):
+                circle, _ = main.solvePolygon(C_SHAPE, 0.0, engine, maxProbes=maxProbes)
+                if circle is None:
+                    continue
+                (x, y, _), radius = circle
+                self.assertGreater(radius, 0, (engine, maxProbes))
+                self.assertAlmostEqual(evaluator.distance(x, y), radius, msg=(engine, maxProbes))
+
+
+class EdgeIndexTest(unittest.TestCase):
+    def testTallEdgesBoundedSize(self):
+        # Every tooth of the comb crosses most of the rows, each edge must only be stored a few times
+        polygon = shapes.comb(16000, maxTeeth=4000)
+        index = _EdgeIndex(polygon)
+        entries = sum(len(node) for node in index.row_tree)
+        self.assertLessEqual(entries, 2 * len(polygon) * (log2(index.rows) + 1))
+
+    def testSameAsPolygonDistance(self):
+        polygon = shapes.comb(2000, maxTeeth=500)
+        index = _EdgeIndex(polygon)
+        edges = _PythonEdges(polygon)
+        randomPoints = random.Random(1)
+        for _ in range(2000):
+            x = randomPoints.uniform(999, 2001)
+            y = randomPoints.uniform(1999, 2024)
+            self.assertEqual(index.distance(x, y), edges.distance(x, y), (x, y))
+
+
+if __name__ == '__main__':
+    unittest.main()
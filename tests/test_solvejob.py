@@ -0,0 +1,46 @@
+# Tests for calculating circles in the background for the GUI
+# Run from the repository folder:
+#   python -m unittest discover tests
+
+from os import path
+from time import perf_counter, sleep
+import multiprocessing
+import sys
+import unittest
+
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+
+import main
+from polygonbatch import PolygonBatch
+
+# Takes a million cells to cover, so takes far longer to solve than the test waits
+SLOW_POLYGON = [[0, 0], [10000, 0], [10000, 0.01], [0, 0.01]]
+
+
+class SolveJobTest(unittest.TestCase):
+    def testCancelStopsSolvingPolygon(self):
+        polygons = PolygonBatch()
+        for polygon in ([[0, 0], [10, 0], [10, 10], [0, 10]], [[0, 0], [4, 0], [4, 4], [0, 4]], SLOW_POLYGON):
+            for x, y in polygon:
+                polygons.addPoint(x, y, 0.0)
+            polygons.endPolygon()
+
+        for workers in (1, 2):
+            job = main.SolveJob(polygons.select(range(3)), workers)
+            job.start()
+            sleep(1)
+            start = perf_counter()
+            job.cancel()
+            job.join(5)
+            self.assertFalse(job.is_alive())
+            self.assertLess(perf_counter() - start, 1)
+            self.assertIsNone(job.error)
+
+            # The circles found before cancelling are kept, and no worker processes are left running
+            self.assertEqual(sorted(job.statuses), [0, 1])
+            self.assertEqual([job.polygons.hasCircle(i) for i in range(3)], [True, True, False])
+            self.assertEqual(multiprocessing.active_children(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()